@@ -0,0 +1,62 @@
+"""
+bench_archive.py
+---------------------------------
+Archive write throughput, and query latency over a day of multi-spacecraft
+telemetry (PACKETS packets spread evenly over 24 hours, FLEET spacecraft x 7
+subsystems).
+
+Queries run against the memory-mapped indexes: a 1-hour window for one APID,
+the whole day for one APID (count only, and fetching the packets), and a
+10-second window across all APIDs.
+
+Usage:
+    python -m benchmarks.bench_archive
+"""
+
+import shutil
+import tempfile
+import time
+
+from src.ccsds import apid
+from src.ccsds.encoder import encode_ccsds_packet
+from src.comms.tx import GET_TELEMETRY_FUNC
+from src.storage.archive import ArchiveReader, ArchiveWriter
+
+PACKETS = 1_000_000
+FLEET = 20
+DAY = 86_400
+
+
+def _timed(name: str, function, repeat: int = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    count = result if isinstance(result, int) else len(result)
+    print(f"{name:>34}: {elapsed * 1000:8.3f} ms  ({count:,} packets)")
+
+
+def main():
+    templates = [encode_ccsds_packet(name, provider(), 0, spacecraft_id=spacecraft)
+                 for spacecraft in range(FLEET) for name, provider in GET_TELEMETRY_FUNC.items()]
+    directory = tempfile.mkdtemp(prefix="bench-archive-")
+    try:
+        start = time.perf_counter()
+        with ArchiveWriter(directory) as writer:
+            for index in range(PACKETS):
+                writer.append(templates[index % len(templates)], mission_time=index * DAY // PACKETS)
+        elapsed = time.perf_counter() - start
+        print(f"{'write':>34}: {PACKETS / elapsed:12,.0f} packets/s  ({writer.segment + 1} segments)")
+
+        power_7 = apid.make_apid("power", 7)
+        with ArchiveReader(directory) as reader:
+            _timed("1 APID, 1 hour", lambda: reader.query(12 * 3600, 13 * 3600 - 1, apids=[power_7]))
+            _timed("1 APID, 24 hours (count)", lambda: reader.count(0, DAY, apids=[power_7]))
+            _timed("1 APID, 24 hours", lambda: reader.query(0, DAY, apids=[power_7]), repeat=5)
+            _timed("all APIDs, 10 seconds", lambda: reader.query(40_000, 40_009))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+bench_crc.py
+---------------------------------
+Throughput benchmark for the CRC-16-CCITT engines in src/ccsds/crc.py.
+
+Reports bytes/sec for every engine on packet-sized inputs (27-56 bytes,
+the range of our telemetry packets) and on a multi-MB buffer, then compares
+verify_crc_batch against a Python loop over verify_crc for a large capture.
+
+Usage:
+    python -m benchmarks.bench_crc
+"""
+
+import os
+import time
+
+from src.ccsds import crc
+
+ENGINES = {
+    "bitwise": crc.compute_crc16_bitwise,
+    "table": crc.compute_crc16_table,
+    "slicing8": crc.compute_crc16_slicing8,
+    "compute_crc16": crc.compute_crc16,
+}
+
+PACKET_SIZES = (27, 38, 46, 56)
+LARGE_SIZE = 4 * 1024 * 1024  # 4 MB
+BATCH_PACKETS = 1_000_000  # packets in the batch verification case
+BATCH_PACKET_LEN = 27  # smallest telemetry packet
+MIN_SECONDS = 0.5  # run each case at least this long
+
+
+def _measure(fn, data: bytes) -> float:
+    """
+    Time repeated calls of fn(data) and return the throughput in bytes/sec.
+    """
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < MIN_SECONDS:
+        fn(data)
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls * len(data) / elapsed
+
+
+def _format_rate(rate: float) -> str:
+    return f"{rate / 1e6:10.2f} MB/s"
+
+
+def main():
+    print(f"Active engine for compute_crc16: {crc.CRC16_ENGINE}")
+    print()
+
+    for size in PACKET_SIZES:
+        data = os.urandom(size)
+        print(f"--- {size}-byte packets ---")
+        for name, fn in ENGINES.items():
+            print(f"{name:>14}: {_format_rate(_measure(fn, data))}")
+        print()
+
+    data = os.urandom(LARGE_SIZE)
+    print(f"--- {LARGE_SIZE // (1024 * 1024)} MB buffer ---")
+    for name, fn in ENGINES.items():
+        # The pure Python engines are far too slow for the full buffer; sample 256 KB
+        sample = data if name == "compute_crc16" else data[:256 * 1024]
+        print(f"{name:>14}: {_format_rate(_measure(fn, sample))}")
+    print()
+
+    packet = crc.append_crc(os.urandom(BATCH_PACKET_LEN - 2))
+    buffer = packet * BATCH_PACKETS
+    print(f"--- batch verify: {BATCH_PACKETS:,} x {BATCH_PACKET_LEN}-byte packets ---")
+
+    start = time.perf_counter()
+    mask = crc.verify_crc_batch(buffer, BATCH_PACKET_LEN)
+    batch_elapsed = time.perf_counter() - start
+    assert mask.all()
+
+    view = memoryview(buffer)
+    start = time.perf_counter()
+    for offset in range(0, len(buffer), BATCH_PACKET_LEN):
+        crc.verify_crc(view[offset:offset + BATCH_PACKET_LEN])
+    loop_elapsed = time.perf_counter() - start
+
+    print(f"{'verify_crc_batch':>16}: {BATCH_PACKETS / batch_elapsed:14,.0f} packets/s")
+    print(f"{'verify_crc loop':>16}: {BATCH_PACKETS / loop_elapsed:14,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+bench_encoder.py
+---------------------------------
+Packet encoding throughput for the three encoder entry points:
+
+    encode_ccsds_packet       one bytes object per packet
+    encode_ccsds_packet_into  packets written back to back into one bytearray
+    encode_batch              N packets of one subsystem from column arrays
+
+Usage:
+    python -m benchmarks.bench_encoder
+"""
+
+import time
+
+import numpy as np
+
+from src.ccsds import encoder, schema
+from src.subsystems import payload
+
+SUBSYSTEM = "payload"  # 27-byte packets, the smallest we send
+SINGLE_PACKETS = 100_000
+BATCH_PACKETS = 1_000_000
+
+
+def _report(name: str, count: int, elapsed: float):
+    print(f"{name:>26}: {count / elapsed:14,.0f} packets/s")
+
+
+def main():
+    sample = payload.get_payload_telemetry()
+    size = encoder.packet_length(SUBSYSTEM)
+    print(f"Subsystem: {SUBSYSTEM} ({size}-byte packets)")
+
+    start = time.perf_counter()
+    for seq_count in range(SINGLE_PACKETS):
+        encoder.encode_ccsds_packet(SUBSYSTEM, sample, seq_count)
+    _report("encode_ccsds_packet", SINGLE_PACKETS, time.perf_counter() - start)
+
+    buf = bytearray(size * SINGLE_PACKETS)
+    start = time.perf_counter()
+    offset = 0
+    for seq_count in range(SINGLE_PACKETS):
+        offset += encoder.encode_ccsds_packet_into(buf, offset, SUBSYSTEM, sample, seq_count)
+    _report("encode_ccsds_packet_into", SINGLE_PACKETS, time.perf_counter() - start)
+
+    fields = schema.get_schema_for_subsystem(SUBSYSTEM).fields
+    columns = {name: np.full(BATCH_PACKETS, sample[name]) for name in fields}
+    timestamps = time.time() + np.arange(BATCH_PACKETS) * 0.001
+    start = time.perf_counter()
+    encoder.encode_batch(SUBSYSTEM, columns, 0, timestamps)
+    _report("encode_batch", BATCH_PACKETS, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+bench_logging.py
+---------------------------------
+Ground station decode rate (packets/sec) with different logging setups:
+
+    print per packet     the old receiver: four flushed print calls per packet
+    logging DEBUG        per-packet trace lines through the queue logger
+    logging INFO         one summary line per interval (the default)
+    logging off          level above WARNING, no summary counters
+
+Everything is written to os.devnull, so the numbers are an upper bound; a real
+terminal makes the print and DEBUG cases much slower still. The decode loop is
+the one receive_packets runs for each datagram taken from the ring.
+
+DEBUG tracing builds two log records per packet and is meant for debugging,
+not for throughput; it is slower than plain prints.
+
+Usage:
+    python -m benchmarks.bench_logging
+"""
+
+import logging
+import os
+import struct
+import time
+from contextlib import redirect_stdout
+
+from src.ccsds import encoder
+from src.ccsds.packet_view import PacketView
+from src.comms import rx
+from src.subsystems import adcs, payload, power
+from src.utils.logger import PacketSummary, setup_logging, shutdown_logging
+
+PACKETS = 100_000
+ADDRESS = ("127.0.0.1", 40000)
+
+
+def _packets() -> list:
+    packets = []
+    for seq in range(64):
+        packets.append(encoder.encode_ccsds_packet("adcs", adcs.get_adcs_telemetry(), seq))
+        packets.append(encoder.encode_ccsds_packet("power", power.get_power_telemetry(), seq))
+        packets.append(encoder.encode_ccsds_packet("payload", payload.get_payload_telemetry(), seq))
+    return packets
+
+
+def _print_per_packet(packets: list):
+    # The receive loop and handle_packet before the queue logger
+    for index in range(PACKETS):
+        data = packets[index % len(packets)]
+        print(f"[RX] Received {len(data)} bytes from {ADDRESS}", flush=True)
+        print("[RX] Decoding packet...", flush=True)
+        print("==========================", flush=True)
+        try:
+            packet = PacketView(data)
+            print(f"[RX] Decoded {packet.subsystem.upper()} packet #{packet.seq_count} successfully "
+                  f"with payload length {len(data)}.", flush=True)
+        except (ValueError, struct.error) as e:
+            print(f"[RX] Error decoding packet: {e}", flush=True)
+        print("===========================", flush=True)
+
+
+def _logged(packets: list, summary):
+    log = rx.log
+    for index in range(PACKETS):
+        data = packets[index % len(packets)]
+        log.debug("Received %d bytes from %s", len(data), ADDRESS)
+        rx.handle_packet(data, summary)
+
+
+def main():
+    packets = _packets()
+    with open(os.devnull, "w") as devnull:
+        cases = [
+            ("print per packet", None),
+            ("logging DEBUG", logging.DEBUG),
+            ("logging INFO", logging.INFO),
+            ("logging off", logging.CRITICAL + 1),
+        ]
+        for name, level in cases:
+            start = time.perf_counter()
+            if level is None:
+                with redirect_stdout(devnull):
+                    _print_per_packet(packets)
+            else:
+                setup_logging(level, stream=devnull)
+                summary = PacketSummary(rx.log, verb="received") if level <= logging.INFO else None
+                _logged(packets, summary)
+                shutdown_logging()  # include draining the queue in the time
+            elapsed = time.perf_counter() - start
+            print(f"{name:>18}: {PACKETS / elapsed:12,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+bench_replay.py
+---------------------------------
+Ground path throughput (packets/sec) replaying a recorded pass at maximum speed:
+
+    capture, local decode   iter_capture + rx.handle_packet with sequence tracking
+    archive, local decode   iter_archive (time-ordered query) + the same decode path
+    capture, UDP send       iter_capture + batched sends to a loopback socket nobody reads
+
+The pass is the same set of packets every run, so the numbers are comparable
+between versions of the decoder, framer and archive.
+
+Usage:
+    python -m benchmarks.bench_replay
+"""
+
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from src.ccsds import schema
+from src.ccsds.encoder import encode_batch
+from src.ccsds.time import MISSION_START_TIMESTAMP
+from src.comms.replay import iter_archive, iter_capture, replay
+from src.storage.archive import ArchiveWriter
+from src.utils.logger import setup_logging, shutdown_logging
+
+PACKETS = 200_000
+
+
+def _record(directory: str) -> str:
+    # One packet per 10 ms per subsystem, interleaved in time like a real pass
+    count = PACKETS // 2
+    timestamps = MISSION_START_TIMESTAMP + 1000 + np.arange(count) * 0.01
+    buffers = []
+    for name, fields in (("power", schema.POWER_FIELDS), ("thermal", schema.THERMAL_FIELDS)):
+        columns = {field: np.random.default_rng(0).normal(size=count) for field in fields}
+        buffer = encode_batch(name, columns, timestamps=timestamps)
+        size = len(buffer) // count
+        buffers.append([buffer[index:index + size] for index in range(0, len(buffer), size)])
+    packets = [packet for pair in zip(*buffers) for packet in pair]
+
+    capture = os.path.join(directory, "pass.dat")
+    with open(capture, "wb") as file:
+        file.write(b"".join(packets))
+    with ArchiveWriter(os.path.join(directory, "archive")) as writer:
+        for packet in packets:
+            writer.append(packet)
+    return capture
+
+
+def main():
+    setup_logging(logging.WARNING)  # keep the periodic summaries out of the timing
+    with tempfile.TemporaryDirectory() as directory:
+        capture = _record(directory)
+        cases = [
+            ("capture, local decode", lambda: replay(iter_capture(capture), speed=None)),
+            ("archive, local decode", lambda: replay(iter_archive(os.path.join(directory, "archive")), speed=None)),
+            ("capture, UDP send", lambda: replay(iter_capture(capture), speed=None, ip="127.0.0.1", port=40000)),
+        ]
+        for name, run in cases:
+            stats = run()
+            print(f"{name:>22}: {stats['rate']:12,.0f} packets/s ({stats['batches']} batches)")
+    shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
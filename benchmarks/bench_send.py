@@ -0,0 +1,63 @@
+"""
+bench_send.py
+---------------------------------
+UDP send throughput over loopback, one syscall per packet vs. batched:
+
+    sendto loop        one sendto syscall per packet (the old transmitter)
+    BatchSender        one sendmmsg syscall per batch (Linux), sendto loop elsewhere
+
+Nothing reads the receiving socket: once its buffer is full the kernel drops
+datagrams on delivery, after the full send path has run, so the reported rate
+is packets handed to the kernel per second. Batches smaller than
+MIN_SENDMMSG_BATCH fall back to the sendto loop by design.
+
+Usage:
+    python -m benchmarks.bench_send
+"""
+
+import socket
+import time
+
+from src.ccsds import encoder
+from src.comms.batch_send import HAVE_SENDMMSG, BatchSender
+from src.subsystems import payload
+
+SUBSYSTEM = "payload"
+PACKETS = 200_000
+BATCH_SIZES = (4, 8, 16, 32, 64)
+
+
+def _report(name: str, count: int, elapsed: float, syscalls: int):
+    print(f"{name:>22}: {count / elapsed:12,.0f} packets/s  ({syscalls / count:.3f} syscalls/packet)")
+
+
+def main():
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    address = receiver.getsockname()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    packets = [encoder.encode_ccsds_packet(SUBSYSTEM, payload.get_payload_telemetry(), seq) for seq in range(64)]
+    print(f"Subsystem: {SUBSYSTEM} ({len(packets[0])}-byte packets), sendmmsg available: {HAVE_SENDMMSG}")
+
+    try:
+        start = time.perf_counter()
+        for index in range(PACKETS):
+            sock.sendto(packets[index & 63], address)
+        _report("sendto loop", PACKETS, time.perf_counter() - start, PACKETS)
+
+        for batch_size in BATCH_SIZES:
+            sender = BatchSender(sock, address, max_batch=batch_size)
+            batch = packets[:batch_size]
+            rounds = PACKETS // batch_size
+            start = time.perf_counter()
+            for _ in range(rounds):
+                sender.send(batch)
+            _report(f"BatchSender x{batch_size}", rounds * batch_size, time.perf_counter() - start, sender.syscalls)
+    finally:
+        sock.close()
+        receiver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Purpose of this file: Latest-value cache and bounded history for dashboard clients.
+
+TelemetryHistory is fed every decoded packet by the UDP listener and keeps:
+
+- the latest JSON packet of each subsystem, pushed to a client as a snapshot
+  when it subscribes, so a new page is filled in before the next packet arrives
+- a fixed-size NumPy ring buffer per APID with one row per payload field, from
+  which the history endpoint serves the last N samples or a time window of a
+  single parameter without the client re-requesting whole histories
+
+Memory is allocated once per APID (capacity samples of every field, as
+float64, plus the time column) and at most max_apids APIDs are tracked, so it
+stays bounded however long the server runs. Times are seconds since
+MISSION_START, like the archive and the columnar store.
+
+    history = TelemetryHistory(capacity=1024)
+    history.update(view, json_packet)
+    times, values = history.last(0x02, "battery_voltage", 100)
+"""
+
+import threading
+
+import numpy as np
+
+from src.ccsds.time import FINE_TICKS, resolve_coarse, split_cuc_word
+
+DEFAULT_CAPACITY = 1024  # samples per APID, e.g. 17 minutes of a 1 Hz subsystem
+DEFAULT_MAX_APIDS = 256  # 32 spacecraft with every subsystem
+
+
+class HistoryRing:
+    """
+    Ring buffer of the last `capacity` samples of every field of one APID.
+    """
+
+    def __init__(self, fields, capacity: int):
+        """
+        Args:
+            fields: Ordered payload field names (the packet schema's fields).
+            capacity (int): Samples kept; the oldest is overwritten when full.
+        """
+        self.fields = tuple(fields)
+        self.rows = {name: row for row, name in enumerate(self.fields)}
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((len(self.fields), capacity), dtype=np.float64)
+        self.head = 0  # next slot to write
+        self.count = 0  # samples ever appended
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    def append(self, time: float, values):
+        """
+        Args:
+            time (float): Sample time in seconds since MISSION_START.
+            values: Field values in the order of self.fields.
+        """
+        self.times[self.head] = time
+        self.values[:, self.head] = values
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+    def _ordered(self, column: np.ndarray) -> np.ndarray:
+        # Oldest to newest (a copy, so callers never see later writes)
+        if self.count < self.capacity:
+            return column[:self.head].copy()
+        return np.concatenate((column[self.head:], column[:self.head]))
+
+    def _row(self, field: str) -> np.ndarray:
+        try:
+            return self.values[self.rows[field]]
+        except KeyError:
+            raise KeyError(f"No field '{field}' in this APID's history")
+
+    def last(self, field: str, n: int) -> tuple:
+        """
+        Returns:
+            tuple: (times, values) of the newest n samples of a field, oldest first.
+        """
+        row = self._row(field)
+        n = max(0, min(n, self.count, self.capacity))
+        slots = (self.head - n + np.arange(n)) % self.capacity
+        return self.times[slots], row[slots]
+
+    def window(self, field: str, start: float = None, end: float = None) -> tuple:
+        """
+        Returns:
+            tuple: (times, values) of the samples with start <= time <= end, in arrival order.
+        """
+        row = self._row(field)
+        times = self._ordered(self.times)
+        values = self._ordered(row)
+        mask = np.ones(len(times), dtype=bool)  # packets can arrive out of order, so no binary search
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+        return times[mask], values[mask]
+
+
+class TelemetryHistory:
+    """
+    Latest packet per subsystem and a HistoryRing per APID.
+
+    update() is called from the UDP listener and the queries from request
+    handlers; a lock keeps them consistent.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_apids: int = DEFAULT_MAX_APIDS, clock=None):
+        """
+        Args:
+            capacity (int): Samples kept per APID.
+            max_apids (int): APIDs tracked; packets of further APIDs only update the latest-value cache.
+            clock: UNIX time source used to resolve CUC coarse rollover, or None for now.
+        """
+        if capacity <= 0:
+            raise ValueError(f"History capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.max_apids = max_apids
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._rings = {}  # apid -> HistoryRing
+        self._latest = {}  # subsystem -> json packet
+        self.dropped = 0  # samples not kept because max_apids was reached
+
+    def update(self, packet, json_packet: dict = None):
+        """
+        Record one decoded packet.
+
+        Args:
+            packet (PacketView): The decoded packet (its payload is read here).
+            json_packet (dict): The packet as sent to browsers, cached as the subsystem's latest value.
+        """
+        coarse, fine = split_cuc_word(packet.cuc_time)
+        reference = self.clock() if self.clock is not None else None
+        time = resolve_coarse(coarse, reference) + fine / FINE_TICKS
+        packet_schema = packet.schema
+        payload = packet.payload
+        with self._lock:
+            if json_packet is not None:
+                self._latest[json_packet["subsystem"].lower()] = json_packet
+            ring = self._rings.get(packet.apid)
+            if ring is None:
+                if len(self._rings) >= self.max_apids:
+                    self.dropped += 1
+                    return
+                ring = self._rings[packet.apid] = HistoryRing(packet_schema.fields, self.capacity)
+            ring.append(time, [payload[name] for name in ring.fields])
+
+    def latest(self, subsystems="*") -> list:
+        """
+        Snapshot of the latest packet of each subsystem.
+
+        Args:
+            subsystems: Iterable of subsystem names, or "*" for all.
+
+        Returns:
+            list: JSON packets, one per subsystem seen so far.
+        """
+        with self._lock:
+            if subsystems == "*":
+                return list(self._latest.values())
+            names = {str(name).lower() for name in subsystems}
+            return [packet for name, packet in self._latest.items() if name in names]
+
+    def _ring(self, apid: int) -> HistoryRing:
+        try:
+            return self._rings[apid]
+        except KeyError:
+            raise ValueError(f"No history for APID {apid:#05x}")
+
+    def last(self, apid: int, field: str, n: int) -> tuple:
+        """
+        The newest n samples of a parameter.
+
+        Raises:
+            ValueError: No packets of this APID were recorded.
+            KeyError: The APID's packets have no such field.
+
+        Returns:
+            tuple: (times, values) as float64 arrays, oldest first.
+        """
+        with self._lock:
+            return self._ring(apid).last(field, n)
+
+    def window(self, apid: int, field: str, start: float = None, end: float = None) -> tuple:
+        """
+        The samples of a parameter between start and end (seconds since MISSION_START, inclusive).
+
+        Raises:
+            ValueError: No packets of this APID were recorded.
+            KeyError: The APID's packets have no such field.
+
+        Returns:
+            tuple: (times, values) as float64 arrays.
+        """
+        with self._lock:
+            return self._ring(apid).window(field, start, end)
+
+    def apids(self) -> list:
+        with self._lock:
+            return sorted(self._rings)
+
+    def fields(self, apid: int) -> tuple:
+        with self._lock:
+            return self._ring(apid).fields
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the ring buffers (bounded by max_apids full-width rings).
+        """
+        with self._lock:
+            return sum(ring.nbytes for ring in self._rings.values())
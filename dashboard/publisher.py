@@ -0,0 +1,179 @@
+"""
+Purpose of this file: Coalesce dashboard updates and publish them at a fixed frame rate.
+
+The listener used to emit every decoded packet twice (subsystem namespace and
+root), so browser load grew with the packet rate: a fleet of spacecraft
+sending ADCS at 2 Hz each floods every open page with updates nobody can see.
+
+TelemetryPublisher keeps only the latest packet per subsystem and, once per
+frame (DEFAULT_RATE times per second), sends each client a single message with
+every subsystem that changed since the previous frame:
+
+    {"packets": [json_packet, ...], "coalesced": <updates superseded this frame>}
+
+Clients choose what they receive. A client subscribes to a list of subsystems
+and joins the Socket.IO room for that exact set, so one emit per room reaches
+it with one message per frame, containing only the subsystems it opened.
+Nothing is emitted for a room whose subsystems did not change.
+
+The publisher does not import Flask: it is given the emit function, so it can be
+driven (and tested) without a server.
+"""
+
+import threading
+import time
+
+DEFAULT_RATE = 10.0  # frames per second
+EVENT = "telemetry"
+ALL_SUBSYSTEMS = "*"  # subscription to every subsystem (the overview page)
+
+
+def room_name(subsystems) -> str:
+    """
+    Socket.IO room for a set of subsystems.
+
+    Args:
+        subsystems: Iterable of subsystem names, or ALL_SUBSYSTEMS.
+
+    Returns:
+        str: The same name for the same set, whatever the order or case.
+    """
+    if subsystems == ALL_SUBSYSTEMS:
+        return ALL_SUBSYSTEMS
+    names = sorted({str(name).lower() for name in subsystems})
+    if not names:
+        raise ValueError("Subscription needs at least one subsystem")
+    return ",".join(names)
+
+
+class TelemetryPublisher:
+    """
+    Latest-value-per-subsystem buffer flushed to subscribed rooms at a fixed rate.
+
+    update() is called from the UDP listener, flush() from the publishing loop
+    (run()); a lock keeps the two consistent.
+    """
+
+    def __init__(self, emit, rate: float = DEFAULT_RATE, recorder=None, clock=time.monotonic):
+        """
+        Args:
+            emit: Called as emit(event, message, room) for each room with changes.
+            rate (float): Frames per second.
+            recorder: LatencyRecorder for the "emit" stage of timestamped packets, or None.
+            clock: Monotonic time source in seconds.
+        """
+        if rate <= 0:
+            raise ValueError(f"Publish rate must be positive, got {rate}")
+        self.emit = emit
+        self.interval = 1.0 / rate
+        self.recorder = recorder
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._pending = {}  # subsystem -> (json_packet, tx_ns)
+        self._coalesced = 0
+        self._clients = {}  # client id -> room
+        self._rooms = {}  # room -> [subsystem set or None for all, client count]
+        self.frames = 0
+        self.messages = 0
+
+    def subscribe(self, client, subsystems) -> str:
+        """
+        Register what a client wants to receive, replacing its previous subscription.
+
+        Args:
+            client: Client id (the Socket.IO sid).
+            subsystems: Iterable of subsystem names, or ALL_SUBSYSTEMS.
+
+        Returns:
+            str: Room the client must join (and leave its previous one, see unsubscribe).
+        """
+        room = room_name(subsystems)
+        with self._lock:
+            self._leave(client)
+            entry = self._rooms.setdefault(room, [None if room == ALL_SUBSYSTEMS else set(room.split(",")), 0])
+            entry[1] += 1
+            self._clients[client] = room
+        return room
+
+    def unsubscribe(self, client):
+        """
+        Forget a client (on disconnect or before it re-subscribes).
+
+        Returns:
+            str: Room the client was in, or None.
+        """
+        with self._lock:
+            return self._leave(client)
+
+    def _leave(self, client):
+        room = self._clients.pop(client, None)
+        if room is not None:
+            entry = self._rooms[room]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._rooms[room]
+        return room
+
+    def update(self, json_packet: dict, tx_ns: int = None):
+        """
+        Store the latest packet of a subsystem, superseding any not yet published.
+
+        Args:
+            json_packet (dict): Packet as sent to the browser; "subsystem" is the key.
+            tx_ns (int): TX timestamp from the latency trailer, or None.
+        """
+        subsystem = json_packet["subsystem"].lower()
+        with self._lock:
+            if subsystem in self._pending:
+                self._coalesced += 1
+            self._pending[subsystem] = (json_packet, tx_ns)
+
+    def flush(self) -> int:
+        """
+        Publish everything that changed since the last frame.
+
+        Returns:
+            int: Number of messages emitted (at most one per room).
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            coalesced, self._coalesced = self._coalesced, 0
+            rooms = [(room, entry[0]) for room, entry in self._rooms.items()]
+        if not pending:
+            return 0
+        self.frames += 1
+
+        messages = 0
+        for room, subsystems in rooms:
+            if subsystems is None:
+                packets = [packet for packet, _ in pending.values()]
+            else:
+                packets = [pending[name][0] for name in subsystems if name in pending]
+            if packets:
+                self.emit(EVENT, {"packets": packets, "coalesced": coalesced}, room)
+                messages += 1
+        self.messages += messages
+
+        if self.recorder is not None:
+            for _, tx_ns in pending.values():
+                if tx_ns is not None:
+                    self.recorder.record("emit", tx_ns)
+        return messages
+
+    def run(self, sleep=time.sleep, stop: threading.Event = None):
+        """
+        Flush once per frame until stop is set (forever by default).
+
+        Args:
+            sleep: Function used to wait for the next frame (socketio.sleep under eventlet).
+            stop (threading.Event): Ends the loop when set, or None.
+        """
+        next_frame = self.clock()
+        while stop is None or not stop.is_set():
+            self.flush()
+            next_frame += self.interval
+            delay = next_frame - self.clock()
+            if delay > 0:
+                sleep(delay)
+            else:
+                next_frame = self.clock()  # fell behind: do not try to catch up with a burst of frames
@@ -1,46 +1,115 @@
 import eventlet
 eventlet.monkey_patch()
-from flask import Flask, render_template
-from flask_socketio import SocketIO, emit
+from flask import Flask, abort, jsonify, render_template, request
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import os
 import socket
+import struct
 from threading import Thread
 
-from src.ccsds.decoder import decode_ccsds_packet
-from src.ccsds.apid import get_subsystem
+from dashboard.history import DEFAULT_CAPACITY, TelemetryHistory
+from dashboard.publisher import DEFAULT_RATE, EVENT, TelemetryPublisher
+from src.ccsds.packet_view import PacketView
+from src.comms.latency import LatencyRecorder, split_trailer
+from src.comms.ring import PacketRing, start_socket_reader
+from src.utils.logger import PacketSummary, get_logger
+
+log = get_logger("DASHBOARD")
 
 
 app = Flask(__name__)
 socketio = SocketIO(app)
 
+# Packets from `run_transmitter.py --latency` carry a TX timestamp trailer
+recorder = LatencyRecorder()
+# Browsers get at most DASHBOARD_RATE messages per second, with the latest packet per subsystem
+publisher = TelemetryPublisher(lambda event, message, room: socketio.emit(event, message, to=room),
+                               rate=float(os.getenv("DASHBOARD_RATE", DEFAULT_RATE)), recorder=recorder)
+# Latest packet per subsystem (snapshot for new clients) and DASHBOARD_HISTORY samples per APID
+history = TelemetryHistory(capacity=int(os.getenv("DASHBOARD_HISTORY", DEFAULT_CAPACITY)))
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/history/<apid>/<field>')
+def parameter_history(apid, field):
+    # /history/0x02/battery_voltage?n=100 or ?start=1000&end=2000 (seconds since mission start)
+    try:
+        apid = int(apid, 0)
+    except ValueError:
+        abort(400, description=f"Invalid APID '{apid}'")
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+    try:
+        if start is not None or end is not None:
+            times, values = history.window(apid, field, start, end)
+        else:
+            times, values = history.last(apid, field, request.args.get('n', history.capacity, type=int))
+    except (ValueError, KeyError) as e:
+        abort(404, description=str(e))
+    return jsonify(apid=apid, field=field, times=times.tolist(), values=values.tolist())
+
+@socketio.on('subscribe')
+def subscribe(subsystems):
+    # A list of subsystem names, or "*" for all of them (the overview page)
+    previous = publisher.unsubscribe(request.sid)
+    if previous is not None:
+        leave_room(previous)
+    try:
+        join_room(publisher.subscribe(request.sid, subsystems))
+    except (TypeError, ValueError) as e:
+        log.warning("Invalid subscription from %s: %r (%s)", request.sid, subsystems, e)
+        return
+    # Snapshot of the latest values, so the page does not wait for the next packets
+    snapshot = history.latest(subsystems)
+    if snapshot:
+        emit(EVENT, {"packets": snapshot, "coalesced": 0})
+
+@socketio.on('disconnect')
+def disconnect():
+    publisher.unsubscribe(request.sid)
+
 def udp_listener():
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.bind(("0.0.0.0", 5005))
 
-    while True:
-        data, addr = sock.recvfrom(1024)
-        decoded = decode_ccsds_packet(data)
-        if not decoded:
-            print(f"[RX] Error decoding packet from {addr}. Data: {data}")
-            continue
+    # The reader only drains the socket into the ring, so slow Socket.IO emits
+    # cannot back up the kernel buffer; decoding and emitting happen below
+    ring = PacketRing(timestamps=True)
+    start_socket_reader(sock, ring)
+    summary = PacketSummary(log, verb="received")
 
-        json_packet = {
-            "subsystem": get_subsystem(decoded["primary"]["apid"]).upper(),
-            "timestamp": decoded["secondary"]["timestamp"],
-            "status": "nominal",
-            "sequence_count": decoded["primary"]["seq_count"],
-            "data": decoded["payload"]
-        }
+    for data, addr in ring:
+        data, tx_ns = split_trailer(data)
+        if tx_ns is not None:
+            recorder.record("receive", tx_ns, ring.received_ns())
+        try:
+            packet = PacketView(data)
+            json_packet = {
+                "subsystem": packet.subsystem.upper(),
+                "timestamp": packet.timestamp,
+                "status": "nominal",
+                "sequence_count": packet.seq_count,
+                "data": packet.payload
+            }
+        except (ValueError, struct.error) as e:
+            log.warning("Error decoding packet from %s: %s. Data: %s", addr, e, bytes(data))
+            summary.error()
+            continue
+        summary.count(packet.subsystem)
+        history.update(packet, json_packet)
+        if tx_ns is not None:
+            recorder.record("decode", tx_ns)
+            recorder.maybe_log(log)
 
-        socketio.emit('telemetry-details', json_packet, namespace=f'/{json_packet["subsystem"].lower()}')
-        socketio.emit('telemetry', json_packet, namespace="/")
+        # Emitted by the publishing loop on its next frame ("emit" latency is recorded there)
+        publisher.update(json_packet, tx_ns)
 
 udp_thread = Thread(target=udp_listener)
 udp_thread.daemon = True
 udp_thread.start()
+socketio.start_background_task(publisher.run, socketio.sleep)
 
 if __name__ == "__main__":
     socketio.run(app, host='0.0.0.0', port=8000)
@@ -111,8 +111,14 @@ function updateTimestamps() {
     requestAnimationFrame(updateTimestamps);
 }
 
-socket.on("telemetry", data => {
-    updatePanel(data);
+// The overview shows every subsystem; the server sends one message per frame
+// with the latest packet of each subsystem that changed
+socket.on("connect", () => {
+    socket.emit("subscribe", "*");
+});
+
+socket.on("telemetry", message => {
+    message.packets.forEach(updatePanel);
 });
 
 requestAnimationFrame(updateTimestamps);
@@ -1,4 +1,31 @@
+import argparse
+
 from src.comms.rx import receive_packets
+from src.comms.rx_workers import DEFAULT_RCVBUF, run_receiver_workers
 
 if __name__ == "__main__":
-    receive_packets()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Ground station receiver")
+    parser.add_argument("--frames", action="store_true",
+                        help="datagrams carry TM Transfer Frames (use with run_transmitter.py --frames)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="receive with N processes sharing the port via SO_REUSEPORT (prints counters instead of packets)")
+    parser.add_argument("--rcvbuf", type=int, default=DEFAULT_RCVBUF, metavar="BYTES",
+                        help="SO_RCVBUF per worker socket (default: %(default)s)")
+    parser.add_argument("--report-interval", type=float, default=5.0, metavar="SECONDS",
+                        help="seconds between worker counter reports (default: %(default)s)")
+    parser.add_argument("--latency", action="store_true",
+                        help="measure end-to-end latency from TX timestamps (use with run_transmitter.py --latency)")
+    parser.add_argument("--archive", metavar="DIR",
+                        help="append every decoded packet to a segmented archive in DIR")
+    parser.add_argument("--columns", metavar="DIR",
+                        help="store every decoded packet's fields as compressed per-APID columns in DIR")
+    args = parser.parse_args()
+    if args.workers and (args.latency or args.archive or args.columns):
+        parser.error("--workers only counts packets; it cannot be combined with --latency, --archive or --columns")
+    if args.latency and args.frames:
+        parser.error("--latency only works with one packet per datagram, not with --frames")
+
+    if args.workers:
+        run_receiver_workers(args.workers, rcvbuf=args.rcvbuf, framed=args.frames, report_interval=args.report_interval)
+    else:
+        receive_packets(framed=args.frames, latency=args.latency, archive=args.archive, columns=args.columns)
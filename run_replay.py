@@ -0,0 +1,42 @@
+import argparse
+import math
+import os
+
+from src.comms.replay import iter_archive, iter_capture, replay
+from src.comms.tx import GROUND_IP, GROUND_PORT
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded telemetry (archive directory or capture file)")
+    parser.add_argument("source", help="archive directory (run_groundstation.py --archive) or file of raw packets")
+    speed = parser.add_mutually_exclusive_group()
+    speed.add_argument("--speed", type=float, default=1.0, metavar="FACTOR",
+                       help="playback speed relative to the recorded timing (default: %(default)s)")
+    speed.add_argument("--max", action="store_true", help="replay as fast as possible, in large batches")
+    parser.add_argument("--send", action="store_true",
+                        help=f"send to the ground station over UDP ({GROUND_IP}:{GROUND_PORT}) "
+                             "instead of decoding in this process")
+    parser.add_argument("--start", type=int, metavar="SECONDS", help="archive only: first mission second")
+    parser.add_argument("--end", type=int, metavar="SECONDS", help="archive only: last mission second")
+    parser.add_argument("--apid", type=lambda value: int(value, 0), action="append", metavar="APID",
+                        help="archive only: replay this APID (repeatable, e.g. --apid 0x02)")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.source):
+        packets = iter_archive(args.source, args.start, args.end, args.apid)
+    elif args.start is not None or args.end is not None or args.apid:
+        parser.error("--start, --end and --apid need an archive directory, not a capture file")
+    else:
+        packets = iter_capture(args.source)
+
+    try:
+        stats = replay(packets, speed=None if args.max or math.isinf(args.speed) else args.speed,
+                       ip=GROUND_IP if args.send else None, port=GROUND_PORT)
+    except KeyboardInterrupt:
+        print("\n[REPLAY] Interrupted.", flush=True)
+    else:
+        print(f"[REPLAY] {stats['packets']} packets in {stats['elapsed']:.2f} s ({stats['rate']:,.0f} packets/s), "
+              f"{stats['batches']} batches, {stats['late']} late", flush=True)
+        if "decoded" in stats:
+            sequence = stats["sequence"]
+            print(f"[REPLAY] decoded {stats['decoded']}, failed {stats['failed']}, "
+                  f"lost {sequence['lost']} ({sequence['loss_rate']:.3%})", flush=True)
@@ -1,4 +1,38 @@
+import argparse
+
 from src.comms.tx import transmit_packets
+from src.comms.async_tx import run_async_transmitter
+from src.comms.fleet import run_fleet
 
 if __name__ == "__main__":
-    transmit_packets()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Spacecraft telemetry transmitter")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="run each subsystem as an asyncio task so slow providers cannot delay the others")
+    parser.add_argument("--frames", action="store_true",
+                        help="pack packets into CCSDS TM Transfer Frames instead of one datagram per packet")
+    parser.add_argument("--fleet", type=int, metavar="N",
+                        help="simulate N spacecraft across a process pool (load test)")
+    parser.add_argument("--workers", type=int, metavar="W",
+                        help="number of fleet worker processes (default: one per CPU core)")
+    parser.add_argument("--rate", type=float, metavar="PPS",
+                        help="aggregate fleet packet rate in packets/s (default: every spacecraft at the normal schedule)")
+    parser.add_argument("--duration", type=float, metavar="SECONDS",
+                        help="stop the fleet after this many seconds (default: run until Ctrl-C)")
+    parser.add_argument("--latency", action="store_true",
+                        help="append a TX timestamp to every packet for end-to-end latency measurement")
+    args = parser.parse_args()
+    if args.latency and (args.frames or args.fleet or args.use_async):
+        parser.error("--latency only works with the default transmitter (one packet per datagram)")
+    if args.frames and (args.fleet or args.use_async):
+        parser.error("--frames only works with the default transmitter, not with --fleet or --async")
+    if args.fleet and args.use_async:
+        parser.error("--fleet and --async cannot be combined")
+    if not args.fleet and (args.rate is not None or args.duration is not None or args.workers is not None):
+        parser.error("--rate, --duration and --workers only apply to --fleet")
+
+    if args.fleet:
+        run_fleet(args.fleet, workers=args.workers, rate=args.rate, duration=args.duration)
+    elif args.use_async:
+        run_async_transmitter()
+    else:
+        transmit_packets(framed=args.frames, latency=args.latency)
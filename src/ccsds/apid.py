@@ -121,4 +121,44 @@ def get_apid_list() -> list:
     Returns:
         list: A list of APIDs.
     """
-    return list(apid_dict.values())
\ No newline at end of file
+    return list(apid_dict.values())
+
+
+# Fleet simulation: every spacecraft gets its own block of APIDs
+# APID = spacecraft_id * SPACECRAFT_APID_STRIDE + subsystem APID
+# Spacecraft 0 uses the plain subsystem APIDs above, so single-spacecraft traffic is unchanged
+SPACECRAFT_APID_STRIDE = 0x08  # subsystem APIDs 0x01-0x07 fit in the low 3 bits
+IDLE_APID = 0x7FF  # reserved by CCSDS for idle packets, never assigned to a spacecraft
+MAX_SPACECRAFT = IDLE_APID // SPACECRAFT_APID_STRIDE  # 255 spacecraft: ids 0-254
+
+# make_apid function builds the APID of a subsystem on a given spacecraft
+def make_apid(subsystem: str, spacecraft_id: int = 0) -> int:
+    """
+    Get the APID for a subsystem on a given spacecraft.
+
+    Args:
+        subsystem (str): The name of the subsystem.
+        spacecraft_id (int): Spacecraft number in the fleet (0 for a single spacecraft).
+
+    Returns:
+        int: The spacecraft-specific APID.
+    """
+    if not 0 <= spacecraft_id < MAX_SPACECRAFT:
+        raise ApidError(f"Spacecraft id {spacecraft_id} out of range (0-{MAX_SPACECRAFT - 1})")
+    return spacecraft_id * SPACECRAFT_APID_STRIDE + get_apid(subsystem)
+
+# split_apid function recovers the spacecraft id and subsystem APID from a fleet APID
+def split_apid(apid: int) -> tuple:
+    """
+    Split a spacecraft-specific APID into (spacecraft_id, subsystem APID).
+
+    Args:
+        apid (int): An APID built by make_apid.
+
+    Returns:
+        tuple: (spacecraft_id, subsystem APID).
+    """
+    spacecraft_id, base_apid = divmod(apid, SPACECRAFT_APID_STRIDE)
+    if apid == IDLE_APID or not 0 <= spacecraft_id < MAX_SPACECRAFT or not is_valid_apid(base_apid):
+        raise ApidError(f"APID {apid:#05x} does not belong to any spacecraft subsystem")
+    return spacecraft_id, base_apid
@@ -5,38 +5,311 @@
 
 # Polynomial: x^16 + x^12 + x^5 + 1 (0x1021)
 
-def compute_crc16(data: bytes) -> int:
+# Three interchangeable engines are provided, all bit-identical:
+#   - a 256-entry table-driven engine (one lookup per byte)
+#   - a slicing-by-8 engine (eight lookups per 8 bytes, fewer loop iterations)
+#   - binascii.crc_hqx, which implements the same CRC in C
+# The fastest available engine is chosen at import time and used by compute_crc16.
+
+import numpy as np
+
+try:
+    from binascii import crc_hqx as _crc_hqx
+except ImportError:  # pragma: no cover - binascii is always built on CPython
+    _crc_hqx = None
+
+CRC16_POLY = 0x1021  # Generator polynomial
+CRC16_INIT = 0xFFFF  # Initial register value
+SLICE_COUNT = 8      # Number of bytes consumed per iteration by the slicing engine
+
+
+def _build_tables(count: int = SLICE_COUNT) -> tuple:
     """
-    Compute the CRC-16-CCITT checksum for the given data.
-    
+    Build the lookup tables used by the table-driven and slicing engines.
+
+    tables[0][b] is the CRC register after shifting byte b through an all-zero register.
+    tables[k][b] is tables[0][b] advanced through k further zero bytes, which lets
+    the slicing engine combine the contribution of k+1 bytes with a single XOR.
+
+    Args:
+        count (int): Number of tables to build.
+
+    Returns:
+        tuple: A tuple of `count` tuples of 256 ints each.
+    """
+    base = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ CRC16_POLY) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+        base.append(crc)
+
+    tables = [base]
+    for _ in range(1, count):
+        prev = tables[-1]
+        tables.append([((value << 8) & 0xFFFF) ^ base[value >> 8] for value in prev])
+    return tuple(tuple(table) for table in tables)
+
+
+CRC16_SLICE_TABLES = _build_tables()
+CRC16_TABLE = CRC16_SLICE_TABLES[0]
+
+# NumPy copies of the tables for the vectorized batch engine.
+# The pair table folds two bytes per lookup: for a register r and the next two
+# bytes as a big-endian word w, the new register is CRC16_PAIR_TABLE[r ^ w].
+_NP_TABLE = np.array(CRC16_TABLE, dtype=np.uint16)
+CRC16_PAIR_TABLE = (
+    np.array(CRC16_SLICE_TABLES[1], dtype=np.uint16)[np.arange(65536) >> 8] ^
+    _NP_TABLE[np.arange(65536) & 0xFF]
+)
+
+
+def compute_crc16_bitwise(data: bytes, crc: int = CRC16_INIT) -> int:
+    """
+    Reference bit-at-a-time CRC-16-CCITT. Slow, kept to validate the fast engines.
+
     Args:
         data (bytes): The input data to compute the CRC for.
-        
+        crc (int): Register value to start from (CRC16_INIT for a fresh CRC).
+
     Returns:
         int: The computed CRC-16-CCITT checksum.
     """
-    crc = 0xFFFF  # Initial value
     for byte in data:
         crc ^= byte << 8  # XOR byte into high byte of crc
         for _ in range(8):  # Process each bit
             if crc & 0x8000:  # If the high bit is set
-                crc = (crc << 1) ^ 0x1021  # Shift left and XOR with polynomial
+                crc = (crc << 1) ^ CRC16_POLY  # Shift left and XOR with polynomial
             else:
                 crc <<= 1  # Just shift left
             crc &= 0xFFFF  # Ensure crc remains a 16-bit value
     return crc
 
+
+def compute_crc16_table(data: bytes, crc: int = CRC16_INIT) -> int:
+    """
+    Table-driven CRC-16-CCITT, one table lookup per byte.
+
+    Args:
+        data (bytes): The input data to compute the CRC for.
+        crc (int): Register value to start from (CRC16_INIT for a fresh CRC).
+
+    Returns:
+        int: The computed CRC-16-CCITT checksum.
+    """
+    table = CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def compute_crc16_slicing8(data: bytes, crc: int = CRC16_INIT) -> int:
+    """
+    Slicing-by-8 CRC-16-CCITT: consumes eight bytes per loop iteration.
+
+    Args:
+        data (bytes): The input data to compute the CRC for.
+        crc (int): Register value to start from (CRC16_INIT for a fresh CRC).
+
+    Returns:
+        int: The computed CRC-16-CCITT checksum.
+    """
+    t0, t1, t2, t3, t4, t5, t6, t7 = CRC16_SLICE_TABLES
+    data = memoryview(data).cast("B")
+    length = len(data)
+    end = length - (length % 8)
+
+    for i in range(0, end, 8):
+        # Fold the current register into the first two bytes of the block,
+        # then look up the contribution of each byte at its distance from the end
+        crc = (
+            t7[data[i] ^ (crc >> 8)] ^
+            t6[data[i + 1] ^ (crc & 0xFF)] ^
+            t5[data[i + 2]] ^
+            t4[data[i + 3]] ^
+            t3[data[i + 4]] ^
+            t2[data[i + 5]] ^
+            t1[data[i + 6]] ^
+            t0[data[i + 7]]
+        )
+
+    # Finish any tail bytes one at a time
+    for byte in data[end:]:
+        crc = ((crc << 8) & 0xFFFF) ^ t0[(crc >> 8) ^ byte]
+    return crc
+
+
+# Pick the fastest engine available on this interpreter
+if _crc_hqx is not None:
+    CRC16_ENGINE = "crc_hqx"
+    _crc16_update = _crc_hqx
+else:  # pragma: no cover
+    CRC16_ENGINE = "slicing8"
+    _crc16_update = compute_crc16_slicing8
+
+
+def compute_crc16(data: bytes) -> int:
+    """
+    Compute the CRC-16-CCITT checksum for the given data.
+
+    Args:
+        data (bytes): The input data to compute the CRC for.
+
+    Returns:
+        int: The computed CRC-16-CCITT checksum.
+    """
+    return _crc16_update(data, CRC16_INIT)
+
+class Crc16:
+    """
+    Incremental CRC-16-CCITT accumulator with resumable state.
+
+    Feed the data in any number of chunks (bytes, bytearray or memoryview) and
+    the result equals compute_crc16 over their concatenation, so callers never
+    have to join fragments just to checksum them.
+
+    Example:
+        acc = Crc16()
+        acc.update(primary_header)
+        acc.update(payload_view)
+        checksum = acc.digest()
+    """
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, data: bytes = b"", crc: int = CRC16_INIT):
+        """
+        Args:
+            data (bytes): Optional first chunk to checksum.
+            crc (int): Register value to resume from (CRC16_INIT for a fresh CRC).
+        """
+        self._crc = _crc16_update(data, crc & 0xFFFF) if data else crc & 0xFFFF
+
+    def update(self, chunk: bytes) -> "Crc16":
+        """
+        Fold another chunk into the running CRC.
+
+        Args:
+            chunk (bytes): Any bytes-like object.
+
+        Returns:
+            Crc16: self, so calls can be chained.
+        """
+        self._crc = _crc16_update(chunk, self._crc)
+        return self
+
+    def digest(self) -> int:
+        """
+        Returns:
+            int: The CRC of all data fed so far.
+        """
+        return self._crc
+
+    def digest_bytes(self) -> bytes:
+        """
+        Returns:
+            bytes: The CRC as 2 big-endian bytes, as stored at the end of a packet.
+        """
+        return self._crc.to_bytes(2, byteorder='big')
+
+    def copy(self) -> "Crc16":
+        """
+        Returns:
+            Crc16: An independent accumulator with the same state.
+        """
+        return Crc16(crc=self._crc)
+
+    def __repr__(self) -> str:
+        return f"Crc16(crc=0x{self._crc:04X})"
+
+def verify_crc(packet: bytes) -> bool:
+    """
+    Check the trailing 2-byte CRC of a packet.
+
+    Args:
+        packet (bytes): A packet whose last two bytes are its big-endian CRC.
+
+    Returns:
+        bool: True if the CRC matches the rest of the packet.
+    """
+    if len(packet) < 2:
+        return False
+    return _crc16_update(packet[:-2], CRC16_INIT) == int.from_bytes(packet[-2:], 'big')
+
+def compute_crc16_batch(rows: np.ndarray) -> np.ndarray:
+    """
+    Compute the CRC-16-CCITT of every row of a 2-D uint8 array at once.
+
+    The loop runs over columns (two bytes per step) while each step is a single
+    vectorized table lookup across all rows, so the Python overhead is per
+    column rather than per packet.
+
+    Args:
+        rows (np.ndarray): (N, L) uint8 array, one message per row.
+
+    Returns:
+        np.ndarray: (N,) uint16 array of CRCs.
+    """
+    rows = np.asarray(rows, dtype=np.uint8)
+    if rows.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of rows, got {rows.ndim} dimension(s)")
+
+    count, length = rows.shape
+    crc = np.full(count, CRC16_INIT, dtype=np.uint16)
+    pairs = length // 2
+
+    if pairs:
+        # Big-endian 16-bit words, transposed so each step reads one contiguous column
+        words = (rows[:, 0:2 * pairs:2].astype(np.uint16) << 8) | rows[:, 1:2 * pairs:2]
+        words = np.ascontiguousarray(words.T)
+        table = CRC16_PAIR_TABLE
+        for column in words:
+            crc = table[crc ^ column]
+
+    if length % 2:
+        crc = (crc << 8) ^ _NP_TABLE[(crc >> 8) ^ rows[:, -1]]
+
+    return crc
+
+def verify_crc_batch(buffer: bytes, packet_len: int) -> np.ndarray:
+    """
+    Verify the CRCs of many fixed-length packets stored back to back.
+
+    Intended for archived captures of a single APID, where every packet has
+    the same length and the buffer can be viewed as an (N, packet_len) matrix
+    without copying.
+
+    Args:
+        buffer (bytes): Contiguous packets, each ending in its big-endian CRC.
+        packet_len (int): Length of every packet in bytes, CRC included.
+
+    Returns:
+        np.ndarray: (N,) boolean mask, True where the packet's CRC is valid.
+    """
+    if packet_len < 3:
+        raise ValueError(f"Packet length must be at least 3 bytes, got {packet_len}")
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) % packet_len:
+        raise ValueError(f"Buffer length {len(data)} is not a multiple of packet length {packet_len}")
+
+    rows = data.reshape(-1, packet_len)
+    stored = (rows[:, -2].astype(np.uint16) << 8) | rows[:, -1]
+    return compute_crc16_batch(rows[:, :-2]) == stored
+
 def append_crc(data: bytes) -> bytes:
     """
     Append the CRC-16-CCITT checksum to the given data.
-    
+
     Args:
         data (bytes): The input data to append the CRC to.
-        
+
     Returns:
         bytes: The input data with the CRC-16-CCITT checksum appended.
     """
     crc = compute_crc16(data)
     crc_bytes = crc.to_bytes(2, byteorder='big')  # Convert CRC to 2 bytes
     return data + crc_bytes
- 
\ No newline at end of file
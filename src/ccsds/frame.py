@@ -0,0 +1,361 @@
+"""
+Purpose of this file: CCSDS TM Transfer Frames (CCSDS 132.0-B).
+
+Space packets are small (27-56 bytes), so sending each one in its own datagram
+wastes most of the link on headers and syscalls. Real downlinks instead pack a
+continuous stream of packets into fixed-length transfer frames:
+
+    | Primary header (6) | Data field (frame_length - 8) | FECF CRC (2) |
+
+Primary header (48 bits):
+    version (2) = 00, spacecraft id (10), virtual channel id (3), OCF flag (1) = 0,
+    master channel frame count (8), virtual channel frame count (8),
+    data field status (16): secondary header flag (1) = 0, sync flag (1) = 0,
+    packet order flag (1) = 0, segment length id (2) = 11, first header pointer (11).
+
+Each virtual channel carries its own packet stream. A packet may start in one
+frame and end in the next; the first header pointer (FHP) gives the offset of
+the first packet that starts in a frame, so the receiver can find packet
+boundaries again after a lost frame. Partially filled frames are completed with
+an idle packet (APID 0x7FF).
+
+Idle packets follow the same length convention as our telemetry packets (see
+schema.packet_size_from_length): the length field excludes the trailing CRC.
+"""
+
+import struct
+from collections import deque
+
+from src.ccsds import crc, schema
+from src.ccsds.apid import IDLE_APID
+
+FRAME_HEADER_STRUCT = struct.Struct(">HBBH")
+FRAME_HEADER_LEN = FRAME_HEADER_STRUCT.size  # 6 bytes
+FECF_LEN = schema.CRC_LEN  # Frame Error Control Field, CRC-16-CCITT like our packets
+
+# 1115 bytes is a common fixed frame length (5 x 223-byte Reed-Solomon blocks) and fits one UDP datagram
+DEFAULT_FRAME_LENGTH = 1115
+MAX_SPACECRAFT_ID = 0x3FF  # 10 bits
+MAX_VCID = 0x07  # 3 bits
+
+FHP_NO_PACKET_START = 0x7FF  # no packet starts in this frame
+FHP_IDLE_DATA = 0x7FE  # the data field holds only idle data
+
+SEGMENT_LENGTH_ID = 0b11 << 11  # "no segmentation", required when the sync flag is 0
+IDLE_FILL_BYTE = 0x55
+MIN_IDLE_PACKET = schema.PRIMARY_HEADER_LEN + 1 + schema.CRC_LEN  # header, one data byte, CRC
+
+
+def encode_frame_header(spacecraft_id: int, vcid: int, master_count: int, vc_count: int, fhp: int) -> bytes:
+    """
+    Encode the 6-byte TM Transfer Frame primary header.
+
+    Args:
+        spacecraft_id (int): 10-bit spacecraft id.
+        vcid (int): 3-bit virtual channel id.
+        master_count (int): Master channel frame count (wrapped to 8 bits).
+        vc_count (int): Virtual channel frame count (wrapped to 8 bits).
+        fhp (int): 11-bit first header pointer.
+
+    Returns:
+        bytes: The encoded header.
+    """
+    word1 = (spacecraft_id & MAX_SPACECRAFT_ID) << 4 | (vcid & MAX_VCID) << 1
+    return FRAME_HEADER_STRUCT.pack(word1, master_count & 0xFF, vc_count & 0xFF, SEGMENT_LENGTH_ID | (fhp & 0x7FF))
+
+
+def decode_frame_header(frame: bytes) -> dict:
+    """
+    Decode the TM Transfer Frame primary header.
+
+    Args:
+        frame (bytes): A frame (at least the first 6 bytes).
+
+    Returns:
+        dict: version, spacecraft_id, vcid, ocf_flag, master_count, vc_count, sync_flag, fhp.
+    """
+    if len(frame) < FRAME_HEADER_LEN:
+        raise ValueError(f"Incomplete transfer frame. Expected at least {FRAME_HEADER_LEN} bytes, got {len(frame)}")
+    word1, master_count, vc_count, status = FRAME_HEADER_STRUCT.unpack_from(frame)
+    return {
+        "version": (word1 >> 14) & 0x03,
+        "spacecraft_id": (word1 >> 4) & MAX_SPACECRAFT_ID,
+        "vcid": (word1 >> 1) & MAX_VCID,
+        "ocf_flag": word1 & 0x01,
+        "master_count": master_count,
+        "vc_count": vc_count,
+        "sync_flag": (status >> 14) & 0x01,
+        "fhp": status & 0x7FF,
+    }
+
+
+def encode_idle_packet(size: int, seq_count: int = 0) -> bytes:
+    """
+    Build an idle packet (APID 0x7FF) of exactly `size` bytes.
+
+    Args:
+        size (int): Total packet size including header and CRC, at least MIN_IDLE_PACKET.
+        seq_count (int): Sequence count (wrapped to 14 bits).
+
+    Returns:
+        bytes: The idle packet.
+    """
+    if size < MIN_IDLE_PACKET:
+        raise ValueError(f"Idle packet must be at least {MIN_IDLE_PACKET} bytes, got {size}")
+    data_len = size - schema.PRIMARY_HEADER_LEN - schema.CRC_LEN
+    # Version 0, telemetry, no secondary header; standalone sequence flags
+    header = schema.PRIMARY_HEADER_STRUCT.pack(IDLE_APID, (0b11 << 14) | (seq_count & 0x3FFF), data_len - 1)
+    return crc.append_crc(header + bytes([IDLE_FILL_BYTE]) * data_len)
+
+
+class _VirtualChannelTx:
+    __slots__ = ("vcid", "stream", "base", "starts", "vc_count", "idle_count")
+
+    def __init__(self, vcid: int):
+        self.vcid = vcid
+        self.stream = bytearray()  # packet bytes not yet placed in a frame
+        self.base = 0  # stream offset of stream[0] since the channel was created
+        self.starts = deque()  # stream offsets where packets begin
+        self.vc_count = 0
+        self.idle_count = 0
+
+
+class FrameMultiplexer:
+    """
+    Packs space packets from one or more virtual channels into fixed-length frames.
+
+    Example:
+        mux = FrameMultiplexer(spacecraft_id=42)
+        for packet in packets:
+            for frame in mux.add_packet(packet):
+                sock.sendto(frame, address)
+        for frame in mux.flush():  # pad and emit whatever is left
+            sock.sendto(frame, address)
+    """
+
+    def __init__(self, spacecraft_id: int = 0, frame_length: int = DEFAULT_FRAME_LENGTH):
+        """
+        Args:
+            spacecraft_id (int): 10-bit spacecraft id written to every frame.
+            frame_length (int): Total frame length in bytes, header and FECF included.
+        """
+        if not 0 <= spacecraft_id <= MAX_SPACECRAFT_ID:
+            raise ValueError(f"Spacecraft id {spacecraft_id} out of range (0-{MAX_SPACECRAFT_ID})")
+        self.data_field_len = frame_length - FRAME_HEADER_LEN - FECF_LEN
+        # The FHP is 11 bits and 0x7FE/0x7FF are reserved, so the data field must stay below 2046 bytes
+        if not MIN_IDLE_PACKET <= self.data_field_len < FHP_IDLE_DATA:
+            raise ValueError(f"Frame length {frame_length} out of range "
+                             f"({MIN_IDLE_PACKET + FRAME_HEADER_LEN + FECF_LEN}-{FHP_IDLE_DATA + FRAME_HEADER_LEN + FECF_LEN - 1})")
+        self.spacecraft_id = spacecraft_id
+        self.frame_length = frame_length
+        self.master_count = 0
+        self.frames_emitted = 0
+        self.packets_added = 0
+        self._channels = {}
+
+    def _channel(self, vcid: int) -> _VirtualChannelTx:
+        channel = self._channels.get(vcid)
+        if channel is None:
+            if not 0 <= vcid <= MAX_VCID:
+                raise ValueError(f"Virtual channel id {vcid} out of range (0-{MAX_VCID})")
+            channel = self._channels[vcid] = _VirtualChannelTx(vcid)
+        return channel
+
+    def pending(self, vcid: int = None) -> int:
+        """
+        Returns:
+            int: Packet bytes waiting for a frame on one virtual channel, or on all of them.
+        """
+        if vcid is not None:
+            channel = self._channels.get(vcid)
+            return len(channel.stream) if channel else 0
+        return sum(len(channel.stream) for channel in self._channels.values())
+
+    def add_packet(self, packet, vcid: int = 0) -> list:
+        """
+        Queue a packet on a virtual channel.
+
+        Args:
+            packet: One encoded space packet (bytes-like).
+            vcid (int): Virtual channel id.
+
+        Returns:
+            list: Frames (bytes) completed by this packet, possibly empty.
+        """
+        channel = self._channel(vcid)
+        channel.starts.append(channel.base + len(channel.stream))
+        channel.stream += packet
+        self.packets_added += 1
+        return self._cut_frames(channel)
+
+    def flush(self, vcid: int = None) -> list:
+        """
+        Complete partially filled frames with an idle packet and return them.
+
+        Args:
+            vcid (int): Virtual channel to flush. Flushes every channel if None.
+
+        Returns:
+            list: The completed frames (bytes).
+        """
+        channels = self._channels.values() if vcid is None else [self._channel(vcid)]
+        frames = []
+        for channel in channels:
+            used = len(channel.stream) % self.data_field_len
+            if used == 0:
+                continue
+            gap = self.data_field_len - used
+            if gap < MIN_IDLE_PACKET:
+                # Too small for an idle packet; let the idle packet run on into one more frame
+                gap += self.data_field_len
+            channel.starts.append(channel.base + len(channel.stream))
+            channel.stream += encode_idle_packet(gap, channel.idle_count)
+            channel.idle_count = (channel.idle_count + 1) % 16384
+            frames.extend(self._cut_frames(channel))
+        return frames
+
+    def _cut_frames(self, channel: _VirtualChannelTx) -> list:
+        frames = []
+        data_len = self.data_field_len
+        stream = channel.stream
+        starts = channel.starts
+        offset = 0
+        while len(stream) - offset >= data_len:
+            frame_start = channel.base + offset
+            frame_end = frame_start + data_len
+            # Drop packet starts that lie in earlier frames
+            while starts and starts[0] < frame_start:
+                starts.popleft()
+            fhp = starts[0] - frame_start if starts and starts[0] < frame_end else FHP_NO_PACKET_START
+
+            frame = bytearray(encode_frame_header(self.spacecraft_id, channel.vcid, self.master_count, channel.vc_count, fhp))
+            frame += stream[offset:offset + data_len]
+            frames.append(bytes(crc.append_crc(frame)))
+
+            offset += data_len
+            self.master_count = (self.master_count + 1) & 0xFF
+            channel.vc_count = (channel.vc_count + 1) & 0xFF
+        if offset:
+            del stream[:offset]
+            channel.base += offset
+        self.frames_emitted += len(frames)
+        return frames
+
+
+class _VirtualChannelRx:
+    __slots__ = ("pending", "in_sync", "expected_count")
+
+    def __init__(self):
+        self.pending = bytearray()  # start of a packet that continues in the next frame
+        self.in_sync = False  # False until an FHP tells us where a packet starts
+        self.expected_count = None
+
+
+class FrameDemultiplexer:
+    """
+    Recovers space packets from TM Transfer Frames, including packets that span frames.
+
+    Idle packets are discarded. After a corrupted or missing frame the partial
+    packet is dropped and extraction resumes at the next frame's first header pointer.
+
+    Example:
+        demux = FrameDemultiplexer()
+        for packet in demux.feed(datagram):
+            view = PacketView(packet)
+    """
+
+    def __init__(self, spacecraft_id: int = None):
+        """
+        Args:
+            spacecraft_id (int): Only accept frames from this spacecraft. Accepts all if None.
+        """
+        self.spacecraft_id = spacecraft_id
+        self._channels = {}  # (spacecraft_id, vcid) -> _VirtualChannelRx
+        self.frames = 0
+        self.packets = 0
+        self.idle_packets = 0
+        self.bad_frames = 0  # FECF mismatch, wrong version or foreign spacecraft
+        self.lost_frames = 0  # gaps in the virtual channel frame count
+        self.dropped_bytes = 0  # partial packet bytes discarded after a loss
+
+    def feed(self, frame) -> list:
+        """
+        Process one frame.
+
+        Args:
+            frame: One complete transfer frame (bytes-like).
+
+        Returns:
+            list: Complete packets (bytes) recovered from this frame, in order.
+        """
+        if len(frame) < FRAME_HEADER_LEN + FECF_LEN or not crc.verify_crc(frame):
+            self.bad_frames += 1
+            return []
+        header = decode_frame_header(frame)
+        if header["version"] != 0 or (self.spacecraft_id is not None and header["spacecraft_id"] != self.spacecraft_id):
+            self.bad_frames += 1
+            return []
+        self.frames += 1
+
+        key = (header["spacecraft_id"], header["vcid"])
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _VirtualChannelRx()
+
+        # A gap in the VC frame count means part of the packet stream is gone
+        if channel.expected_count is not None and header["vc_count"] != channel.expected_count:
+            self.lost_frames += (header["vc_count"] - channel.expected_count) & 0xFF
+            self._lose_sync(channel)
+        channel.expected_count = (header["vc_count"] + 1) & 0xFF
+
+        data = memoryview(frame)[FRAME_HEADER_LEN:len(frame) - FECF_LEN]
+        fhp = header["fhp"]
+        packets = []
+
+        if fhp == FHP_IDLE_DATA:
+            return packets
+        if fhp == FHP_NO_PACKET_START:
+            if channel.in_sync:
+                channel.pending += data
+                self._extract(channel, packets)
+            return packets
+        if fhp >= len(data):
+            self.bad_frames += 1
+            self._lose_sync(channel)
+            return packets
+
+        if channel.in_sync:
+            # The bytes before the FHP must complete the packet in progress exactly
+            channel.pending += data[:fhp]
+            self._extract(channel, packets)
+            if channel.pending:
+                self._lose_sync(channel)
+        else:
+            self.dropped_bytes += fhp  # tail of a packet whose start we never saw
+        channel.pending += data[fhp:]
+        channel.in_sync = True
+        self._extract(channel, packets)
+        return packets
+
+    def _lose_sync(self, channel: _VirtualChannelRx):
+        self.dropped_bytes += len(channel.pending)
+        channel.pending.clear()
+        channel.in_sync = False
+
+    def _extract(self, channel: _VirtualChannelRx, packets: list):
+        pending = channel.pending
+        offset = 0
+        end = len(pending)
+        while end - offset >= schema.PRIMARY_HEADER_LEN:
+            packet_id, _, length = schema.PRIMARY_HEADER_STRUCT.unpack_from(pending, offset)
+            size = schema.packet_size_from_length(length)
+            if end - offset < size:
+                break
+            if packet_id & 0x07FF == IDLE_APID:
+                self.idle_packets += 1
+            else:
+                packets.append(bytes(pending[offset:offset + size]))
+                self.packets += 1
+            offset += size
+        if offset:
+            del pending[:offset]
@@ -0,0 +1,304 @@
+"""
+Purpose of this file: Split a byte stream into CCSDS packets.
+
+decode_ccsds_packet expects exactly one packet per buffer, which is what a UDP
+datagram gives us. TCP connections, serial links and capture files deliver a
+byte stream instead, cut into chunks at arbitrary points. PacketFramer takes
+those chunks and uses the primary header (APID and length field) to find
+packet boundaries:
+
+    framer = PacketFramer()
+    for chunk in iter(lambda: stream.read(1 << 20), b""):
+        for packet in framer.feed(chunk):
+            view = PacketView(packet)
+
+Packets that lie inside one chunk are returned as memoryviews of that chunk,
+without copying; they stay valid as long as the chunk is not modified. Only a
+packet that straddles two chunks is copied.
+
+A header is only accepted if its APID has a schema and its length field
+matches that schema's packet size (idle packets, APID 0x7FF, are accepted at
+any length up to max_packet_size and then skipped). If a header is not
+plausible or the packet's CRC fails, the framer drops one byte and tries again
+at the next offset, so it resynchronizes after corruption or a torn write.
+Every discarded byte is counted in dropped_bytes.
+"""
+
+import numpy as np
+
+from src.ccsds import crc, schema
+from src.ccsds.apid import IDLE_APID
+
+IDLE_PACKET_ID = IDLE_APID  # version 0, telemetry, no secondary header
+DEFAULT_MAX_PACKET_SIZE = 2048
+# Spans with at least this many packets have their CRCs checked in one vectorized pass per packet size
+BATCH_VERIFY_MIN = 64
+# Spans of at least this many bytes locate candidate headers with NumPy instead of a byte-by-byte walk
+FAST_WALK_MIN = 4096
+_ANY_SIZE = -1  # idle packets may have any length
+
+
+def _build_size_table() -> np.ndarray:
+    """
+    Expected packet size for every possible 16-bit packet id word (0 where implausible).
+    """
+    table = np.zeros(1 << 16, dtype=np.int32)
+    for apid in range(IDLE_APID):
+        packet_schema = schema.find_schema(apid)
+        if packet_schema is not None:
+            table[0x0800 | apid] = packet_schema.packet_size
+    table[IDLE_PACKET_ID] = _ANY_SIZE
+    return table
+
+
+_SIZE_TABLE = _build_size_table()
+# First header bytes that can start a plausible packet; filters most payload bytes before the full check
+_FIRST_BYTE_OK = np.zeros(256, dtype=bool)
+_FIRST_BYTE_OK[np.flatnonzero(_SIZE_TABLE) >> 8] = True
+
+
+class PacketFramer:
+    """
+    Incremental packet delimiter for byte streams, with resynchronization.
+
+    Attributes:
+        packets (int): Packets returned so far.
+        idle_packets (int): Idle packets skipped.
+        crc_errors (int): Candidate packets rejected because of their CRC.
+        dropped_bytes (int): Bytes discarded while resynchronizing.
+    """
+
+    def __init__(self, verify_crc: bool = True, max_packet_size: int = DEFAULT_MAX_PACKET_SIZE):
+        """
+        Args:
+            verify_crc (bool): Reject (and resynchronize past) packets whose CRC does not match.
+            max_packet_size (int): Largest idle packet accepted, in bytes.
+        """
+        self.verify_crc = verify_crc
+        self.max_packet_size = max_packet_size
+        self.packets = 0
+        self.idle_packets = 0
+        self.crc_errors = 0
+        self.dropped_bytes = 0
+        self._carry = b""  # start of a packet (or header) cut off at the end of the last chunk
+        self._sizes = {}  # packet id word -> expected packet size, or 0 if the header is not plausible
+
+    @property
+    def pending(self) -> int:
+        """
+        Bytes held back waiting for the rest of a packet.
+        """
+        return len(self._carry)
+
+    def _expected_size(self, packet_id: int) -> int:
+        size = self._sizes.get(packet_id)
+        if size is None:
+            # Telemetry packets (version 0, type 0, secondary header flag set) with a schema
+            size = self._sizes[packet_id] = max(int(_SIZE_TABLE[packet_id]), 0)
+        return size
+
+    def feed(self, chunk) -> list:
+        """
+        Consume the next chunk of the stream.
+
+        Args:
+            chunk: bytes-like, any length.
+
+        Returns:
+            list: Complete packets (memoryview) found so far, in stream order. Idle packets are skipped.
+        """
+        chunk = memoryview(chunk).cast("B")
+        packets = []
+        offset = 0
+
+        if self._carry:
+            # Finish the packet that started in the previous chunk in a small scratch buffer
+            carry_len = len(self._carry)
+            scratch = self._carry + chunk[:self.max_packet_size].tobytes()
+            position = self._scan(scratch, 0, carry_len, packets)
+            if position < carry_len:
+                # Not even one packet could be completed; everything is still pending
+                self._carry = scratch[position:]
+                return packets
+            offset = position - carry_len
+            self._carry = b""
+
+        position = self._scan(chunk, offset, len(chunk), packets)
+        self._carry = chunk[position:].tobytes()
+        return packets
+
+    def _scan(self, buffer, offset: int, limit: int, packets: list) -> int:
+        """
+        Find packets starting before `limit` and append them to `packets`.
+
+        Returns:
+            int: Offset of the first byte not consumed.
+        """
+        view = memoryview(buffer)
+        end = len(buffer)
+        slow_until = offset  # after a CRC error, walk byte by byte for a while instead of re-indexing the whole span
+        while offset < limit:
+            if offset >= slow_until and end - offset >= FAST_WALK_MIN:
+                walk_limit = limit
+                starts, sizes, idle, skipped, stop = self._walk_fast(view, offset, walk_limit, end)
+            else:
+                walk_limit = min(limit, slow_until) if offset < slow_until else limit
+                starts, sizes, idle, skipped, stop = self._walk(view, offset, walk_limit, end)
+            bad = self._first_bad_crc(view, starts, sizes) if self.verify_crc and len(starts) else None
+            if bad is None:
+                good = len(starts)
+                self.dropped_bytes += skipped
+                offset = stop
+            else:
+                # Keep the packets before the bad one and resynchronize one byte past its start
+                good = bad
+                bad_start = int(starts[bad])
+                self.dropped_bytes += bad_start - offset - int(np.sum(sizes[:bad])) + 1
+                self.crc_errors += 1
+                offset = bad_start + 1
+                slow_until = offset + FAST_WALK_MIN
+            if isinstance(starts, np.ndarray):
+                starts, sizes = starts.tolist(), sizes.tolist()
+            if idle:
+                idle_starts = set(idle)
+                kept = [(start, size) for start, size in zip(starts[:good], sizes[:good]) if start not in idle_starts]
+                self.idle_packets += good - len(kept)
+            else:
+                kept = zip(starts[:good], sizes[:good])
+            count = len(packets)
+            packets.extend([view[start:start + size] for start, size in kept])
+            self.packets += len(packets) - count
+            if bad is None and stop < walk_limit:
+                break  # the rest of the packet has not arrived yet
+        return offset
+
+    def _walk(self, view, offset: int, limit: int, end: int) -> tuple:
+        """
+        Follow length fields from `offset`, skipping implausible headers one byte at a time.
+
+        Idle packets are included in the result (and listed separately) so their
+        CRC is checked like any other packet's. Counters are left to the caller,
+        which may discard the part of the walk after a bad CRC.
+
+        Returns:
+            tuple: (packet starts, packet sizes, idle packet starts, bytes skipped, offset where the walk stopped).
+        """
+        unpack_from = schema.PRIMARY_HEADER_STRUCT.unpack_from
+        packet_size_from_length = schema.packet_size_from_length
+        header_len = schema.PRIMARY_HEADER_LEN
+        sizes_cache = self._sizes
+        starts = []
+        sizes = []
+        idle = []
+        skipped = 0
+
+        while offset < limit and end - offset >= header_len:
+            packet_id, _, length = unpack_from(view, offset)
+            size = packet_size_from_length(length)
+            expected = sizes_cache.get(packet_id)
+            if expected is None:
+                expected = self._expected_size(packet_id)
+
+            if expected != size:
+                if packet_id != IDLE_PACKET_ID or size > self.max_packet_size:
+                    skipped += 1
+                    offset += 1
+                    continue
+                idle.append(offset)
+            if end - offset < size:
+                if idle and idle[-1] == offset:
+                    idle.pop()
+                break
+            starts.append(offset)
+            sizes.append(size)
+            offset += size
+
+        return starts, sizes, idle, skipped, offset
+
+    def _walk_fast(self, view, offset: int, limit: int, end: int) -> tuple:
+        """
+        Same walk as _walk, for large spans.
+
+        Every offset holding a plausible header is found with vectorized table
+        lookups, and each candidate is linked to the first candidate at or after
+        its end. Following those links from the start gives exactly the packets
+        the byte-by-byte walk would find (the gaps between links are the bytes it
+        would drop). The links are followed by pointer doubling, so there is no
+        Python loop per packet.
+
+        Returns:
+            tuple: (packet starts array, packet sizes array, idle packet starts, bytes skipped, offset where the walk stopped).
+        """
+        span = np.frombuffer(view, dtype=np.uint8, count=end - offset, offset=offset)
+        header_len = schema.PRIMARY_HEADER_LEN
+        rel_limit = min(limit, end) - offset
+
+        positions = np.flatnonzero(_FIRST_BYTE_OK[span[:len(span) - header_len + 1]])
+        packet_ids = (span[positions].astype(np.int32) << 8) | span[positions + 1]
+        lengths = (span[positions + 4].astype(np.int32) << 8) | span[positions + 5]
+        sizes = schema.packet_size_from_length(lengths)
+        expected = _SIZE_TABLE[packet_ids]
+        plausible = (expected == sizes) | ((expected == _ANY_SIZE) & (sizes <= self.max_packet_size))
+        positions = positions[plausible]
+        sizes = sizes[plausible]
+        is_idle = expected[plausible] == _ANY_SIZE
+        count = len(positions)
+        span_len = len(span)
+
+        # Terminal nodes end the walk: past the limit, or a header whose packet is not complete yet
+        terminal = (positions >= rel_limit) | (positions + sizes > span_len)
+        jump = np.append(np.searchsorted(positions, positions + sizes), count)  # index count = end of walk
+        jump[:count][terminal] = count
+
+        # Pointer doubling: after step k, `reached` holds every node within 2**k links of the first one
+        reached = np.zeros(count + 1, dtype=bool)
+        reached[0] = True
+        links = 1
+        while links <= count:
+            reached[jump[np.flatnonzero(reached)]] = True
+            jump = jump[jump]
+            links *= 2
+        path = np.flatnonzero(reached[:count])
+
+        stop = None
+        if len(path) and terminal[path[-1]]:
+            last = path[-1]
+            path = path[:-1]
+            if positions[last] < rel_limit:
+                stop = int(positions[last])  # wait for the rest of this packet
+        starts = positions[path]
+        path_sizes = sizes[path]
+        next_start = int(starts[-1] + path_sizes[-1]) if len(path) else 0
+        if stop is None:
+            # Everything after the last packet up to the limit (or the last full header) is unusable
+            stop = max(next_start, min(rel_limit, span_len - header_len + 1))
+        # Bytes between packets and after the last one were skipped while resynchronizing
+        skipped = stop - int(path_sizes.sum())
+
+        idle = (starts[is_idle[path]] + offset).tolist() if is_idle.any() else []
+        return starts + offset, path_sizes, idle, skipped, stop + offset
+
+    def _first_bad_crc(self, view, starts: list, sizes: list):
+        """
+        Index of the first packet with a bad CRC, or None.
+        """
+        if len(starts) < BATCH_VERIFY_MIN:
+            verify = crc.verify_crc
+            for index, (start, size) in enumerate(zip(starts, sizes)):
+                if not verify(view[start:start + size]):
+                    return index
+            return None
+
+        # One vectorized CRC pass per distinct packet size
+        data = np.frombuffer(view, dtype=np.uint8)
+        starts_array = np.asarray(starts, dtype=np.int64)
+        sizes_array = np.asarray(sizes, dtype=np.int64)
+        bad_index = None
+        for size in np.unique(sizes_array):
+            group = np.flatnonzero(sizes_array == size)
+            rows = data[starts_array[group, None] + np.arange(size)]
+            stored = (rows[:, -2].astype(np.uint16) << 8) | rows[:, -1]
+            failed = group[crc.compute_crc16_batch(rows[:, :-2]) != stored]
+            if len(failed) and (bad_index is None or failed[0] < bad_index):
+                bad_index = int(failed[0])
+        return bad_index
@@ -0,0 +1,193 @@
+"""
+Purpose of this file: Lazy, zero-copy access to a received CCSDS packet.
+
+PacketView wraps a memoryview of the datagram and decodes only what is asked for:
+the 6-byte primary header on the first header access, the CUC time on the first
+time access, and individual payload fields on demand. Every decoded value is
+cached, so repeated access is free.
+
+Consumers that only route by APID and sequence count pay for a single header
+unpack; to_dict() produces the same structure as decoder.decode_ccsds_packet
+for JSON consumers.
+"""
+
+from src.ccsds import schema
+from src.ccsds.apid import SPACECRAFT_APID_STRIDE
+from src.ccsds.crc import verify_crc
+from src.ccsds.decoder import format_timestamp
+
+
+class PacketView:
+    """
+    Read-only lazy view over one encoded packet.
+
+    Example:
+        view = PacketView(datagram)
+        if view.apid == 0x02:
+            voltage = view["battery_voltage"]
+    """
+
+    __slots__ = ("_buf", "_header", "_cuc", "_schema", "_fields", "_payload")
+
+    def __init__(self, packet):
+        """
+        Args:
+            packet: Any bytes-like object holding one packet. It is not copied.
+        """
+        self._buf = memoryview(packet).cast("B")
+        self._header = None
+        self._cuc = None
+        self._schema = None
+        self._fields = None
+        self._payload = None
+
+    # --- primary header -----------------------------------------------------
+
+    def _load_header(self) -> tuple:
+        if self._header is None:
+            if len(self._buf) < schema.PRIMARY_HEADER_LEN:
+                raise ValueError(f"Incomplete CCSDS packet. Expected at least {schema.PRIMARY_HEADER_LEN} bytes, got {len(self._buf)}")
+            self._header = schema.PRIMARY_HEADER_STRUCT.unpack_from(self._buf)
+        return self._header
+
+    @property
+    def version(self) -> int:
+        return (self._load_header()[0] >> 13) & 0x07
+
+    @property
+    def pkt_type(self) -> int:
+        return (self._load_header()[0] >> 12) & 0x01
+
+    @property
+    def sec_hdr_flag(self) -> int:
+        return (self._load_header()[0] >> 11) & 0x01
+
+    @property
+    def apid(self) -> int:
+        return self._load_header()[0] & 0x07FF
+
+    @property
+    def seq_flags(self) -> int:
+        return (self._load_header()[1] >> 14) & 0x03
+
+    @property
+    def seq_count(self) -> int:
+        return self._load_header()[1] & 0x3FFF
+
+    @property
+    def length(self) -> int:
+        """
+        Packet data field length in bytes (header field + 1), as in decode_primary_header.
+        """
+        return self._load_header()[2] + 1
+
+    @property
+    def packet_size(self) -> int:
+        """
+        Full packet size in bytes according to the length field, CRC included.
+        """
+        return schema.packet_size_from_length(self._load_header()[2])
+
+    # --- secondary header -----------------------------------------------------
+
+    @property
+    def cuc_time(self) -> int:
+        """
+        Raw 4-byte CUC word from the secondary header.
+        """
+        if self._cuc is None:
+            if len(self._buf) < schema.HEADER_LEN:
+                raise ValueError(f"Incomplete CCSDS packet. Expected at least {schema.HEADER_LEN} bytes, got {len(self._buf)}")
+            self._cuc = schema.SECONDARY_HEADER_STRUCT.unpack_from(self._buf, schema.PRIMARY_HEADER_LEN)[0]
+        return self._cuc
+
+    @property
+    def timestamp(self) -> str:
+        return format_timestamp(self.cuc_time)
+
+    # --- payload ----------------------------------------------------------------
+
+    @property
+    def schema(self) -> schema.PacketSchema:
+        if self._schema is None:
+            packet_schema = schema.get_schema(self.apid)
+            expected_len = packet_schema.packet_size
+            if len(self._buf) != expected_len:
+                raise ValueError(f"[DECODE ERROR] APID {self.apid:#04x}: Expected {expected_len} bytes, got {len(self._buf)} bytes")
+            self._schema = packet_schema
+        return self._schema
+
+    def __getitem__(self, name: str):
+        """
+        Decode a single payload field, caching the result.
+        """
+        if self._fields is None:
+            self._fields = {}
+        elif name in self._fields:
+            return self._fields[name]
+
+        try:
+            field_struct, offset = self.schema.field_layout[name]
+        except KeyError:
+            raise KeyError(f"{self.schema.subsystem} packets have no field '{name}'")
+        value = field_struct.unpack_from(self._buf, schema.HEADER_LEN + offset)[0]
+        self._fields[name] = value
+        return value
+
+    @property
+    def payload(self) -> dict:
+        """
+        All payload fields as a dict (decoded in one unpack, then cached).
+        """
+        if self._payload is None:
+            packet_schema = self.schema
+            self._payload = dict(zip(packet_schema.fields, packet_schema.struct.unpack_from(self._buf, schema.HEADER_LEN)))
+        return self._payload
+
+    # --- helpers ------------------------------------------------------------------
+
+    @property
+    def subsystem(self) -> str:
+        return self.schema.subsystem
+
+    @property
+    def spacecraft_id(self) -> int:
+        """
+        Spacecraft number encoded in a fleet APID (0 for single-spacecraft traffic).
+        """
+        return self.apid // SPACECRAFT_APID_STRIDE
+
+    def verify_crc(self) -> bool:
+        return verify_crc(self._buf)
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def tobytes(self) -> bytes:
+        return self._buf.tobytes()
+
+    def to_dict(self) -> dict:
+        """
+        Fully decode the packet into the same structure as decode_ccsds_packet.
+        """
+        return {
+            "primary": {
+                "version": self.version,
+                "pkt_type": self.pkt_type,
+                "sec_hdr_flag": self.sec_hdr_flag,
+                "apid": self.apid,
+                "seq_flags": self.seq_flags,
+                "seq_count": self.seq_count,
+                "length": self.length,
+            },
+            "secondary": {
+                "timestamp": self.timestamp,
+            },
+            "payload": dict(self.payload),
+        }
+
+    def __repr__(self) -> str:
+        try:
+            return f"PacketView(apid={self.apid:#04x}, seq_count={self.seq_count}, bytes={len(self._buf)})"
+        except ValueError:
+            return f"PacketView(<invalid>, bytes={len(self._buf)})"
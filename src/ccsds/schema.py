@@ -0,0 +1,381 @@
+"""
+Purpose of this file: Single source of truth for the binary layout of every subsystem payload.
+
+Each subsystem is registered once with its struct format and its ordered field names.
+The encoder and decoder are both driven from this registry, keyed by the APIDs in apid.py,
+so a payload layout only ever has to be changed in one place.
+
+Formats are precompiled into struct.Struct objects at import time, which avoids
+re-parsing the format string on every pack/unpack call.
+"""
+
+import re
+import struct
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Callable
+
+import numpy as np
+
+from src.ccsds import apid
+
+# Packet framing shared by every APID
+# Primary header: packet id, sequence control, data length (CCSDS 133.0-B)
+PRIMARY_HEADER_STRUCT = struct.Struct(">HHH")
+# Secondary header: 4-byte CUC time (24-bit coarse + 8-bit fine)
+SECONDARY_HEADER_STRUCT = struct.Struct(">I")
+# Trailing CRC-16
+CRC_STRUCT = struct.Struct(">H")
+
+PRIMARY_HEADER_LEN = PRIMARY_HEADER_STRUCT.size      # 6 bytes
+SECONDARY_HEADER_LEN = SECONDARY_HEADER_STRUCT.size  # 4 bytes
+HEADER_LEN = PRIMARY_HEADER_LEN + SECONDARY_HEADER_LEN
+CRC_LEN = CRC_STRUCT.size                            # 2 bytes
+
+
+def packet_size_from_length(length: int) -> int:
+    """
+    Full on-wire size of a packet given its primary header data length field.
+
+    The data length field counts the secondary header and payload, minus 1.
+    Our CRC trails the data field and is not included in it.
+
+    Args:
+        length (int): The raw data length field from the primary header.
+
+    Returns:
+        int: Packet size in bytes, headers and CRC included.
+    """
+    return PRIMARY_HEADER_LEN + length + 1 + CRC_LEN
+
+
+# define the struct format
+# >: big-endian
+# f: float (4 bytes)
+# I: uint32 (4 bytes)
+# H: uint16 (2 bytes)
+# B: uint8 (1 byte)
+CDH_STRUCT_FORMAT = ">fffBBfIHBB" # bytes = 26 (total w/headers and CRC = 38)
+POWER_STRUCT_FORMAT = ">ffffffffBB" # bytes = 34 (total w/headers and CRC = 46)
+COMMS_STRUCT_FORMAT = ">fffffI4B" # bytes = 28 (total w/headers and CRC = 40)
+THERMAL_STRUCT_FORMAT = ">fBBBBffB" # bytes = 17 (total w/headers and CRC = 29)
+ADCS_STRUCT_FORMAT = ">ffffffffff4B" # bytes = 44 (total w/headers and CRC = 56)
+PROPULSION_STRUCT_FORMAT = ">ffff4BffBB" # bytes = 30 (total w/headers and CRC = 42)
+PAYLOAD_STRUCT_FORMAT = ">BBHBffBB" # bytes = 15 (total w/headers and CRC = 27)
+
+# Ordered field names for each payload, matching the struct format above
+CDH_FIELDS = (
+    "processor_temp",      # float
+    "processor_freq",      # float
+    "processor_util",      # float
+    "ram_usage",           # uint8
+    "disk_usage",          # uint8
+    "cooling_fan_speed",   # float
+    "uptime",              # uint32
+    "watchdog_counter",    # uint16
+    "software_version",    # uint8
+    "event_flags",         # uint8 bitfield
+)
+
+POWER_FIELDS = (
+    "bus_voltage",         # float
+    "bus_current",         # float
+    "battery_voltage",     # float
+    "battery_current",     # float
+    "battery_temp",        # float
+    "state_of_charge",     # float
+    "solar_array_current", # float
+    "solar_array_voltage", # float
+    "eps_mode",            # uint8, 0–5
+    "fault_flags",         # uint8 bitfield
+)
+
+COMMS_FIELDS = (
+    "tx_frequency",        # float
+    "rx_frequency",        # float
+    "tx_power",            # float
+    "rx_signal_strength",  # float
+    "bit_error_rate",      # float
+    "frame_sync_errors",   # uint32
+    "carrier_lock",        # uint8, 0 or 1
+    "modulation_mode",     # uint8, 0–3
+    "comms_mode",          # uint8, 0–4
+    "comms_fault_flags",   # uint8 bitfield
+)
+
+THERMAL_FIELDS = (
+    "average_temp",        # float
+    "heater_status",       # uint8, 0 or 1
+    "radiator_status",     # uint8, 0 or 1
+    "heat_pipe_status",    # uint8, 0 or 1
+    "thermal_mode",        # uint8, 0–4
+    "hot_spot_temp",       # float
+    "cold_spot_temp",      # float
+    "thermal_fault_flags", # uint8 bitfield
+)
+
+ADCS_FIELDS = (
+    "quat_w",              # float
+    "quat_x",              # float
+    "quat_y",              # float
+    "quat_z",              # float
+    "ang_velocity_x",      # float
+    "ang_velocity_y",      # float
+    "ang_velocity_z",      # float
+    "mag_field_x",         # float
+    "mag_field_y",         # float
+    "mag_field_z",         # float
+    "sun_sensor_status",   # uint8, 0 or 1
+    "gyro_status",         # uint8, 0 or 1
+    "adcs_mode",           # uint8, 0–4
+    "adcs_fault_flags",    # uint8 bitfield
+)
+
+PROPULSION_FIELDS = (
+    "fuel_level",             # float
+    "oxidizer_level",         # float
+    "tank_pressure",          # float
+    "feedline_temp",          # float
+    "valve_status",           # uint8, 0 or 1
+    "thruster_firing",        # uint8, 0 or 1
+    "thruster_mode",          # uint8, 0–2
+    "propulsion_fault_flags", # uint8 bitfield
+    "rcs_tank_level",         # float
+    "rcs_tank_pressure",      # float
+    "rcs_thruster_status",    # uint8, 0 or 1
+    "rcs_fault_flags",        # uint8 bitfield
+)
+
+PAYLOAD_FIELDS = (
+    "camera_status",                # uint8, 0 or 1
+    "spectrometer_status",          # uint8, 0 or 1
+    "image_capture_count",          # uint16
+    "last_image_quality",           # uint8, 0–100
+    "spectrometer_last_wavelength", # float, nm
+    "spectrometer_last_intensity",  # float, arbitrary units
+    "payload_mode",                 # uint8, 0–3
+    "payload_fault_flags",          # uint8 bitfield
+)
+
+# Subsystem name -> (struct format, ordered field names)
+PAYLOAD_LAYOUTS = {
+    "cdh": (CDH_STRUCT_FORMAT, CDH_FIELDS),
+    "power": (POWER_STRUCT_FORMAT, POWER_FIELDS),
+    "comms": (COMMS_STRUCT_FORMAT, COMMS_FIELDS),
+    "thermal": (THERMAL_STRUCT_FORMAT, THERMAL_FIELDS),
+    "adcs": (ADCS_STRUCT_FORMAT, ADCS_FIELDS),
+    "propulsion": (PROPULSION_STRUCT_FORMAT, PROPULSION_FIELDS),
+    "payload": (PAYLOAD_STRUCT_FORMAT, PAYLOAD_FIELDS),
+}
+
+# Struct format codes packed from floats; every other code is packed from an int
+_FLOAT_CODES = "fd"
+
+# Struct format code -> big-endian NumPy dtype, for the batch encoder/decoder
+_NUMPY_TYPES = {
+    "f": ">f4",
+    "d": ">f8",
+    "b": "i1",
+    "B": "u1",
+    "h": ">i2",
+    "H": ">u2",
+    "i": ">i4",
+    "I": ">u4",
+    "q": ">i8",
+    "Q": ">u8",
+}
+
+# Header and CRC fields of a packet record, in wire order
+HEADER_DTYPE_FIELDS = [
+    ("packet_id", ">u2"),        # version, type, secondary header flag, APID
+    ("packet_seq_ctrl", ">u2"),  # sequence flags, sequence count
+    ("packet_length", ">u2"),    # data field length minus 1
+    ("cuc_time", ">u4"),         # 24-bit coarse + 8-bit fine
+]
+CRC_DTYPE_FIELDS = [("crc", ">u2")]
+
+_FORMAT_TOKEN = re.compile(r"(\d*)([a-zA-Z?])")
+
+
+def _field_codes(fmt: str) -> tuple:
+    """
+    Expand a struct format into one type code per field, e.g. ">ff2B" -> ("f", "f", "B", "B").
+    """
+    codes = []
+    for count, code in _FORMAT_TOKEN.findall(fmt.lstrip("<>!=@")):
+        codes.extend(code * int(count or 1))
+    return tuple(codes)
+
+
+@dataclass(frozen=True)
+class PacketSchema:
+    """
+    Precompiled payload layout for one subsystem.
+
+    Attributes:
+        subsystem (str): Subsystem name as used in apid.py.
+        apid (int): The subsystem's APID.
+        struct (struct.Struct): Compiled payload struct.
+        fields (tuple): Ordered payload field names.
+        codes (tuple): Struct type code for each field.
+        size (int): Payload length in bytes.
+        packet_struct (struct.Struct): Primary header + secondary header + payload in one struct.
+        packet_size (int): Full packet length in bytes, CRC included.
+        payload_dtype (np.dtype): Packed big-endian dtype of the payload alone.
+        packet_dtype (np.dtype): Packed big-endian dtype of a whole packet, headers and CRC included.
+        field_layout (dict): Field name -> (struct.Struct, byte offset within the payload),
+            for decoding a single field without unpacking the whole payload.
+        getter (Callable): Pulls the field values out of a telemetry dict in order.
+        converters (tuple): int or float per field, applied before packing.
+    """
+    subsystem: str
+    apid: int
+    struct: struct.Struct
+    fields: tuple
+    codes: tuple
+    size: int
+    packet_struct: struct.Struct
+    packet_size: int
+    payload_dtype: np.dtype
+    packet_dtype: np.dtype
+    field_layout: dict
+    getter: Callable = field(repr=False)
+    converters: tuple = field(repr=False)
+
+    def pack(self, data: dict) -> bytes:
+        """
+        Pack a telemetry dict into payload bytes, normalizing each value to int or float.
+        """
+        return self.struct.pack(*[convert(value) for convert, value in zip(self.converters, self.getter(data))])
+
+    def pack_into(self, buffer, offset: int, data: dict) -> None:
+        """
+        Pack a telemetry dict directly into a writable buffer at the given offset.
+        """
+        self.struct.pack_into(
+            buffer, offset,
+            *[convert(value) for convert, value in zip(self.converters, self.getter(data))]
+        )
+
+    def pack_packet_into(self, buffer, offset: int, header: tuple, data: dict) -> None:
+        """
+        Pack the primary header words, the CUC word and the payload with a single call.
+
+        Args:
+            buffer: Writable buffer (bytearray, memoryview, ...).
+            offset (int): Where the packet starts in the buffer.
+            header (tuple): (packet id, sequence control, data length, CUC word).
+            data (dict): Telemetry values keyed by field name.
+        """
+        self.packet_struct.pack_into(
+            buffer, offset,
+            *header,
+            *[convert(value) for convert, value in zip(self.converters, self.getter(data))]
+        )
+
+    def unpack(self, payload: bytes) -> dict:
+        """
+        Unpack payload bytes into a dict keyed by field name.
+        """
+        return dict(zip(self.fields, self.struct.unpack(payload)))
+
+
+def _build_schema(subsystem: str, fmt: str, fields: tuple) -> PacketSchema:
+    compiled = struct.Struct(fmt)
+    # Headers and payload share the big-endian byte order, so they can be packed together
+    packet_struct = struct.Struct(PRIMARY_HEADER_STRUCT.format + SECONDARY_HEADER_STRUCT.format[1:] + fmt[1:])
+    codes = _field_codes(fmt)
+    if len(codes) != len(fields):
+        raise ValueError(f"Schema for '{subsystem}' has {len(fields)} fields but format {fmt!r} has {len(codes)}")
+
+    converters = tuple(float if code in _FLOAT_CODES else int for code in codes)
+    payload_fields = [(name, _NUMPY_TYPES[code]) for name, code in zip(fields, codes)]
+
+    field_layout = {}
+    offset = 0
+    for name, code in zip(fields, codes):
+        field_struct = struct.Struct(">" + code)
+        field_layout[name] = (field_struct, offset)
+        offset += field_struct.size
+    # itemgetter with a single key returns the bare value, so always wrap in a tuple
+    getter = itemgetter(*fields) if len(fields) > 1 else (lambda data: (data[fields[0]],))
+
+    return PacketSchema(
+        subsystem=subsystem,
+        apid=apid.get_apid(subsystem),
+        struct=compiled,
+        fields=fields,
+        codes=codes,
+        size=compiled.size,
+        packet_struct=packet_struct,
+        packet_size=packet_struct.size + CRC_LEN,
+        payload_dtype=np.dtype(payload_fields),
+        packet_dtype=np.dtype(HEADER_DTYPE_FIELDS + payload_fields + CRC_DTYPE_FIELDS),
+        field_layout=field_layout,
+        getter=getter,
+        converters=converters,
+    )
+
+
+# Registry keyed by APID, plus a lookup by subsystem name
+SCHEMAS = {}
+SCHEMAS_BY_SUBSYSTEM = {}
+for _subsystem, (_fmt, _fields) in PAYLOAD_LAYOUTS.items():
+    _schema = _build_schema(_subsystem, _fmt, _fields)
+    SCHEMAS[_schema.apid] = _schema
+    SCHEMAS_BY_SUBSYSTEM[_subsystem] = _schema
+
+# Payload length per APID, derived from the compiled formats
+PAYLOAD_LENGTHS = {schema_apid: schema.size for schema_apid, schema in SCHEMAS.items()}
+
+# Full packet length per APID: headers + payload + CRC
+PACKET_LENGTHS = {schema_apid: schema.packet_size for schema_apid, schema in SCHEMAS.items()}
+
+
+def get_schema(apid_value: int) -> PacketSchema:
+    """
+    Get the payload schema for an APID.
+
+    Fleet APIDs (see apid.make_apid) resolve to their subsystem's schema.
+
+    Args:
+        apid_value (int): The packet's APID.
+
+    Returns:
+        PacketSchema: The schema registered for that APID.
+    """
+    try:
+        return SCHEMAS[apid_value]
+    except KeyError:
+        pass
+    try:
+        _, base_apid = apid.split_apid(apid_value)
+    except apid.ApidError:
+        raise ValueError(f"Unsupported APID: {apid_value}")
+    return SCHEMAS[base_apid]
+
+
+def find_schema(apid_value: int):
+    """
+    Like get_schema, but returns None for APIDs without a schema (e.g. idle packets).
+    """
+    try:
+        return get_schema(apid_value)
+    except ValueError:
+        return None
+
+
+def get_schema_for_subsystem(subsystem: str) -> PacketSchema:
+    """
+    Get the payload schema for a subsystem name.
+
+    Args:
+        subsystem (str): The subsystem name, e.g. "power".
+
+    Returns:
+        PacketSchema: The schema registered for that subsystem.
+    """
+    try:
+        return SCHEMAS_BY_SUBSYSTEM[subsystem]
+    except KeyError:
+        raise ValueError(f"Unknown subsystem: {subsystem}")
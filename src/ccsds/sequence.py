@@ -0,0 +1,213 @@
+"""
+Purpose of this file: Track packet sequence counts per APID on the ground side.
+
+Every APID has its own 14-bit sequence counter that wraps from 16383 to 0. By
+comparing each arriving count with the next one expected, the tracker finds:
+
+- gaps: counts that were skipped (packets lost, or still to arrive out of order)
+- duplicates: a count that was already received
+- reordered packets: a count inside a gap that arrives late; it is no longer
+  counted as lost
+- stale packets: counts too far behind to tell apart from a duplicate (older
+  than the tracking window), or older than the first count seen for the APID
+- restarts: the count jumps back to 0 (transmitters start counting at 0), so
+  the APID's tracking starts over from it; the cumulative counters are kept
+
+A count ahead of the expected one by less than half the counter range is a gap;
+anything else is behind. Received counts within the last `window` are kept in a
+bitmask, so every update is O(1).
+
+    tracker = SequenceTracker()
+    tracker.update(view.apid, view.seq_count)
+    tracker.loss_rate()  # lost / expected, over all APIDs
+"""
+
+SEQ_COUNT_MODULO = 1 << 14  # 14-bit sequence count
+HALF_RANGE = SEQ_COUNT_MODULO // 2
+DEFAULT_WINDOW = 1024  # counts behind the newest one that are remembered
+RESTART_GUARD = 16  # a 0 at least this far behind is a restart, not a late duplicate
+
+# Classification returned by SequenceTracker.update
+FIRST = "first"
+IN_ORDER = "in_order"
+GAP = "gap"
+DUPLICATE = "duplicate"
+REORDERED = "reordered"
+STALE = "stale"
+RESTART = "restart"
+
+# Gap histogram buckets by power of two: 1, 2-3, 4-7, ... up to HALF_RANGE - 1
+GAP_BUCKETS = HALF_RANGE.bit_length() - 1
+
+
+def gap_bucket_label(bucket: int) -> str:
+    """
+    Label of a gap histogram bucket, e.g. "4-7".
+    """
+    low = 1 << bucket
+    high = (low << 1) - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class _ApidState:
+    """
+    Counters for one APID.
+    """
+
+    __slots__ = ("expected", "received_mask", "known", "received", "lost", "gaps", "duplicates", "reordered",
+                 "stale", "restarts", "gap_histogram")
+
+    def __init__(self, seq_count: int):
+        self.start(seq_count)
+        self.received = 1
+        self.lost = 0
+        self.gaps = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.stale = 0
+        self.restarts = 0
+        self.gap_histogram = [0] * GAP_BUCKETS
+
+    def start(self, seq_count: int):
+        # Continuity tracking from seq_count on; counts before it are unknown, not missing
+        self.expected = (seq_count + 1) % SEQ_COUNT_MODULO
+        self.received_mask = 1  # bit i set: count (expected - 1 - i) was received
+        self.known = 1  # counts behind the newest one whose mask bit is meaningful
+
+
+class SequenceTracker:
+    """
+    Per-APID sequence continuity check with cumulative loss statistics.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """
+        Args:
+            window (int): How many counts behind the newest one are remembered to tell a
+                late (reordered) packet from a duplicate. At most half the counter range.
+        """
+        if not 1 <= window <= HALF_RANGE:
+            raise ValueError(f"Window must be between 1 and {HALF_RANGE}, got {window}")
+        self.window = window
+        self._window_mask = (1 << window) - 1
+        self._apids = {}
+
+    def update(self, apid: int, seq_count: int) -> str:
+        """
+        Record one received packet.
+
+        Args:
+            apid (int): APID of the packet.
+            seq_count (int): Its 14-bit sequence count.
+
+        Returns:
+            str: FIRST, IN_ORDER, GAP, DUPLICATE, REORDERED, STALE or RESTART.
+        """
+        state = self._apids.get(apid)
+        if state is None:
+            self._apids[apid] = _ApidState(seq_count)
+            return FIRST
+
+        ahead = (seq_count - state.expected) % SEQ_COUNT_MODULO
+        if ahead < HALF_RANGE:
+            # New count; `ahead` counts in between were skipped
+            state.received += 1
+            state.expected = (seq_count + 1) % SEQ_COUNT_MODULO
+            state.received_mask = ((state.received_mask << (ahead + 1)) | 1) & self._window_mask
+            state.known = min(state.known + ahead + 1, self.window)
+            if ahead == 0:
+                return IN_ORDER
+            state.lost += ahead
+            state.gaps += 1
+            state.gap_histogram[min(ahead.bit_length() - 1, GAP_BUCKETS - 1)] += 1
+            return GAP
+
+        behind = (state.expected - 1 - seq_count) % SEQ_COUNT_MODULO
+        if seq_count == 0 and behind >= RESTART_GUARD:
+            # The transmitter started counting again: nothing before this packet was lost or duplicated
+            state.start(0)
+            state.received += 1
+            state.restarts += 1
+            return RESTART
+        if behind >= state.known:
+            # Older than the window, or than the first count seen: cannot tell late from duplicate
+            state.stale += 1
+            return STALE
+        bit = 1 << behind
+        if state.received_mask & bit:
+            state.duplicates += 1
+            return DUPLICATE
+        # A count from an earlier gap: it was late, not lost
+        state.received_mask |= bit
+        state.received += 1
+        state.lost -= 1
+        state.reordered += 1
+        return REORDERED
+
+    def apids(self) -> list:
+        """
+        APIDs seen so far, sorted.
+        """
+        return sorted(self._apids)
+
+    def _states(self, apid: int = None) -> list:
+        if apid is None:
+            return list(self._apids.values())
+        state = self._apids.get(apid)
+        return [] if state is None else [state]
+
+    def loss_rate(self, apid: int = None) -> float:
+        """
+        Fraction of expected packets that are missing.
+
+        Args:
+            apid (int): One APID, or all APIDs if None.
+
+        Returns:
+            float: lost / (received + lost); 0.0 if nothing was received.
+        """
+        states = self._states(apid)
+        lost = sum(state.lost for state in states)
+        expected = lost + sum(state.received for state in states)
+        return lost / expected if expected else 0.0
+
+    def gap_histogram(self, apid: int = None) -> dict:
+        """
+        Number of gaps by size.
+
+        Args:
+            apid (int): One APID, or all APIDs if None.
+
+        Returns:
+            dict: Bucket label ("1", "2-3", "4-7", ...) -> number of gaps, for non-empty buckets.
+        """
+        totals = [0] * GAP_BUCKETS
+        for state in self._states(apid):
+            for bucket, count in enumerate(state.gap_histogram):
+                totals[bucket] += count
+        return {gap_bucket_label(bucket): count for bucket, count in enumerate(totals) if count}
+
+    def stats(self, apid: int = None) -> dict:
+        """
+        Cumulative counters.
+
+        Args:
+            apid (int): One APID, or all APIDs if None.
+
+        Returns:
+            dict: received, lost, gaps, duplicates, reordered, stale, restarts, loss_rate.
+        """
+        states = self._states(apid)
+        totals = {field: sum(getattr(state, field) for state in states)
+                  for field in ("received", "lost", "gaps", "duplicates", "reordered", "stale", "restarts")}
+        totals["loss_rate"] = self.loss_rate(apid)
+        return totals
+
+    def reset(self, apid: int = None):
+        """
+        Forget one APID (e.g. after a known transmitter restart), or all of them.
+        """
+        if apid is None:
+            self._apids.clear()
+        else:
+            self._apids.pop(apid, None)
@@ -10,36 +10,53 @@ The CUC typically contains:
     fine time (fractional seconds in smaller units)
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 import time
 
+import numpy as np
+
 # Constants
 # CCSDS epoch start date UNIX timestamp
 CCSDS_EPOCH = datetime(1970, 1, 1)  # Start of CCSDS epoch
 
 # Simulated mission start time
 MISSION_START = datetime(2024, 10, 19, 11, 11, 11)  # Example mission start
+MISSION_START_TIMESTAMP = MISSION_START.timestamp()  # Cached, used for every packet
 
 # Bit size for coarse and fine time
 COARSE_TIME_BITS = 24  # Coarse time in seconds
 FINE_TIME_BITS = 8    # Fine time in microseconds or nanoseconds
+COARSE_ROLLOVER = 2**COARSE_TIME_BITS  # Coarse time wraps after ~194 days
+FINE_TICKS = 2**FINE_TIME_BITS  # Fine ticks per second
+
+def current_cuc_time():
+    """
+    Get the current time as CUC coarse and fine fields.
 
-def encode_cuc_time():
-    """    
-    Encode the current time into a CCSDS Unsegmented Time Code (CUC).
     Returns:
-        bytes: A 4-byte sequence representing the CUC time.
+        tuple: (coarse, fine) where coarse is 24-bit mission elapsed seconds and fine is 1/256 s ticks.
     """
     # Get the current time
     now = time.time()
 
     # Mission elapsed time since CCSDS epoch
-    mission_elapsed = int(now - MISSION_START.timestamp())
+    mission_elapsed = int(now - MISSION_START_TIMESTAMP)
 
     # Split into coarse and fine time
     coarse = mission_elapsed % (2**COARSE_TIME_BITS)  # Coarse time is 24 bits (0 to 16,777,215 seconds)
     fractional = now - int(now)  # Get the fractional part of the current time
-    fine = int(fractional * 256)  # Convert to microseconds (1 second = 1,000,000 microseconds) with range 0-255
+    fine = int(fractional * 256)  # Convert to 1/256 second ticks with range 0-255
+
+    return coarse, fine
+
+def encode_cuc_time():
+    """    
+    Encode the current time into a CCSDS Unsegmented Time Code (CUC).
+    Returns:
+        bytes: A 4-byte sequence representing the CUC time.
+    """
+    coarse, fine = current_cuc_time()
 
     # pack the coarse time as a 3-byte big-endian integer
     coarse_bytes = coarse.to_bytes(3, 'big')
@@ -54,6 +71,21 @@ def encode_cuc_time():
     # Return the CUC time as bytes
     return cuc_time
 
+def encode_cuc_array(unix_times) -> np.ndarray:
+    """
+    Vectorized CUC encoding of many UNIX timestamps at once.
+
+    Args:
+        unix_times: Array-like of UNIX timestamps in seconds (float).
+
+    Returns:
+        np.ndarray: uint32 array of CUC words, (coarse << 8) | fine, as stored in the secondary header.
+    """
+    now = np.asarray(unix_times, dtype=np.float64)
+    coarse = np.trunc(now - MISSION_START_TIMESTAMP).astype(np.int64) % (2**COARSE_TIME_BITS)
+    fine = ((now - np.trunc(now)) * 256).astype(np.int64)
+    return ((coarse << FINE_TIME_BITS) | fine).astype(np.uint32)
+
 def decode_cuc_time(cuc_time: bytes):
     """
     Decode a CCSDS Unsegmented Time Code (CUC) from bytes.
@@ -73,6 +105,120 @@ def decode_cuc_time(cuc_time: bytes):
 
     return coarse, fine
 
+def split_cuc_word(cuc_word: int) -> tuple:
+    """
+    Split the 32-bit secondary header word into (coarse, fine).
+    """
+    return cuc_word >> FINE_TIME_BITS, cuc_word & (FINE_TICKS - 1)
+
+def resolve_coarse(coarse: int, reference: float = None) -> int:
+    """
+    Resolve a wrapped 24-bit coarse time to absolute seconds since MISSION_START.
+
+    The coarse counter rolls over every COARSE_ROLLOVER seconds, so the same value
+    recurs once per rollover period. The period closest to the reference time is chosen.
+
+    Args:
+        coarse (int): Coarse time from the CUC (0 to 2**24 - 1).
+        reference (float): UNIX time the packet is assumed to be near. Defaults to now.
+
+    Returns:
+        int: Seconds elapsed since MISSION_START.
+    """
+    if reference is None:
+        reference = time.time()
+    reference_elapsed = reference - MISSION_START_TIMESTAMP
+    rollovers = max(0, round((reference_elapsed - coarse) / COARSE_ROLLOVER))
+    return coarse + rollovers * COARSE_ROLLOVER
+
+def _fine_to_microseconds(fine: int) -> int:
+    return fine * 1_000_000 // FINE_TICKS
+
+def cuc_to_datetime(coarse: int, fine: int, reference: float = None) -> datetime:
+    """
+    Convert CUC coarse and fine fields to a datetime relative to MISSION_START.
+
+    Args:
+        coarse (int): Coarse time in seconds (24 bits).
+        fine (int): Fine time in 1/256 s ticks (8 bits).
+        reference (float): UNIX time used to resolve coarse rollover. Defaults to now.
+
+    Returns:
+        datetime: The absolute time of the packet.
+    """
+    elapsed = resolve_coarse(coarse, reference)
+    return MISSION_START + timedelta(seconds=elapsed, microseconds=_fine_to_microseconds(fine))
+
+@lru_cache(maxsize=4096)
+def _iso_seconds(elapsed: int) -> str:
+    """
+    ISO 8601 string for a whole second since MISSION_START, cached because all
+    packets sent within the same second share it.
+    """
+    return (MISSION_START + timedelta(seconds=elapsed)).isoformat()
+
+def cuc_to_iso(coarse: int, fine: int, reference: float = None) -> str:
+    """
+    Convert CUC coarse and fine fields to an ISO 8601 string.
+
+    Equivalent to cuc_to_datetime(...).isoformat(), but the formatted seconds
+    prefix is cached per coarse second and only the fraction is appended.
+
+    Args:
+        coarse (int): Coarse time in seconds (24 bits).
+        fine (int): Fine time in 1/256 s ticks (8 bits).
+        reference (float): UNIX time used to resolve coarse rollover. Defaults to now.
+
+    Returns:
+        str: The time as an ISO 8601 string.
+    """
+    prefix = _iso_seconds(resolve_coarse(coarse, reference))
+    if not fine:
+        return prefix
+    return f"{prefix}.{_fine_to_microseconds(fine):06d}"
+
+def cuc_to_ticks(cuc_words, reference: float = None) -> np.ndarray:
+    """
+    Vectorized conversion of secondary header CUC words to fine ticks (1/256 s) since MISSION_START.
+
+    The coarse time is resolved against the reference like resolve_coarse, so
+    the result is monotonic across coarse rollovers.
+
+    Args:
+        cuc_words: Array-like of 32-bit CUC words, (coarse << 8) | fine.
+        reference (float): UNIX time used to resolve coarse rollover. Defaults to now.
+
+    Returns:
+        np.ndarray: int64 array of ticks.
+    """
+    words = np.asarray(cuc_words, dtype=np.int64)
+    coarse = words >> FINE_TIME_BITS
+
+    if reference is None:
+        reference = time.time()
+    reference_elapsed = reference - MISSION_START_TIMESTAMP
+    rollovers = np.maximum(0, np.round((reference_elapsed - coarse) / COARSE_ROLLOVER)).astype(np.int64)
+    elapsed = coarse + rollovers * COARSE_ROLLOVER
+    return (elapsed << FINE_TIME_BITS) | (words & (FINE_TICKS - 1))
+
+def cuc_to_datetime64(cuc_words, reference: float = None) -> np.ndarray:
+    """
+    Vectorized conversion of many secondary header CUC words to datetime64.
+
+    Args:
+        cuc_words: Array-like of 32-bit CUC words, (coarse << 8) | fine.
+        reference (float): UNIX time used to resolve coarse rollover. Defaults to now.
+
+    Returns:
+        np.ndarray: datetime64[us] array, matching cuc_to_datetime for each element.
+    """
+    ticks = cuc_to_ticks(cuc_words, reference)
+    elapsed = ticks >> FINE_TIME_BITS
+    fine = ticks & (FINE_TICKS - 1)
+
+    micros = elapsed * 1_000_000 + fine * 1_000_000 // FINE_TICKS
+    return np.datetime64(MISSION_START, "us") + micros.astype("timedelta64[us]")
+
 def cuc_time_pretty_print(cuc_time: bytes):
     """
     Pretty print the CUC time in a human-readable format.
@@ -0,0 +1,132 @@
+"""
+Purpose of this file: asyncio-based transmitter.
+
+Each subsystem in SCHEDULE runs as its own periodic task on one event loop and
+sends through a non-blocking datagram transport. Telemetry providers that block
+(e.g. cdh.get_cdh_telemetry, which calls psutil) run in a thread pool via
+run_in_executor, so a slow subsystem only delays its own packets and never the
+other subsystems' deadlines.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.ccsds.encoder import encode_ccsds_packet
+from src.comms.scheduler import Scheduler
+from src.comms.tx import GET_TELEMETRY_FUNC, GROUND_IP, GROUND_PORT, SCHEDULE, log, print_rate_report, seq_count
+from src.utils.logger import PacketSummary
+
+# Providers that do blocking I/O and must not run on the event loop
+BLOCKING_PROVIDERS = {"cdh"}
+
+
+class _TelemetryProtocol(asyncio.DatagramProtocol):
+    """
+    Send-only datagram protocol; reports transport errors without stopping the loop.
+    """
+
+    def error_received(self, exc):
+        log.warning("Send error: %s", exc)
+
+
+async def _run_subsystem(transport, subsystem: str, scheduler: Scheduler, provider, blocking: bool, executor,
+                         summary: PacketSummary):
+    """
+    Periodic task for one subsystem: wait for its deadline, sample, encode, send.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        delay = scheduler.next_deadline() - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if not scheduler.pop_due():
+            continue
+
+        if blocking:
+            data = await loop.run_in_executor(executor, provider)
+        else:
+            data = provider()
+
+        packet = encode_ccsds_packet(subsystem, data, seq_count[subsystem]) # Encode the packet
+        transport.sendto(packet) # Send the packet to the ground station
+        log.debug("Sent -> %s Packet #%d", subsystem.upper(), seq_count[subsystem]) # Per-packet trace (DEBUG only)
+        summary.count(subsystem)
+        seq_count[subsystem] = (seq_count[subsystem] + 1) % 16384 # Increment sequence count, wrap around at 16384
+
+
+async def transmit_packets_async(ip=GROUND_IP, port=GROUND_PORT, schedule=None, providers=None,
+                                 blocking=None, duration: float = None, report: bool = False) -> dict:
+    """
+    Run the transmitter on an asyncio event loop.
+
+    Args:
+        ip (str): Ground station address.
+        port (int): Ground station UDP port.
+        schedule (dict): Subsystem -> rate in Hz. Defaults to tx.SCHEDULE.
+        providers (dict): Subsystem -> telemetry function. Defaults to tx.GET_TELEMETRY_FUNC.
+        blocking (set): Subsystems whose providers run in the thread pool. Defaults to BLOCKING_PROVIDERS.
+        duration (float): Stop after this many seconds. Runs until cancelled if None.
+        report (bool): Print configured vs. achieved rates when stopping.
+
+    Returns:
+        dict: Scheduler.stats() merged across all subsystems.
+    """
+    schedule = SCHEDULE if schedule is None else schedule
+    providers = GET_TELEMETRY_FUNC if providers is None else providers
+    blocking = BLOCKING_PROVIDERS if blocking is None else blocking
+
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(_TelemetryProtocol, remote_addr=(ip, port))
+    executor = ThreadPoolExecutor(max_workers=max(1, len(blocking)), thread_name_prefix="tx-provider")
+
+    # One single-stream scheduler per task keeps each subsystem's deadlines independent
+    schedulers = {}
+    tasks = []
+    summary = PacketSummary(log, verb="sent", clock=loop.time)  # shared by all tasks; they run on one thread
+    for subsystem, rate in schedule.items():
+        scheduler = Scheduler(clock=loop.time)
+        scheduler.add(subsystem, rate)
+        schedulers[subsystem] = scheduler
+        tasks.append(asyncio.create_task(
+            _run_subsystem(transport, subsystem, scheduler, providers[subsystem], subsystem in blocking, executor,
+                           summary),
+            name=f"tx-{subsystem}",
+        ))
+
+    try:
+        if duration is None:
+            await asyncio.gather(*tasks)
+        else:
+            await asyncio.sleep(duration)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        transport.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+        summary.log()
+        # Also reached on cancellation (e.g. Ctrl-C), so the report is printed either way
+        stats = _merged_stats(schedulers, report)
+
+    return stats
+
+
+def _merged_stats(schedulers: dict, report: bool) -> dict:
+    stats = {}
+    for scheduler in schedulers.values():
+        stats.update(scheduler.stats())
+    if report:
+        print_rate_report(stats)
+    return stats
+
+
+def run_async_transmitter(ip=GROUND_IP, port=GROUND_PORT):
+    """
+    Blocking entry point for the asyncio transmitter, mirroring transmit_packets.
+    """
+    try:
+        asyncio.run(transmit_packets_async(ip, port, report=True))
+    except KeyboardInterrupt:
+        print("\n[TX] Shutdown requested. Closing transport...", flush=True)
+    finally:
+        print("[TX] Transport closed.", flush=True)
@@ -0,0 +1,204 @@
+"""
+Purpose of this file: Send many UDP datagrams with as few syscalls as possible.
+
+On Linux, BatchSender hands a whole list of packets to the kernel with one
+sendmmsg(2) call (through ctypes, since the socket module does not expose it).
+Every packet is still its own datagram, so the ground station sees exactly the
+same traffic as with one sendto per packet. Elsewhere, or for non-IPv4
+destinations, it falls back to a plain sendto loop.
+
+The transmitters collect every packet that is due in one scheduler tick and
+flush them together with send().
+"""
+
+import ctypes
+import ctypes.util
+import os
+import socket
+import struct
+import sys
+
+DEFAULT_MAX_BATCH = 64  # messages per sendmmsg call
+# Below this many packets, the ctypes setup costs more than the syscalls it saves
+# (measured with benchmarks/bench_send.py), so small batches go through the sendto loop
+MIN_SENDMMSG_BATCH = 16
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+_IOV_WORD = {4: "I", 8: "Q"}[ctypes.sizeof(ctypes.c_void_p)]  # struct code for pointer/size_t
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),  # network byte order
+        ("sin_addr", ctypes.c_uint8 * 4),
+        ("sin_zero", ctypes.c_uint8 * 8),
+    ]
+
+
+def _load_sendmmsg():
+    """
+    Returns:
+        The libc sendmmsg function, or None if it is not available on this platform.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        sendmmsg = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+
+_SENDMMSG = _load_sendmmsg()
+HAVE_SENDMMSG = _SENDMMSG is not None
+
+
+class BatchSender:
+    """
+    Sends lists of datagrams to one destination, one syscall per batch where supported.
+
+    Example:
+        sender = BatchSender(sock, (ip, port))
+        sender.send([packet_a, packet_b, packet_c])  # one sendmmsg syscall on Linux
+    """
+
+    def __init__(self, sock: socket.socket, address: tuple = None, max_batch: int = DEFAULT_MAX_BATCH,
+                 use_sendmmsg: bool = None):
+        """
+        Args:
+            sock (socket.socket): UDP socket to send on.
+            address (tuple): (ip, port) destination. None for a connected socket.
+            max_batch (int): Maximum datagrams per syscall.
+            use_sendmmsg (bool): Force (True) or disable (False) sendmmsg. Defaults to using it when available.
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1, got {max_batch}")
+        self.sock = sock
+        self.address = address
+        self.max_batch = max_batch
+        self.syscalls = 0
+        self.packets_sent = 0
+
+        self._name = None
+        if use_sendmmsg is None:
+            use_sendmmsg = HAVE_SENDMMSG and self._ipv4_name_ok()
+        elif use_sendmmsg and not (HAVE_SENDMMSG and self._ipv4_name_ok()):
+            raise ValueError("sendmmsg is not available for this platform or destination")
+        self.uses_sendmmsg = use_sendmmsg
+
+        if use_sendmmsg:
+            self._iov = (_IoVec * max_batch)()
+            self._msgs = (_MMsgHdr * max_batch)()
+            for index in range(max_batch):
+                header = self._msgs[index].msg_hdr
+                header.msg_iov = ctypes.pointer(self._iov[index])
+                header.msg_iovlen = 1
+                if self._name is not None:
+                    header.msg_name = ctypes.addressof(self._name)
+                    header.msg_namelen = ctypes.sizeof(self._name)
+
+    def _ipv4_name_ok(self) -> bool:
+        """
+        Prepare the sockaddr_in for the destination; only IPv4 (or connected sockets) use sendmmsg.
+        """
+        if self.sock.family != socket.AF_INET:
+            return False
+        if self.address is None:
+            return True
+        try:
+            packed_ip = socket.inet_aton(socket.gethostbyname(self.address[0]))
+        except OSError:
+            return False
+        name = _SockAddrIn()
+        name.sin_family = socket.AF_INET
+        name.sin_port = socket.htons(self.address[1])
+        ctypes.memmove(name.sin_addr, packed_ip, 4)
+        self._name = name
+        return True
+
+    def send(self, packets) -> int:
+        """
+        Send every packet as its own datagram.
+
+        Args:
+            packets: Sequence of bytes-like packets.
+
+        Returns:
+            int: Number of packets sent.
+        """
+        if not self.uses_sendmmsg:
+            return self._send_loop(packets)
+
+        sent = 0
+        for start in range(0, len(packets), self.max_batch):
+            sent += self._send_chunk(packets[start:start + self.max_batch])
+        return sent
+
+    def _send_loop(self, packets) -> int:
+        sock = self.sock
+        address = self.address
+        for packet in packets:
+            self.syscalls += 1
+            if address is None:
+                sock.send(packet)
+            else:
+                sock.sendto(packet, address)
+            self.packets_sent += 1
+        return len(packets)
+
+    def _send_chunk(self, packets) -> int:
+        count = len(packets)
+        if count < MIN_SENDMMSG_BATCH:
+            return self._send_loop(packets)
+
+        # One C-level join, then every iovec points into the joined buffer. The (base, length)
+        # pairs are written with a single pack_into; setting them one ctypes attribute at a time
+        # costs more than the syscalls saved.
+        data = b"".join(packets)
+        address = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+        iov_words = []
+        for packet in packets:
+            size = len(packet)
+            iov_words.append(address)
+            iov_words.append(size)
+            address += size
+        struct.pack_into(f"{2 * count}{_IOV_WORD}", self._iov, 0, *iov_words)
+
+        fd = self.sock.fileno()
+        msgs_address = ctypes.addressof(self._msgs)
+        done = 0
+        while done < count:
+            # sendmmsg may send fewer messages than asked (e.g. a full socket buffer); retry the rest
+            result = _SENDMMSG(fd, msgs_address + done * ctypes.sizeof(_MMsgHdr), count - done, 0)
+            self.syscalls += 1
+            if result < 0:
+                errno = ctypes.get_errno()
+                self.packets_sent += done
+                raise OSError(errno, os.strerror(errno))
+            done += result
+        self.packets_sent += done
+        return done
@@ -0,0 +1,212 @@
+"""
+Purpose of this file: Multi-spacecraft fleet simulator for load-testing the ground segment.
+
+The fleet is sharded across a multiprocessing pool so every core is used. Each
+worker process runs one Scheduler covering all of its spacecraft; streams are
+keyed (spacecraft_id, subsystem) and every stream has its own sequence counter.
+Spacecraft are told apart on the ground by their APID block (see apid.make_apid).
+
+The per-spacecraft rates come from tx.SCHEDULE. To target an aggregate packet
+rate for the whole fleet, every rate is scaled by the same factor, so the mix of
+subsystems stays the same as for a single spacecraft.
+"""
+
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import time
+
+from src.ccsds import schema
+from src.ccsds.apid import MAX_SPACECRAFT
+from src.ccsds.encoder import encode_ccsds_packet_into
+from src.comms.batch_send import DEFAULT_MAX_BATCH, BatchSender
+from src.comms.scheduler import Scheduler
+from src.comms.tx import GET_TELEMETRY_FUNC, GROUND_IP, GROUND_PORT, SCHEDULE
+
+# Set in every pool worker by _init_worker; tells the shards to stop
+_stop_event = None
+
+
+def shard_spacecraft(count: int, workers: int) -> list:
+    """
+    Split spacecraft ids 0..count-1 round robin across workers.
+
+    Args:
+        count (int): Number of spacecraft in the fleet.
+        workers (int): Number of worker processes.
+
+    Returns:
+        list: One list of spacecraft ids per worker (workers with no spacecraft are omitted).
+    """
+    shards = [list(range(worker, count, workers)) for worker in range(workers)]
+    return [shard for shard in shards if shard]
+
+
+def fleet_rate(count: int, schedule: dict = None) -> float:
+    """
+    Aggregate packet rate of a fleet at the unscaled per-spacecraft schedule.
+
+    Returns:
+        float: Packets per second for the whole fleet.
+    """
+    schedule = SCHEDULE if schedule is None else schedule
+    return count * sum(schedule.values())
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+    # Ctrl-C is handled by the parent, which sets the stop event for everyone
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_spacecraft_shard(spacecraft_ids: list, ip=GROUND_IP, port=GROUND_PORT, rate_scale: float = 1.0,
+                         duration: float = None, schedule: dict = None, stop_event=None) -> dict:
+    """
+    Simulate a group of spacecraft in the current process.
+
+    Args:
+        spacecraft_ids (list): Spacecraft numbers handled by this process.
+        ip (str): Ground station address.
+        port (int): Ground station UDP port.
+        rate_scale (float): Factor applied to every rate in the schedule.
+        duration (float): Stop after this many seconds. Runs until stopped if None.
+        schedule (dict): Subsystem -> rate in Hz per spacecraft. Defaults to tx.SCHEDULE.
+        stop_event: multiprocessing.Event that ends the run early. Defaults to the pool's event.
+
+    Returns:
+        dict: {"pid", "spacecraft", "sent", "send_errors", "skipped", "syscalls", "elapsed"} for this shard.
+    """
+    schedule = SCHEDULE if schedule is None else schedule
+    stop_event = _stop_event if stop_event is None else stop_event
+    sleep = stop_event.wait if stop_event is not None else time.sleep
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect((ip, port))
+    sender = BatchSender(sock)
+
+    # Stagger first deadlines within one period so the fleet does not transmit in lockstep
+    scheduler = Scheduler(sleep=sleep)
+    start = time.monotonic()
+    for spacecraft_id in spacecraft_ids:
+        rng = random.Random(spacecraft_id)
+        for subsystem, rate in schedule.items():
+            scaled_rate = rate * rate_scale
+            scheduler.add((spacecraft_id, subsystem), scaled_rate, start=start + rng.uniform(0, 1.0 / scaled_rate))
+
+    seq_count = dict.fromkeys(scheduler.stats(), 0)  # (spacecraft_id, subsystem) -> sequence count
+    max_packet = max(schema.PACKET_LENGTHS.values())
+    buffer = bytearray(max_packet * DEFAULT_MAX_BATCH)
+    view = memoryview(buffer)
+    send_errors = 0
+
+    def flush(packets):
+        nonlocal send_errors
+        sent_before = sender.packets_sent
+        try:
+            sender.send(packets)
+        except OSError:
+            # e.g. ECONNREFUSED from an ICMP port-unreachable while the ground station restarts
+            send_errors += len(packets) - (sender.packets_sent - sent_before)
+
+    end = None if duration is None else start + duration
+
+    try:
+        while stop_event is None or not stop_event.is_set():
+            if end is not None and time.monotonic() >= end:
+                break
+            # Packets due in the same tick are encoded back to back and sent in batches
+            packets = []
+            offset = 0
+            for key in scheduler.wait():
+                if len(buffer) - offset < max_packet:
+                    flush(packets)
+                    packets = []
+                    offset = 0
+                spacecraft_id, subsystem = key
+                data = GET_TELEMETRY_FUNC[subsystem]() # Get telemetry data for the subsystem
+                size = encode_ccsds_packet_into(buffer, offset, subsystem, data, seq_count[key], spacecraft_id)
+                packets.append(view[offset:offset + size])
+                offset += size
+                seq_count[key] = (seq_count[key] + 1) % 16384 # Increment sequence count, wrap around at 16384
+            if packets:
+                flush(packets)
+    finally:
+        sock.close()
+
+    return {
+        "pid": os.getpid(),
+        "spacecraft": len(spacecraft_ids),
+        "sent": sender.packets_sent,
+        "send_errors": send_errors,
+        "skipped": sum(stream["skipped"] for stream in scheduler.stats().values()),
+        "syscalls": sender.syscalls,
+        "elapsed": time.monotonic() - start,
+    }
+
+
+def print_fleet_report(results: list, target_rate: float):
+    """
+    Print per-worker and aggregate packet counts for a fleet run.
+
+    Args:
+        results (list): Return values of run_spacecraft_shard.
+        target_rate (float): Configured aggregate rate in packets per second.
+    """
+    for result in results:
+        print(f"[FLEET] worker {result['pid']}: {result['spacecraft']} spacecraft, sent {result['sent']}, "
+              f"errors {result['send_errors']}, skipped {result['skipped']}", flush=True)
+    sent = sum(result["sent"] for result in results)
+    elapsed = max((result["elapsed"] for result in results), default=0.0)
+    achieved = sent / elapsed if elapsed > 0 else 0.0
+    print(f"[FLEET] {sent} packets in {elapsed:.1f} s: achieved {achieved:.1f} pkt/s, "
+          f"target {target_rate:.1f} pkt/s", flush=True)
+
+
+def run_fleet(spacecraft: int, workers: int = None, rate: float = None, duration: float = None,
+              ip=GROUND_IP, port=GROUND_PORT, report: bool = True) -> list:
+    """
+    Simulate a fleet of spacecraft across a process pool.
+
+    Args:
+        spacecraft (int): Fleet size.
+        workers (int): Number of worker processes. Defaults to the number of CPU cores.
+        rate (float): Aggregate packets per second for the whole fleet.
+            Defaults to every spacecraft running at tx.SCHEDULE rates.
+        duration (float): Stop after this many seconds. Runs until Ctrl-C if None.
+        ip (str): Ground station address.
+        port (int): Ground station UDP port.
+        report (bool): Print per-worker and aggregate packet counts at the end.
+
+    Returns:
+        list: One run_spacecraft_shard result per worker.
+    """
+    if not 0 < spacecraft <= MAX_SPACECRAFT:
+        raise ValueError(f"Fleet size must be between 1 and {MAX_SPACECRAFT}, got {spacecraft}")
+    if rate is not None and rate <= 0:
+        raise ValueError(f"Aggregate rate must be positive, got {rate}")
+
+    workers = min(workers or os.cpu_count() or 1, spacecraft)
+    base_rate = fleet_rate(spacecraft)
+    rate_scale = 1.0 if rate is None else rate / base_rate
+    shards = shard_spacecraft(spacecraft, workers)
+
+    print(f"[FLEET] {spacecraft} spacecraft on {len(shards)} workers -> {ip}:{port}, "
+          f"target {base_rate * rate_scale:.1f} pkt/s", flush=True)
+
+    stop_event = multiprocessing.Event()
+    with multiprocessing.Pool(len(shards), initializer=_init_worker, initargs=(stop_event,)) as pool:
+        pending = pool.starmap_async(run_spacecraft_shard,
+                                     [(shard, ip, port, rate_scale, duration) for shard in shards])
+        try:
+            results = pending.get()
+        except KeyboardInterrupt:
+            print("\n[FLEET] Shutdown requested. Stopping workers...", flush=True)
+            stop_event.set()
+            results = pending.get()
+
+    if report:
+        print_fleet_report(results, base_rate * rate_scale)
+    return results
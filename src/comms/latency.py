@@ -0,0 +1,210 @@
+"""
+Purpose of this file: End-to-end latency instrumentation between TX and the ground stages.
+
+The CUC time in the secondary header only resolves 1/256 s, far too coarse
+for pipeline latency. In latency mode the transmitter appends an 8-byte
+trailer after the CRC of every datagram, holding time.monotonic_ns() taken just
+before the packet was encoded. The packet itself is unchanged (its length
+field does not count the trailer), so the receiver recognizes a trailer by the
+datagram being exactly 8 bytes longer than the packet, strips it and records
+the latency at each ground stage:
+
+    receive   datagram read from the socket (ring reader thread)
+    decode    packet decoded
+    emit      sent to the dashboard clients
+
+The monotonic clock is per machine, so latency mode needs the transmitter and
+the ground station on the same host. Trailers are per datagram and are not
+used with transfer frames.
+
+    recorder = LatencyRecorder()
+    packet, tx_ns = split_trailer(datagram)
+    if tx_ns is not None:
+        recorder.record("decode", tx_ns)
+    recorder.report()  # {"decode": {"count": ..., "p50_us": ..., "p99_us": ..., "p999_us": ..., "max_us": ...}}
+"""
+
+import struct
+import time
+
+from src.ccsds import schema
+
+TRAILER_STRUCT = struct.Struct(">Q")
+TRAILER_LEN = TRAILER_STRUCT.size
+STAGES = ("receive", "decode", "emit")
+DEFAULT_REPORT_INTERVAL = 10.0  # seconds between periodic latency reports
+
+# Histogram buckets: exact below 2**SUB_BUCKET_BITS ns, then 2**SUB_BUCKET_BITS
+# buckets per power of two (at most ~6% relative error), up to MAX_TRACKED_NS
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_TRACKED_NS = 1 << 40  # ~18 minutes; longer latencies land in the last bucket
+
+clock_ns = time.monotonic_ns
+
+
+def append_trailer(packet: bytes, tx_ns: int = None) -> bytes:
+    """
+    Append the TX timestamp trailer to an encoded packet.
+
+    Args:
+        packet (bytes): Encoded packet, CRC included.
+        tx_ns (int): Timestamp in monotonic nanoseconds. Defaults to now.
+
+    Returns:
+        bytes: packet + 8-byte big-endian timestamp.
+    """
+    return packet + TRAILER_STRUCT.pack(clock_ns() if tx_ns is None else tx_ns)
+
+
+def split_trailer(datagram) -> tuple:
+    """
+    Separate a packet from its TX timestamp trailer, if it has one.
+
+    Args:
+        datagram: bytes-like datagram holding one packet.
+
+    Returns:
+        tuple: (packet, tx_ns) where packet is a memoryview without the trailer and
+            tx_ns is None if the datagram has no trailer.
+    """
+    view = memoryview(datagram).cast("B")
+    if len(view) < schema.PRIMARY_HEADER_LEN + TRAILER_LEN:
+        return view, None
+    length = (view[4] << 8) | view[5]
+    size = schema.packet_size_from_length(length)
+    if len(view) != size + TRAILER_LEN:
+        return view, None
+    return view[:size], TRAILER_STRUCT.unpack_from(view, size)[0]
+
+
+def _bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    value = min(value, MAX_TRACKED_NS - 1)
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    """
+    Largest value that falls in a bucket.
+    """
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (((index % SUB_BUCKETS) + SUB_BUCKETS + 1) << shift) - 1
+
+
+_BUCKET_COUNT = _bucket_index(MAX_TRACKED_NS - 1) + 1
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram of latencies in nanoseconds, O(1) per sample.
+
+    Percentiles are reported as the upper edge of their bucket, so they are
+    never underestimated.
+    """
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.max = 0
+
+    def record(self, latency_ns: int):
+        """
+        Add one sample.
+        """
+        self.counts[_bucket_index(latency_ns)] += 1
+        self.count += 1
+        if latency_ns > self.max:
+            self.max = latency_ns
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Latency below which `fraction` of the samples fall.
+
+        Args:
+            fraction (float): e.g. 0.99 for p99.
+
+        Returns:
+            int: Nanoseconds, or 0 if there are no samples.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, int(fraction * self.count + 0.5))  # nearest rank
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index == _BUCKET_COUNT - 1:
+                    return self.max  # the overflow bucket has no meaningful upper edge
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+
+class LatencyRecorder:
+    """
+    One latency histogram per ground stage, measured from the TX timestamp.
+    """
+
+    def __init__(self, stages=STAGES, report_interval: float = DEFAULT_REPORT_INTERVAL):
+        """
+        Args:
+            stages: Names of the stages that will be recorded.
+            report_interval (float): Seconds between reports from maybe_log.
+        """
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.report_interval = report_interval
+        self._next_report = time.monotonic() + report_interval
+
+    def record(self, stage: str, tx_ns: int, now_ns: int = None):
+        """
+        Record the latency of one packet at a stage.
+
+        Args:
+            stage (str): One of the recorder's stages.
+            tx_ns (int): TX timestamp from the trailer.
+            now_ns (int): When the stage completed. Defaults to now.
+        """
+        self.histograms[stage].record((clock_ns() if now_ns is None else now_ns) - tx_ns)
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: Stage -> {count, p50_us, p99_us, p999_us, max_us}, for stages with samples.
+        """
+        report = {}
+        for stage, histogram in self.histograms.items():
+            if histogram.count:
+                report[stage] = {
+                    "count": histogram.count,
+                    "p50_us": histogram.percentile(0.50) / 1000,
+                    "p99_us": histogram.percentile(0.99) / 1000,
+                    "p999_us": histogram.percentile(0.999) / 1000,
+                    "max_us": histogram.max / 1000,
+                }
+        return report
+
+    def log_report(self, logger):
+        """
+        Log one line per stage with samples.
+        """
+        for stage, stats in self.report().items():
+            logger.info("latency %-7s n=%d p50 %.1f us, p99 %.1f us, p999 %.1f us, max %.1f us", stage, stats["count"],
+                        stats["p50_us"], stats["p99_us"], stats["p999_us"], stats["max_us"])
+
+    def maybe_log(self, logger) -> bool:
+        """
+        Log the report if report_interval has passed since the last one.
+
+        Returns:
+            bool: True if the report was logged.
+        """
+        now = time.monotonic()
+        if now < self._next_report:
+            return False
+        self._next_report = now + self.report_interval
+        self.log_report(logger)
+        return True
@@ -0,0 +1,167 @@
+"""
+Purpose of this file: Replay recorded telemetry through the ground path.
+
+Sources are either an archive directory (see src/storage/archive.py), read in
+time order, or a capture file of raw packets back to back (e.g. an archive
+segment or a dump of a TCP/serial stream), delimited with PacketFramer.
+
+Packets can be replayed in two ways:
+
+- to a ground station over UDP, keeping the original spacing between packets
+  (taken from their CUC time, 1/256 s resolution) scaled by a speed factor,
+  or as fast as possible with speed=None
+- through the receiver's own decode path (rx.handle_packet, sequence tracking
+  and summaries) in this process, which makes a recorded pass a
+  deterministic throughput benchmark for the ground software
+
+Packets due at the same moment are flushed together with BatchSender; at
+maximum speed every flush is a full batch.
+
+    stats = replay(iter_capture("pass.dat"), speed=10, ip="127.0.0.1", port=5005)
+    stats = replay(iter_archive("archive"), speed=None)  # local decode, max speed
+"""
+
+import socket
+import struct
+import time
+
+from src.ccsds import schema
+from src.ccsds.framer import PacketFramer
+from src.ccsds.sequence import SequenceTracker
+from src.comms import rx
+from src.comms.batch_send import DEFAULT_MAX_BATCH, BatchSender
+from src.storage.archive import ArchiveReader
+from src.utils.logger import PacketSummary
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # capture bytes read per framer call
+DECODE_BATCH = 4096  # packets handed to the decoder per flush in local mode
+LATE_THRESHOLD = 0.01  # seconds behind schedule before a packet counts as late
+_CUC_STRUCT = struct.Struct(">I")
+_CUC_MODULO = 1 << 32
+_TICKS_PER_SECOND = 256
+
+
+def iter_capture(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, verify_crc: bool = True):
+    """
+    Yield the packets of a capture file in file order.
+
+    Args:
+        path (str): File of packets back to back. Damaged bytes are skipped by the framer.
+        chunk_size (int): Bytes read at a time.
+        verify_crc (bool): Drop (and resynchronize past) packets with a bad CRC.
+
+    Yields:
+        memoryview: One packet, valid while it is referenced (chunks are never reused).
+    """
+    framer = PacketFramer(verify_crc=verify_crc)
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield from framer.feed(chunk)
+
+
+def iter_archive(directory: str, start: int = None, end: int = None, apids=None):
+    """
+    Yield the packets of an archive in time order, as recorded (arrival order within a second).
+
+    Args:
+        directory (str): Archive directory.
+        start (int): First mission second (inclusive), or None.
+        end (int): Last mission second (inclusive), or None.
+        apids: Iterable of APIDs, or None for all.
+
+    Yields:
+        bytes: One packet.
+    """
+    with ArchiveReader(directory) as reader:
+        for packet in reader.query(start, end, apids):
+            yield bytes(packet)  # copied so the archive can be closed while packets are still queued
+
+
+def replay(packets, speed: float = 1.0, ip: str = None, port: int = None, handler=None,
+           batch_size: int = None, clock=time.monotonic, sleep=time.sleep) -> dict:
+    """
+    Replay packets, paced by their CUC timestamps.
+
+    Args:
+        packets: Iterable of packets (bytes-like), e.g. from iter_capture or iter_archive.
+        speed (float): Playback speed factor (1 = real time, 10 = ten times faster).
+            None replays as fast as possible.
+        ip (str): Ground station address. Without it, packets are decoded locally with rx.handle_packet.
+        port (int): Ground station UDP port.
+        handler: Called with each batch (list of packets) instead of sending or decoding, if given.
+        batch_size (int): Packets per flush. Defaults to DEFAULT_MAX_BATCH over UDP, DECODE_BATCH locally.
+        clock: Monotonic time source in seconds.
+        sleep: Function used to wait for the next packet.
+
+    Returns:
+        dict: packets, batches, elapsed, rate (packets/s) and late (packets more than
+            LATE_THRESHOLD behind schedule). Local decoding adds decoded, failed and
+            sequence (SequenceTracker.stats()).
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError(f"Speed factor must be positive, got {speed}")
+
+    stats = {"packets": 0, "batches": 0, "late": 0}
+    sock = None
+    if handler is None and ip is not None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = BatchSender(sock, (ip, port), max_batch=batch_size or DEFAULT_MAX_BATCH)
+        handler = sender.send
+        batch_size = batch_size or DEFAULT_MAX_BATCH
+    summary = tracker = None
+    if handler is None and sock is None:
+        summary = PacketSummary(rx.log, verb="replayed")
+        tracker = SequenceTracker()
+
+        def handler(batch):
+            for packet in batch:
+                rx.handle_packet(packet, summary, tracker)
+    batch_size = batch_size or DECODE_BATCH
+
+    batch = []
+    first_cuc = None
+    start = clock()
+    try:
+        for packet in packets:
+            if speed is not None and len(packet) >= schema.HEADER_LEN:
+                cuc = _CUC_STRUCT.unpack_from(packet, schema.PRIMARY_HEADER_LEN)[0]
+                if first_cuc is None:
+                    first_cuc = cuc
+                ticks = (cuc - first_cuc) % _CUC_MODULO
+                if ticks >= _CUC_MODULO // 2:
+                    ticks = 0  # older than the first packet: send right away
+                due = start + ticks / _TICKS_PER_SECOND / speed
+                now = clock()
+                if due > now:
+                    # Everything due so far goes out before waiting for this packet
+                    if batch:
+                        handler(batch)
+                        stats["batches"] += 1
+                        batch = []
+                    sleep(due - now)
+                elif now - due > LATE_THRESHOLD:
+                    stats["late"] += 1
+            batch.append(packet)
+            stats["packets"] += 1
+            if len(batch) >= batch_size:
+                handler(batch)
+                stats["batches"] += 1
+                batch = []
+        if batch:
+            handler(batch)
+            stats["batches"] += 1
+    finally:
+        if sock is not None:
+            sock.close()
+
+    stats["elapsed"] = clock() - start
+    stats["rate"] = stats["packets"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    if summary is not None:
+        summary.log()
+        stats["decoded"] = summary.total
+        stats["failed"] = summary.total_errors
+        stats["sequence"] = tracker.stats()
+    return stats
@@ -0,0 +1,210 @@
+"""
+Purpose of this file: Receive ring buffer that decouples socket reads from decoding.
+
+If the thread that reads the socket also decodes (and prints, and emits to the
+dashboard), a slow consumer lets the kernel receive buffer fill up and packets
+are silently dropped. Here a reader thread does nothing but recvfrom_into the
+next free slot of a preallocated ring; the decoder consumes slots at its own
+pace. A burst of up to `slots` datagrams is absorbed without loss no matter how
+slow decoding is.
+
+When the ring is full, the reader keeps draining the socket (so the kernel
+buffer never backs up unnoticed) and counts the datagram as an overflow.
+
+    ring = PacketRing()
+    start_socket_reader(sock, ring)
+    for data, addr in ring:  # data is a memoryview of the slot, valid until the next iteration
+        handle(data)
+"""
+
+import socket
+import threading
+import time
+
+DEFAULT_SLOTS = 4096
+DEFAULT_SLOT_SIZE = 2048  # larger than any packet or transfer frame we send
+
+
+class PacketRing:
+    """
+    Single-producer, single-consumer ring of fixed-size datagram slots.
+
+    The producer (socket reader thread) only calls recv_into_slot; the consumer
+    only calls get/release or iterates. Slots are reused in place, so no memory
+    is allocated per datagram.
+    """
+
+    def __init__(self, slots: int = DEFAULT_SLOTS, slot_size: int = DEFAULT_SLOT_SIZE, timestamps: bool = False):
+        """
+        Args:
+            slots (int): Number of datagrams the ring can hold.
+            slot_size (int): Bytes per slot; longer datagrams are truncated by the kernel.
+            timestamps (bool): Record time.monotonic_ns() when each datagram is received (see received_ns).
+        """
+        if slots < 1 or slot_size < 1:
+            raise ValueError(f"Ring needs at least one slot of at least one byte, got {slots} x {slot_size}")
+        self.slots = slots
+        self.slot_size = slot_size
+        self._buffer = bytearray(slots * slot_size)
+        view = memoryview(self._buffer)
+        self._slots = [view[index * slot_size:(index + 1) * slot_size] for index in range(slots)]
+        self._scratch = memoryview(bytearray(slot_size))  # overflow target when the ring is full
+        self._lengths = [0] * slots
+        self._addresses = [None] * slots
+        self._times = [0] * slots if timestamps else None
+        self._head = 0  # datagrams written (producer)
+        self._tail = 0  # datagrams released (consumer)
+        self._ready = threading.Semaphore(0)  # one permit per datagram waiting to be consumed
+        self._closed = False
+
+        self.received = 0
+        self.overflows = 0
+        self.truncated = 0
+        self.high_watermark = 0
+
+    def __len__(self) -> int:
+        """
+        Datagrams waiting to be consumed.
+        """
+        return self._head - self._tail
+
+    def recv_into_slot(self, sock: socket.socket) -> bool:
+        """
+        Receive one datagram into the next free slot (blocks according to the socket's timeout).
+
+        Args:
+            sock (socket.socket): The socket to read.
+
+        Returns:
+            bool: True if the datagram was stored, False if the ring was full and it was dropped.
+        """
+        head = self._head
+        full = head - self._tail >= self.slots
+        target = self._scratch if full else self._slots[head % self.slots]
+        nbytes, address = sock.recvfrom_into(target)
+        if self._times is not None and not full:
+            self._times[head % self.slots] = time.monotonic_ns()
+        if nbytes >= self.slot_size:
+            self.truncated += 1  # the kernel discards whatever did not fit
+
+        if full:
+            self.overflows += 1
+            return False
+
+        index = head % self.slots
+        self._lengths[index] = nbytes
+        self._addresses[index] = address
+        self._head = head + 1  # publish only after the slot is written
+        self.received += 1
+        occupied = self._head - self._tail
+        if occupied > self.high_watermark:
+            self.high_watermark = occupied
+        self._ready.release()
+        return True
+
+    def get(self, timeout: float = None):
+        """
+        Wait for the oldest unconsumed datagram.
+
+        The returned memoryview points into the ring; call release() when done
+        with it so the slot can be reused.
+
+        Args:
+            timeout (float): Seconds to wait; waits forever if None.
+
+        Returns:
+            tuple: (memoryview, address), or None on timeout or after close().
+        """
+        if not self._ready.acquire(timeout=timeout) or self._head == self._tail:
+            return None
+        index = self._tail % self.slots
+        return self._slots[index][:self._lengths[index]], self._addresses[index]
+
+    def received_ns(self) -> int:
+        """
+        When the datagram returned by the last get() was received, in monotonic nanoseconds.
+
+        Returns:
+            int: The timestamp, or None if the ring was created without timestamps.
+        """
+        if self._times is None:
+            return None
+        return self._times[self._tail % self.slots]
+
+    def release(self):
+        """
+        Free the slot returned by the last get().
+        """
+        self._tail += 1
+
+    def close(self):
+        """
+        Wake a consumer blocked in get() and end iteration once the ring is empty.
+        """
+        self._closed = True
+        self._ready.release()
+
+    def __iter__(self):
+        """
+        Yield (memoryview, address) for every datagram until close() is called and the ring is drained.
+
+        Each slot is released when the next one is requested.
+        """
+        while True:
+            item = self.get(timeout=0.5)
+            if item is None:
+                if self._closed and self._head == self._tail:
+                    return
+                continue
+            try:
+                yield item
+            finally:
+                self.release()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: received, consumed, pending, overflows, truncated, high_watermark, slots.
+        """
+        return {
+            "received": self.received,
+            "consumed": self._tail,
+            "pending": len(self),
+            "overflows": self.overflows,
+            "truncated": self.truncated,
+            "high_watermark": self.high_watermark,
+            "slots": self.slots,
+        }
+
+
+def start_socket_reader(sock: socket.socket, ring: PacketRing, stop_event: threading.Event = None) -> threading.Thread:
+    """
+    Drain a socket into a ring on a daemon thread.
+
+    The thread exits when stop_event is set or the socket is closed, and then
+    closes the ring so the consumer's iteration ends.
+
+    Args:
+        sock (socket.socket): Bound UDP socket.
+        ring (PacketRing): Ring to fill.
+        stop_event (threading.Event): Optional signal to stop reading.
+
+    Returns:
+        threading.Thread: The started reader thread.
+    """
+    def read_loop():
+        sock.settimeout(0.2)  # wake up regularly to check stop_event
+        try:
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    ring.recv_into_slot(sock)
+                except socket.timeout:
+                    continue
+        except OSError:
+            pass  # socket closed under us: shutting down
+        finally:
+            ring.close()
+
+    thread = threading.Thread(target=read_loop, name="rx-socket-reader", daemon=True)
+    thread.start()
+    return thread
@@ -1,29 +1,141 @@
 import socket
-from src.ccsds.decoder import decode_ccsds_packet
-from src.ccsds.apid import get_subsystem
+from src.ccsds.frame import FrameDemultiplexer
+from src.ccsds.packet_view import PacketView
+from src.ccsds.sequence import GAP, SequenceTracker
+from src.comms.latency import LatencyRecorder, split_trailer
+from src.comms.ring import DEFAULT_SLOTS, PacketRing, start_socket_reader
+from src.storage.archive import DEFAULT_SYNC_INTERVAL, ArchiveWriter
+from src.storage.columnar import DEFAULT_FLUSH_INTERVAL, ColumnWriter
+from src.utils.logger import PacketSummary, get_logger
 import struct
 
-def receive_packets():
+log = get_logger("RX")
+
+def handle_packet(data, summary=None, tracker=None):
+    """
+    Decode one packet, count it in the summary and check its sequence count.
+
+    Per-packet lines are only logged at DEBUG level; decode errors are always logged.
+
+    Args:
+        data: bytes-like packet.
+        summary (PacketSummary): Counters for the periodic summary line, if any.
+        tracker (SequenceTracker): Per-APID continuity check, if any.
+
+    Returns:
+        PacketView: The decoded packet, or None if it could not be decoded.
+    """
+    try:
+        # Only the primary header is decoded and the payload length checked; fields are never touched here
+        packet = PacketView(data)
+        subsystem = packet.subsystem
+        apid, seq_count = packet.apid, packet.seq_count
+    except (ValueError, struct.error) as e:
+        log.warning("Error decoding packet: %s", e)
+        if summary is not None:
+            summary.error()
+        return None
+    log.debug("Decoded %s packet #%d successfully with payload length %d.", subsystem.upper(), seq_count, len(data))
+    if summary is not None:
+        summary.count(subsystem)
+    if tracker is not None and tracker.update(apid, seq_count) == GAP:
+        log.debug("Sequence gap on APID 0x%03X before packet #%d", apid, seq_count)
+    return packet
+
+def print_sequence_report(tracker):
+    """
+    Print packet loss per APID and the gap size histogram.
+
+    Args:
+        tracker (SequenceTracker): Tracker fed by handle_packet.
+    """
+    for apid in tracker.apids():
+        stats = tracker.stats(apid)
+        print(f"[RX] APID 0x{apid:03X}: received {stats['received']}, lost {stats['lost']} "
+              f"({stats['loss_rate']:.3%}), duplicates {stats['duplicates']}, reordered {stats['reordered']}, "
+              f"stale {stats['stale']}, restarts {stats['restarts']}", flush=True)
+    total = tracker.stats()
+    histogram = ", ".join(f"{size}: {count}" for size, count in tracker.gap_histogram().items()) or "none"
+    print(f"[RX] Sequence: {total['lost']} lost ({total['loss_rate']:.3%}) in {total['gaps']} gaps; "
+          f"gap sizes {histogram}", flush=True)
+
+def receive_packets(framed=False, ring_slots=DEFAULT_SLOTS, latency=False, archive=None, columns=None):
+    """
+    Receive and decode telemetry until interrupted.
+
+    A reader thread only drains the socket into a ring buffer; decoding and
+    logging happen here, so a slow terminal cannot make the kernel drop packets
+    during a burst of up to ring_slots datagrams.
+
+    Args:
+        framed (bool): Datagrams carry TM Transfer Frames (transmitter run with --frames)
+            instead of one packet each.
+        ring_slots (int): Datagrams buffered between the reader and the decoder.
+        latency (bool): Strip TX timestamp trailers (transmitter run with --latency) and
+            report receive/decode latency percentiles.
+        archive (str): Directory to append every decoded packet to (see src/storage/archive.py).
+            The open segment's index is written every DEFAULT_SYNC_INTERVAL seconds.
+        columns (str): Directory of a per-APID columnar store to add every decoded packet to
+            (see src/storage/columnar.py). Pending rows are written every DEFAULT_FLUSH_INTERVAL seconds.
+    """
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.bind(("0.0.0.0", 5005))
+    demux = FrameDemultiplexer() if framed else None
+    ring = PacketRing(ring_slots, timestamps=latency)
+    start_socket_reader(sock, ring)
+    summary = PacketSummary(log, verb="received")
+    tracker = SequenceTracker()
+    recorder = LatencyRecorder(stages=("receive", "decode")) if latency else None
+    writers = []
+    if archive:
+        # Index written every sync interval: readers see the open segment and a crash loses little
+        writers.append(ArchiveWriter(archive, sync_interval=DEFAULT_SYNC_INTERVAL))
+    if columns:
+        # Short chunks every flush interval: readers see recent rows and a crash loses little
+        writers.append(ColumnWriter(columns, flush_interval=DEFAULT_FLUSH_INTERVAL))
+    log.info("Listening on 0.0.0.0:5005")
 
     try:
-        while True:
-            data, addr = sock.recvfrom(1024)
-            print(f"[RX] Received {len(data)} bytes from {addr}", flush=True)
-            print("[RX] Decoding packet...", flush=True)
-            print("==========================", flush=True)
-            try:
-                decoded = decode_ccsds_packet(data)
-                if decoded:
-                    print(f"[RX] Decoded {get_subsystem(decoded["primary"]["apid"]).upper()} packet #{decoded["primary"]["seq_count"]} successfully with payload length {len(data)}.", flush=True)
-            except (ValueError, struct.error) as e:
-                print(f"[RX] Error decoding packet: {e}", flush=True)
-                print("===========================", flush=True)
+        for data, addr in ring:
+            log.debug("Received %d bytes from %s", len(data), addr)
+            if demux is not None:
+                # One frame can hold dozens of packets, and packets may continue in the next frame
+                for packet in demux.feed(data):
+                    if handle_packet(packet, summary, tracker) is not None:
+                        for writer in writers:
+                            writer.append(packet)
+                continue
+
+            tx_ns = None
+            if recorder is not None:
+                data, tx_ns = split_trailer(data)
+                if tx_ns is not None:
+                    recorder.record("receive", tx_ns, ring.received_ns())
+            if handle_packet(data, summary, tracker) is None:
                 continue
-            print("===========================", flush=True)
+            for writer in writers:
+                writer.append(data)
+            if tx_ns is not None:
+                recorder.record("decode", tx_ns)
+                recorder.maybe_log(log)
     except KeyboardInterrupt:
+        summary.log()
         print("\n[RX] Shutdown requested. Closing socket...", flush=True)
+        stats = ring.stats()
+        print(f"[RX] Ring: {stats['received']} received, {stats['overflows']} overflowed, "
+              f"peak {stats['high_watermark']}/{stats['slots']} slots", flush=True)
+        if demux is not None:
+            print(f"[RX] Frames: {demux.frames} ok, {demux.bad_frames} bad, {demux.lost_frames} lost; "
+                  f"{demux.dropped_bytes} bytes dropped", flush=True)
+        print_sequence_report(tracker)
+        if recorder is not None:
+            recorder.log_report(log)
     finally:
         sock.close()
-        print("[RX] Socket closed.", flush=True)
\ No newline at end of file
+        for writer in writers:
+            writer.close()
+        if archive:
+            print(f"[RX] Archived {writers[0].packets} packets to {archive}", flush=True)
+        if columns:
+            print(f"[RX] Stored {writers[-1].rows_written} rows in {columns}", flush=True)
+        print("[RX] Socket closed.", flush=True)
@@ -0,0 +1,214 @@
+"""
+Purpose of this file: Multi-process ground receiver using SO_REUSEPORT.
+
+Every worker process opens its own UDP socket on the same port with
+SO_REUSEPORT, and the kernel spreads incoming datagrams across them by hashing
+the sender's address. Datagrams from one transmitter therefore always reach
+the same worker, which keeps its packets (and transfer frames) in order.
+
+Each socket gets a large SO_RCVBUF so bursts are absorbed by the kernel, and
+on Linux SO_RXQ_OVFL reports how many datagrams the kernel had to drop because
+that buffer was full. Workers decode and dispatch packets themselves and keep
+per-worker counters in shared memory, which the parent prints periodically.
+"""
+
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+from src.ccsds.frame import FrameDemultiplexer
+from src.ccsds.packet_view import PacketView
+
+DEFAULT_PORT = 5005
+DEFAULT_RCVBUF = 8 * 1024 * 1024  # requested; Linux caps it at net.core.rmem_max (and reports double)
+RECV_BUFFER_SIZE = 2048  # larger than any packet or transfer frame we send
+# Linux-only option, not exported by Python; 40 means something else (or nothing) on other systems
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if sys.platform.startswith("linux") else None)
+
+# One row of shared counters per worker
+COUNTER_FIELDS = ("received", "decoded", "failed", "dropped", "rcvbuf")
+_PUBLISH_EVERY = 256  # datagrams between updates of the shared counters
+
+
+def open_reuseport_socket(ip: str = "0.0.0.0", port: int = DEFAULT_PORT, rcvbuf: int = DEFAULT_RCVBUF) -> tuple:
+    """
+    Open a UDP socket that shares its port with the other workers.
+
+    Args:
+        ip (str): Address to bind.
+        port (int): UDP port shared by all workers.
+        rcvbuf (int): Requested kernel receive buffer size in bytes.
+
+    Returns:
+        tuple: (socket, drop_counting) where drop_counting is True if SO_RXQ_OVFL is enabled.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not available on this platform")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+
+    drop_counting = False
+    if SO_RXQ_OVFL is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            drop_counting = True
+        except OSError:
+            pass  # not Linux; dropped datagrams are not reported
+
+    sock.bind((ip, port))
+    return sock, drop_counting
+
+
+def _decode(data, demux, handler) -> tuple:
+    """
+    Decode one datagram (a packet, or a transfer frame when demux is set).
+
+    Returns:
+        tuple: (decoded, failed) packet counts.
+    """
+    packets = demux.feed(data) if demux is not None else (data,)
+    decoded = failed = 0
+    for packet in packets:
+        try:
+            view = PacketView(packet)
+            view.payload  # full decode, including the length check against the schema
+            if handler is not None:
+                handler(view)
+            decoded += 1
+        except (ValueError, struct.error):
+            failed += 1
+    return decoded, failed
+
+
+def _worker_loop(index: int, ip: str, port: int, rcvbuf: int, framed: bool, counters, stop_event, handler,
+                 ready=None):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles Ctrl-C and sets stop_event
+    sock, drop_counting = open_reuseport_socket(ip, port, rcvbuf)
+    sock.settimeout(0.2)  # wake up regularly to check stop_event and publish counters
+    row = index * len(COUNTER_FIELDS)
+    counters[row + 4] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if ready is not None:
+        ready.release()
+
+    demux = FrameDemultiplexer() if framed else None
+    ancillary_size = socket.CMSG_SPACE(4)
+    received = decoded = failed = dropped = 0
+    unpublished = 0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                if drop_counting:
+                    data, ancdata, _, _ = sock.recvmsg(RECV_BUFFER_SIZE, ancillary_size)
+                    for level, kind, value in ancdata:
+                        if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL:
+                            dropped = struct.unpack("=I", value[:4])[0]  # cumulative count for this socket
+                else:
+                    data = sock.recv(RECV_BUFFER_SIZE)
+            except socket.timeout:
+                unpublished = _PUBLISH_EVERY
+            else:
+                received += 1
+                ok, bad = _decode(data, demux, handler)
+                decoded += ok
+                failed += bad
+                unpublished += 1
+
+            if unpublished >= _PUBLISH_EVERY:
+                counters[row:row + 4] = [received, decoded, failed, dropped]
+                unpublished = 0
+    finally:
+        counters[row:row + 4] = [received, decoded, failed, dropped]
+        sock.close()
+
+
+def worker_counts(counters, workers: int) -> list:
+    """
+    Snapshot the shared counters.
+
+    Returns:
+        list: One dict per worker with the COUNTER_FIELDS keys.
+    """
+    width = len(COUNTER_FIELDS)
+    values = counters[:workers * width]
+    return [dict(zip(COUNTER_FIELDS, values[index * width:(index + 1) * width])) for index in range(workers)]
+
+
+def print_worker_report(counts: list, elapsed: float = None):
+    """
+    Print received/decoded/failed/dropped per worker and in total.
+
+    Args:
+        counts (list): Output of worker_counts.
+        elapsed (float): Seconds since start, used for the total packet rate.
+    """
+    for index, count in enumerate(counts):
+        print(f"[RX] worker {index}: received {count['received']}, decoded {count['decoded']}, "
+              f"failed {count['failed']}, dropped {count['dropped']} (rcvbuf {count['rcvbuf']} B)", flush=True)
+    total = {field: sum(count[field] for count in counts) for field in COUNTER_FIELDS[:4]}
+    rate = f", {total['received'] / elapsed:.1f} datagrams/s" if elapsed else ""
+    print(f"[RX] total: received {total['received']}, decoded {total['decoded']}, failed {total['failed']}, "
+          f"dropped {total['dropped']}{rate}", flush=True)
+
+
+def run_receiver_workers(workers: int = None, ip: str = "0.0.0.0", port: int = DEFAULT_PORT, rcvbuf: int = DEFAULT_RCVBUF,
+                         framed: bool = False, report_interval: float = 5.0, duration: float = None,
+                         handler=None) -> list:
+    """
+    Receive on one port with several worker processes until interrupted.
+
+    Args:
+        workers (int): Number of worker processes. Defaults to the number of CPU cores.
+        ip (str): Address to bind.
+        port (int): UDP port shared by all workers.
+        rcvbuf (int): Requested SO_RCVBUF per worker socket, in bytes.
+        framed (bool): Datagrams carry TM Transfer Frames instead of one packet each.
+        report_interval (float): Seconds between counter reports; no periodic report if None.
+        duration (float): Stop after this many seconds. Runs until Ctrl-C if None.
+        handler: Optional picklable function called in the worker with each decoded PacketView.
+
+    Returns:
+        list: Final counters, one dict per worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    counters = multiprocessing.Array("Q", workers * len(COUNTER_FIELDS), lock=False)
+    stop_event = multiprocessing.Event()
+    ready = multiprocessing.Semaphore(0)
+    processes = [
+        multiprocessing.Process(target=_worker_loop, name=f"rx-worker-{index}",
+                                args=(index, ip, port, rcvbuf, framed, counters, stop_event, handler, ready))
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        if not ready.acquire(timeout=10):
+            break  # a worker failed to bind; its exit code shows up below
+    print(f"[RX] {workers} workers listening on {ip}:{port} with SO_REUSEPORT", flush=True)
+
+    start = time.monotonic()
+    next_report = start + report_interval if report_interval else None
+    try:
+        while all(process.is_alive() for process in processes):
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+            if next_report is not None and now >= next_report:
+                print_worker_report(worker_counts(counters, workers), now - start)
+                next_report += report_interval
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        print("\n[RX] Shutdown requested. Stopping workers...", flush=True)
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join()
+
+    counts = worker_counts(counters, workers)
+    print_worker_report(counts, time.monotonic() - start)
+    return counts
@@ -0,0 +1,176 @@
+"""
+Purpose of this file: Deadline scheduler for periodic telemetry streams.
+
+Each stream (e.g. a subsystem) has a fixed rate. Next deadlines are kept in a
+min-heap keyed on time.monotonic(), so the transmitter can sleep exactly until
+the earliest one instead of polling, and the cost per emitted packet is
+O(log n) regardless of how many streams are registered.
+
+Deadlines advance by whole intervals from the previous deadline, not from the
+time the stream was serviced, so rates do not drift. If a stream falls more
+than one interval behind (e.g. the process was stalled), the missed periods
+are skipped and counted rather than sent in a burst.
+"""
+
+import heapq
+import time
+
+
+class Scheduler:
+    """
+    Min-heap of (deadline, stream) entries with per-stream rate statistics.
+
+    Example:
+        scheduler = Scheduler()
+        scheduler.add("cdh", 1)
+        scheduler.add("adcs", 2)
+        while True:
+            for stream in scheduler.wait():
+                send(stream)
+    """
+
+    def __init__(self, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            clock: Monotonic time source in seconds.
+            sleep: Function used to wait, called with a duration in seconds.
+        """
+        self._clock = clock
+        self._sleep = sleep
+        self._heap = []  # [deadline, order, name]; order breaks ties between equal deadlines
+        self._streams = {}  # name -> stream state dict
+        self._order = 0
+
+    def add(self, name, rate: float, start: float = None):
+        """
+        Register a periodic stream.
+
+        Args:
+            name: Hashable stream identifier, e.g. a subsystem name.
+            rate (float): Emissions per second (Hz).
+            start (float): Clock time of the first deadline. Defaults to now.
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate for stream {name!r} must be positive, got {rate}")
+        if name in self._streams:
+            raise ValueError(f"Stream {name!r} is already scheduled")
+
+        deadline = self._clock() if start is None else start
+        entry = [deadline, self._order, name]
+        self._streams[name] = {
+            "entry": entry,  # its only live heap entry; older ones (from a removed stream) are skipped
+            "rate": rate,
+            "interval": 1.0 / rate,
+            "emitted": 0,
+            "skipped": 0,
+            "first_emit": None,
+            "last_emit": None,
+        }
+        heapq.heappush(self._heap, entry)
+        self._order += 1
+
+    def remove(self, name):
+        """
+        Unregister a stream. Its heap entry is discarded lazily, even if the name is added again.
+        """
+        del self._streams[name]
+
+    def _is_live(self, entry) -> bool:
+        stream = self._streams.get(entry[2])
+        return stream is not None and stream["entry"] is entry
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def _drop_removed(self):
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def next_deadline(self) -> float:
+        """
+        Returns:
+            float: Clock time of the earliest deadline, or None if nothing is scheduled.
+        """
+        self._drop_removed()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float = None) -> list:
+        """
+        Collect every stream whose deadline has passed and schedule its next deadline.
+
+        Args:
+            now (float): Current clock time. Defaults to the scheduler's clock.
+
+        Returns:
+            list: Names of the due streams, earliest deadline first.
+        """
+        if now is None:
+            now = self._clock()
+
+        heap = self._heap
+        due = []
+        while heap:
+            entry = heap[0]
+            deadline, _, name = entry
+            if not self._is_live(entry):
+                heapq.heappop(heap)
+                continue
+            stream = self._streams[name]
+            if deadline > now:
+                break
+
+            due.append(name)
+            if stream["first_emit"] is None:
+                stream["first_emit"] = now
+            stream["last_emit"] = now
+            stream["emitted"] += 1
+
+            # Advance from the deadline itself so the period does not drift
+            interval = stream["interval"]
+            deadline += interval
+            if deadline <= now:
+                missed = int((now - deadline) // interval) + 1
+                stream["skipped"] += missed
+                deadline += missed * interval
+
+            entry[0] = deadline
+            heapq.heapreplace(heap, entry)
+
+        return due
+
+    def wait(self) -> list:
+        """
+        Sleep until the next deadline, then return the streams that are due.
+
+        Returns:
+            list: Names of the due streams (empty if nothing is scheduled).
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return []
+        delay = deadline - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+        return self.pop_due()
+
+    def stats(self) -> dict:
+        """
+        Configured vs. achieved rate for every stream.
+
+        Returns:
+            dict: name -> {"configured_hz", "achieved_hz", "emitted", "skipped"}.
+                achieved_hz is None until a stream has emitted twice.
+        """
+        report = {}
+        for name, stream in self._streams.items():
+            achieved = None
+            if stream["emitted"] > 1 and stream["last_emit"] > stream["first_emit"]:
+                achieved = (stream["emitted"] - 1) / (stream["last_emit"] - stream["first_emit"])
+            report[name] = {
+                "configured_hz": stream["rate"],
+                "achieved_hz": achieved,
+                "emitted": stream["emitted"],
+                "skipped": stream["skipped"],
+            }
+        return report
@@ -1,8 +1,12 @@
 import socket
-import time
 from collections import defaultdict
 from src.ccsds.encoder import encode_ccsds_packet
+from src.ccsds.frame import DEFAULT_FRAME_LENGTH, FrameMultiplexer
+from src.comms.batch_send import BatchSender
+from src.comms.latency import append_trailer, clock_ns
+from src.comms.scheduler import Scheduler
 from src.subsystems import adcs, cdh, comms, payload, power, propulsion, thermal
+from src.utils.logger import PacketSummary, get_logger
 from dotenv import load_dotenv
 import os
 
@@ -31,36 +35,88 @@ GET_TELEMETRY_FUNC = {
     'payload': payload.get_payload_telemetry
 }
 
-last_emit = {s: 0 for s in SCHEDULE}
 seq_count = defaultdict(int)
 
-def transmit_packets(ip=GROUND_IP, port=GROUND_PORT):
+log = get_logger("TX")
+
+# In framed mode a partially filled frame is padded and sent at least this often,
+# so low-rate telemetry is not held back waiting for a full frame
+FRAME_FLUSH_INTERVAL = 1.0
+FRAME_FLUSH = "frame_flush"  # scheduler stream that triggers the flush
+
+def print_rate_report(rate_stats: dict):
+    """
+    Print configured vs. achieved rate for every subsystem.
+
+    Args:
+        rate_stats (dict): Output of Scheduler.stats().
+    """
+    for subsystem, stats in rate_stats.items():
+        achieved = f"{stats['achieved_hz']:.3f} Hz" if stats["achieved_hz"] is not None else "n/a"
+        print(f"[TX] {subsystem.upper():<10} configured {stats['configured_hz']:.3f} Hz, achieved {achieved}, "
+              f"sent {stats['emitted']}, skipped {stats['skipped']}", flush=True)
+
+def transmit_packets(ip=GROUND_IP, port=GROUND_PORT, framed=False, frame_length=DEFAULT_FRAME_LENGTH, latency=False):
+    """
+    Send telemetry for every subsystem at its SCHEDULE rate until interrupted.
+
+    Args:
+        ip (str): Ground station address.
+        port (int): Ground station UDP port.
+        framed (bool): Pack packets into TM Transfer Frames instead of one datagram per packet.
+        frame_length (int): Transfer frame length in bytes when framed.
+        latency (bool): Append the encode time to every datagram (see src/comms/latency.py).
+            Not supported together with framed.
+    """
+    if framed and latency:
+        raise ValueError("Latency trailers are per datagram and cannot be used with transfer frames")
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = BatchSender(sock, (ip, port))
+    mux = FrameMultiplexer(frame_length=frame_length) if framed else None
+
+    # One periodic stream per subsystem; the scheduler sleeps until the next one is due
+    scheduler = Scheduler()
+    for subsystem, rate in SCHEDULE.items():
+        scheduler.add(subsystem, rate)
+    if framed:
+        scheduler.add(FRAME_FLUSH, 1.0 / FRAME_FLUSH_INTERVAL)
+    summary = PacketSummary(log, verb="sent")
 
     try:
         while True:
+            # Every packet due in this tick is collected first and flushed in one batch
+            packets = []
+            due = scheduler.wait()
+            flush_frames = FRAME_FLUSH in due
+            if flush_frames:
+                due.remove(FRAME_FLUSH)
+            for subsystem in due:
+                data = GET_TELEMETRY_FUNC[subsystem]() # Get telemetry data for the subsystem
+                if latency:
+                    tx_ns = clock_ns() # Taken before encoding, so the latency covers the whole pipeline
+                    packets.append(append_trailer(encode_ccsds_packet(subsystem, data, seq_count[subsystem]), tx_ns))
+                    continue
+                packets.append(encode_ccsds_packet(subsystem, data, seq_count[subsystem])) # Encode the packet
+            if mux is not None:
+                # Frames are sent when full, and padded with an idle packet on every flush tick
+                frames = []
+                for packet in packets:
+                    frames.extend(mux.add_packet(packet))
+                if flush_frames:
+                    frames.extend(mux.flush())
+                packets = frames
+            sender.send(packets) # Send the packets (or frames) to the ground station
+            for subsystem in due:
+                log.debug("Sent to %s -> %s Packet #%d", ip, subsystem.upper(), seq_count[subsystem]) # Per-packet trace (DEBUG only)
+                summary.count(subsystem)
+                seq_count[subsystem] = (seq_count[subsystem] + 1) % 16384 # Increment sequence count, wrap around at 16384
 
-            # Get the current time
-            now = time.time()
-
-            # Check each subsystem's schedule
-            # If enough time has passed since the last emission, send a packet
-            # and update the last_emit time
-            for subsystem, rate in SCHEDULE.items():
-                # Calculate the interval based on the rate
-                interval = 1/rate
-                # Check if it's time to emit a packet for this subsystem
-                if now - last_emit[subsystem] >= interval:
-                    data = GET_TELEMETRY_FUNC[subsystem]() # Get telemetry data for the subsystem
-                    packet = encode_ccsds_packet(subsystem, data, seq_count[subsystem]) # Encode the packet
-                    sock.sendto(packet, (ip, port)) # Send the packet to the ground station
-                    print(f"[TX] Sent to {ip} -> {subsystem.upper()} Packet #{seq_count[subsystem]}") # Print the packet details
-                    seq_count[subsystem] = (seq_count[subsystem] + 1) % 16384 # Increment sequence count, wrap around at 16384
-                    last_emit[subsystem] = now # Update the last emit time for this subsystem
-            time.sleep(0.01)  # Prevent busy-waiting
-            
     except KeyboardInterrupt:
+        summary.log()
         print("\n[TX] Shutdown requested. Closing socket...", flush=True)
+        rate_stats = scheduler.stats()
+        rate_stats.pop(FRAME_FLUSH, None)
+        print_rate_report(rate_stats)
     finally:
         sock.close()
         print("[TX] Socket closed.", flush=True)
\ No newline at end of file
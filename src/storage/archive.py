@@ -0,0 +1,487 @@
+"""
+Purpose of this file: Append-only archive of raw telemetry packets with a memory-mapped index.
+
+Packets are appended unchanged to segment files (segment-000000.dat, ...). A
+new segment is started when the current one reaches segment_size. For every
+segment there is a sidecar index (segment-000000.idx) with one entry per
+packet: mission time (absolute seconds since MISSION_START), sequence count,
+size and offset in the segment.
+
+The index is stored column by column, grouped by APID and sorted by time
+within each APID, with a small APID directory in front:
+
+    header     magic, version, min/max time, packet count, APID count
+    dir_apid   uint16 per APID
+    dir_start  uint64 per APID + 1: first index entry of each APID's block
+    time       uint32 per packet
+    seq        uint16 per packet
+    size       uint16 per packet
+    offset     uint32 per packet
+
+The reader mmaps segments and indexes and answers time-range + APID queries
+with two binary searches per APID and segment. Segments outside the time
+range are skipped by their header. Only the index pages touched by the
+binary searches and the matching packets are ever read.
+
+    with ArchiveWriter("archive") as writer:
+        writer.append(packet)
+    with ArchiveReader("archive") as reader:
+        packets = reader.query(start, end, apids=[0x02])  # memoryviews, in time order
+
+An index is written when its segment is closed, by sync(), and every
+sync_interval seconds if set (the ground station uses DEFAULT_SYNC_INTERVAL),
+so readers see the open segment. A segment left
+by a crash without an index, or with one that stops short of the end of the
+data (written by a sync() before later appends), is re-indexed when a writer
+next opens the archive; a torn packet at its end is cut off.
+"""
+
+from array import array
+import mmap
+import os
+import re
+import struct
+import time
+
+import numpy as np
+
+from src.ccsds import schema
+from src.ccsds.time import FINE_TIME_BITS, MISSION_START_TIMESTAMP, resolve_coarse
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+MAX_SEGMENT_SIZE = 1 << 32  # offsets are stored as uint32
+DEFAULT_SYNC_INTERVAL = 30.0  # seconds between index writes, for live writers
+SEGMENT_PREFIX = "segment-"
+DATA_SUFFIX = ".dat"
+INDEX_SUFFIX = ".idx"
+_SEGMENT_RE = re.compile(rf"^{SEGMENT_PREFIX}(\d{{6}}){re.escape(DATA_SUFFIX)}$")
+
+INDEX_MAGIC = b"TMIX"
+INDEX_VERSION = 1
+# magic, version, reserved, min time, max time, packet count, APID count
+INDEX_HEADER_STRUCT = struct.Struct("<4sHHIIQQ")
+_COLUMN_ALIGN = 8
+# Per-packet columns, in file order
+INDEX_COLUMNS = (("time", np.dtype("<u4")), ("seq", np.dtype("<u2")), ("size", np.dtype("<u2")), ("offset", np.dtype("<u4")))
+
+_HEADER_STRUCT = struct.Struct(">HHHI")  # primary header words and the CUC word
+
+
+def mission_seconds(unix_time: float) -> int:
+    """
+    Convert a UNIX time to the archive's time axis (whole seconds since MISSION_START).
+    """
+    return int(unix_time - MISSION_START_TIMESTAMP)
+
+
+def segment_paths(directory: str, number: int) -> tuple:
+    """
+    Returns:
+        tuple: (data path, index path) of segment `number`.
+    """
+    base = os.path.join(directory, f"{SEGMENT_PREFIX}{number:06d}")
+    return base + DATA_SUFFIX, base + INDEX_SUFFIX
+
+
+def list_segments(directory: str) -> list:
+    """
+    Segment numbers present in an archive directory, in order.
+    """
+    if not os.path.isdir(directory):
+        return []
+    numbers = []
+    for name in os.listdir(directory):
+        match = _SEGMENT_RE.match(name)
+        if match:
+            numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+
+def _aligned(position: int) -> int:
+    return (position + _COLUMN_ALIGN - 1) // _COLUMN_ALIGN * _COLUMN_ALIGN
+
+
+def _index_layout(count: int, apid_count: int) -> tuple:
+    """
+    Byte offset of every index column for a given packet and APID count.
+
+    Returns:
+        tuple: ({column name: (offset, dtype, length)}, total size in bytes)
+    """
+    layout = {}
+    position = INDEX_HEADER_STRUCT.size
+    columns = (("dir_apid", np.dtype("<u2"), apid_count), ("dir_start", np.dtype("<u8"), apid_count + 1))
+    columns += tuple((name, dtype, count) for name, dtype in INDEX_COLUMNS)
+    for name, dtype, length in columns:
+        position = _aligned(position)
+        layout[name] = (position, dtype, length)
+        position += dtype.itemsize * length
+    return layout, position
+
+
+def write_index(path: str, apids, times, seqs, sizes, offsets):
+    """
+    Sort index entries by (APID, time) and write them atomically.
+
+    Args:
+        path (str): Index file path.
+        apids, times, seqs, sizes, offsets: Array-likes with one entry per packet, in arrival order.
+    """
+    apids = np.asarray(apids, dtype=np.uint16)
+    times = np.asarray(times, dtype=np.uint32)
+    order = np.lexsort((times, apids))  # stable, so equal times keep their arrival order
+    apids = apids[order]
+    count = len(order)
+
+    block_starts = np.flatnonzero(np.diff(apids, prepend=-1)) if count else np.zeros(0, dtype=np.int64)
+    dir_apid = apids[block_starts]
+    dir_start = np.append(block_starts, count)
+    columns = {
+        "dir_apid": dir_apid,
+        "dir_start": dir_start,
+        "time": times[order],
+        "seq": np.asarray(seqs, dtype=np.uint16)[order],
+        "size": np.asarray(sizes, dtype=np.uint16)[order],
+        "offset": np.asarray(offsets, dtype=np.uint32)[order],
+    }
+    layout, total = _index_layout(count, len(dir_apid))
+    buffer = bytearray(total)
+    min_time = int(columns["time"].min()) if count else 0
+    max_time = int(columns["time"].max()) if count else 0
+    INDEX_HEADER_STRUCT.pack_into(buffer, 0, INDEX_MAGIC, INDEX_VERSION, 0, min_time, max_time, count, len(dir_apid))
+    for name, (position, dtype, length) in layout.items():
+        np.frombuffer(buffer, dtype=dtype, count=length, offset=position)[:] = columns[name]
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(buffer)
+    os.replace(temporary, path)  # readers never see a half-written index
+
+
+def index_is_complete(data_path: str, index_path: str) -> bool:
+    """
+    Whether an index exists and covers every byte of its segment's data file.
+    """
+    if not os.path.exists(index_path):
+        return False
+    with open(index_path, "rb") as file:
+        buffer = file.read()
+    if len(buffer) < INDEX_HEADER_STRUCT.size:
+        return False
+    magic, version, _, _, _, count, apid_count = INDEX_HEADER_STRUCT.unpack_from(buffer)
+    layout, total = _index_layout(count, apid_count)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or len(buffer) < total:
+        return False
+    end = 0
+    if count:
+        offsets = np.frombuffer(buffer, dtype=layout["offset"][1], count=count, offset=layout["offset"][0])
+        sizes = np.frombuffer(buffer, dtype=layout["size"][1], count=count, offset=layout["size"][0])
+        end = int((offsets.astype(np.int64) + sizes).max())
+    return end == os.path.getsize(data_path)
+
+
+def rebuild_index(data_path: str, index_path: str, reference: float = None) -> int:
+    """
+    Re-create the index of a segment by walking its packets, truncating a torn last packet.
+
+    Args:
+        data_path (str): Segment data file.
+        index_path (str): Index file to write.
+        reference (float): UNIX time used to resolve the coarse time rollover. Defaults to the file's mtime.
+
+    Returns:
+        int: Number of packets indexed.
+    """
+    if reference is None:
+        reference = os.path.getmtime(data_path)
+    with open(data_path, "rb") as file:
+        data = file.read()
+    apids, times, seqs, sizes, offsets = [], [], [], [], []
+    offset = 0
+    while len(data) - offset >= schema.HEADER_LEN:
+        packet_id, seq_ctrl, length, cuc = _HEADER_STRUCT.unpack_from(data, offset)
+        size = schema.packet_size_from_length(length)
+        if len(data) - offset < size:
+            break
+        apids.append(packet_id & 0x7FF)
+        times.append(resolve_coarse(cuc >> FINE_TIME_BITS, reference))
+        seqs.append(seq_ctrl & 0x3FFF)
+        sizes.append(size)
+        offsets.append(offset)
+        offset += size
+    if offset < len(data):
+        with open(data_path, "r+b") as file:
+            file.truncate(offset)
+    write_index(index_path, apids, times, seqs, sizes, offsets)
+    return len(offsets)
+
+
+class ArchiveWriter:
+    """
+    Appends packets to the newest segment of an archive directory.
+    """
+
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE, sync_interval: float = None,
+                 clock=time.monotonic):
+        """
+        Args:
+            directory (str): Archive directory; created if missing. Existing segments are kept.
+            segment_size (int): Start a new segment once the current one would exceed this many bytes.
+            sync_interval (float): Also sync() once this many seconds have passed since the last
+                index write (checked on append). None only writes the index when a segment is closed.
+            clock: Monotonic time source in seconds, for sync_interval.
+        """
+        if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+            raise ValueError(f"Segment size must be between 1 and {MAX_SEGMENT_SIZE} bytes, got {segment_size}")
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._last_sync = clock()
+        os.makedirs(directory, exist_ok=True)
+
+        existing = list_segments(directory)
+        for number in existing:
+            data_path, index_path = segment_paths(directory, number)
+            if not index_is_complete(data_path, index_path):
+                rebuild_index(data_path, index_path)  # left behind by a crash, possibly after a sync()
+        self.segment = existing[-1] + 1 if existing else 0
+        self.packets = 0
+        self._file = None
+        self._open_segment()
+
+    def _open_segment(self):
+        data_path, self._index_path = segment_paths(self.directory, self.segment)
+        self._file = open(data_path, "ab", buffering=1024 * 1024)
+        self._offset = 0
+        # Compact typed arrays: a segment can hold millions of entries, which as lists of ints
+        # would cost ~10x the memory and slow down every garbage collection
+        self._apids, self._times, self._seqs = array("H"), array("I"), array("H")
+        self._sizes, self._offsets = array("H"), array("I")
+
+    def _close_segment(self):
+        self._file.close()
+        if not self._offsets:
+            os.remove(self._file.name)  # nothing was written; do not leave empty segments behind
+            return
+        write_index(self._index_path, self._apids, self._times, self._seqs, self._sizes, self._offsets)
+
+    def append(self, packet, mission_time: int = None):
+        """
+        Append one packet.
+
+        Args:
+            packet: bytes-like, one complete packet.
+            mission_time (int): Seconds since MISSION_START for the index. Defaults to the
+                packet's CUC coarse time, resolved against the current time.
+        """
+        size = len(packet)
+        if size < schema.HEADER_LEN:
+            raise ValueError(f"Incomplete CCSDS packet. Expected at least {schema.HEADER_LEN} bytes, got {size}")
+        if self._offset and self._offset + size > self.segment_size:
+            self._close_segment()
+            self.segment += 1
+            self._open_segment()
+
+        packet_id, seq_ctrl, _, cuc = _HEADER_STRUCT.unpack_from(packet)
+        if mission_time is None:
+            mission_time = resolve_coarse(cuc >> FINE_TIME_BITS, time.time())
+        self._file.write(packet)
+        self._apids.append(packet_id & 0x7FF)
+        self._times.append(mission_time)
+        self._seqs.append(seq_ctrl & 0x3FFF)
+        self._sizes.append(size)
+        self._offsets.append(self._offset)
+        self._offset += size
+        self.packets += 1
+        if self.sync_interval is not None and self._clock() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """
+        Flush the current segment and write its index so readers can see it.
+        """
+        self._file.flush()
+        write_index(self._index_path, self._apids, self._times, self._seqs, self._sizes, self._offsets)
+        self._last_sync = self._clock()
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Segment:
+    """
+    One memory-mapped segment and its index columns.
+    """
+
+    def __init__(self, data_path: str, index_path: str):
+        with open(index_path, "rb") as file:
+            self._index_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.min_time, self.max_time, count, apid_count = INDEX_HEADER_STRUCT.unpack_from(self._index_map)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{index_path} is not a version {INDEX_VERSION} archive index")
+        self.count = count
+        for name, (position, dtype, length) in _index_layout(count, apid_count)[0].items():
+            setattr(self, name, np.frombuffer(self._index_map, dtype=dtype, count=length, offset=position))
+        self._blocks = {int(apid): index for index, apid in enumerate(self.dir_apid)}
+
+        self._data_map = None
+        if count:
+            with open(data_path, "rb") as file:
+                self._data_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self._data_map) if self._data_map is not None else memoryview(b"")
+
+    def select(self, start: int, end: int, apids) -> list:
+        """
+        Index ranges [lo, hi) of matching entries, one per APID with matches.
+        """
+        ranges = []
+        for apid in (self._blocks if apids is None else apids):
+            block = self._blocks.get(apid)
+            if block is None:
+                continue
+            first, last = int(self.dir_start[block]), int(self.dir_start[block + 1])
+            times = self.time[first:last]
+            lo = first + (int(np.searchsorted(times, start, "left")) if start is not None else 0)
+            hi = first + (int(np.searchsorted(times, end, "right")) if end is not None else last - first)
+            if hi > lo:
+                ranges.append((apid, lo, hi))
+        return ranges
+
+    def close(self):
+        # The maps can only be closed once no views into them are left
+        self.data.release()
+        for name, _ in INDEX_COLUMNS:
+            setattr(self, name, None)
+        self.dir_apid = self.dir_start = None
+        for mapping in (self._data_map, self._index_map):
+            if mapping is None:
+                continue
+            try:
+                mapping.close()
+            except BufferError:
+                pass  # the caller still holds packets from query(); the map is released with them
+
+
+class ArchiveReader:
+    """
+    Time-range and APID queries over every indexed segment of an archive.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Archive directory written by ArchiveWriter.
+        """
+        self.directory = directory
+        self._segments = []
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-open the archive to pick up segments (and indexes) written since the last call.
+        """
+        self._close_segments()
+        for number in list_segments(self.directory):
+            data_path, index_path = segment_paths(self.directory, number)
+            if os.path.exists(index_path):
+                self._segments.append(_Segment(data_path, index_path))
+
+    @property
+    def packet_count(self) -> int:
+        return sum(segment.count for segment in self._segments)
+
+    def _matches(self, start, end, apids):
+        """
+        Yield (segment number, segment, [(apid, lo, hi), ...]) for segments with matches.
+        """
+        if apids is not None:
+            apids = sorted({int(apid) for apid in apids})
+        for number, segment in enumerate(self._segments):
+            if not segment.count:
+                continue
+            if (start is not None and segment.max_time < start) or (end is not None and segment.min_time > end):
+                continue  # the whole segment is outside the time range
+            ranges = segment.select(start, end, apids)
+            if ranges:
+                yield number, segment, ranges
+
+    def count(self, start: int = None, end: int = None, apids=None) -> int:
+        """
+        Number of packets matching a query, from the index alone.
+
+        Args:
+            start (int): First mission second (inclusive), or None for no lower bound.
+            end (int): Last mission second (inclusive), or None for no upper bound.
+            apids: Iterable of APIDs, or None for all.
+        """
+        return sum(hi - lo for _, _, ranges in self._matches(start, end, apids) for _, lo, hi in ranges)
+
+    def query_index(self, start: int = None, end: int = None, apids=None) -> np.ndarray:
+        """
+        Index entries matching a query, without touching packet data.
+
+        Returns:
+            np.ndarray: Structured array with fields segment, apid, time, seq, size, offset, sorted by time,
+                then by arrival order (segment, offset) within a second.
+        """
+        dtype = np.dtype([("segment", np.uint32), ("apid", np.uint16), ("time", np.uint32),
+                          ("seq", np.uint16), ("size", np.uint16), ("offset", np.uint32)])
+        parts = []
+        for number, segment, ranges in self._matches(start, end, apids):
+            # Gather every matching range of the segment with one fancy index per column
+            range_apids, los, his = (np.array(column, dtype=np.int64) for column in zip(*ranges))
+            lengths = his - los
+            total = int(lengths.sum())
+            positions = np.repeat(los - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            part = np.empty(total, dtype=dtype)
+            part["segment"] = number
+            part["apid"] = np.repeat(range_apids, lengths)
+            for name, _ in INDEX_COLUMNS:
+                part[name] = getattr(segment, name)[positions]
+            parts.append(part)
+        if not parts:
+            return np.empty(0, dtype=dtype)
+        entries = np.concatenate(parts)
+        # The index only holds whole seconds and is grouped by APID; segment and offset restore
+        # the recorded interleaving of packets within the same second
+        return entries[np.lexsort((entries["offset"], entries["segment"], entries["time"]))]
+
+    def query(self, start: int = None, end: int = None, apids=None) -> list:
+        """
+        Packets matching a query.
+
+        Args:
+            start (int): First mission second (inclusive), or None for no lower bound.
+            end (int): Last mission second (inclusive), or None for no upper bound.
+            apids: Iterable of APIDs, or None for all.
+
+        Returns:
+            list: memoryview of every matching packet (valid until the reader is closed), in time order
+                (arrival order within a second).
+        """
+        entries = self.query_index(start, end, apids)
+        views = [segment.data for segment in self._segments]
+        return [views[segment][offset:offset + size] for segment, offset, size
+                in zip(entries["segment"].tolist(), entries["offset"].tolist(), entries["size"].tolist())]
+
+    def _close_segments(self):
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def close(self):
+        self._close_segments()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,367 @@
+"""
+Purpose of this file: Columnar per-APID telemetry store for parameter time series.
+
+The packet archive (archive.py) keeps whole packets; analysis usually wants
+one parameter over a long range, e.g. battery_voltage over a week. Here every
+APID gets a directory with one file per column: the packet time, the sequence
+count and every payload field from the APID's schema.
+
+    store/
+        apid-002/
+            catalog.json       chunk list: rows, time range, per-column offset/length/min/max
+            _time.col          fine ticks (1/256 s) since MISSION_START
+            _seq.col
+            battery_voltage.col
+            ...
+
+Rows are buffered per APID and written in chunks of chunk_rows, or sooner
+when flush_interval is set: a long-running writer (the ground station) then
+writes whatever is pending every flush_interval seconds, so readers see recent
+rows and a crash loses at most that much. Each column chunk is compressed on
+its own:
+
+- integer columns (time, counters, flags): delta from the previous value
+- float columns: XOR with the previous value's bits (slowly changing
+  telemetry leaves mostly zero high bytes)
+
+then byte-shuffled (all first bytes, then all second bytes, ...) and
+compressed with zlib. The catalog keeps min/max per column chunk, so reads
+skip chunks outside the time range or whose values cannot match a
+predicate. Reading one parameter only opens that column's file (plus the time
+column, for the chunks that survived skipping).
+
+    with ColumnWriter("store") as writer:
+        writer.append(packet)
+    times, values = ColumnReader("store").read(0x002, "battery_voltage", start, end)
+"""
+
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+
+from src.ccsds import decoder, schema
+from src.ccsds.time import FINE_TICKS, cuc_to_ticks
+
+DEFAULT_CHUNK_ROWS = 65536
+DEFAULT_FLUSH_INTERVAL = 30.0  # seconds of buffered rows at most, for live writers
+COMPRESSION_LEVEL = 6
+CATALOG_NAME = "catalog.json"
+TIME_COLUMN = "_time"
+SEQ_COLUMN = "_seq"
+COLUMN_SUFFIX = ".col"
+
+
+def apid_directory(directory: str, apid: int) -> str:
+    return os.path.join(directory, f"apid-{apid:03x}")
+
+
+def encode_column(values: np.ndarray) -> tuple:
+    """
+    Compress one column chunk.
+
+    Args:
+        values (np.ndarray): 1-D numeric array, any byte order.
+
+    Returns:
+        tuple: (codec, dtype string, compressed bytes)
+    """
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder("<"))
+    if values.dtype.kind == "f":
+        bits = values.view(f"<u{values.dtype.itemsize}")
+        encoded = bits.copy()
+        encoded[1:] ^= bits[:-1]
+        codec = "xor"
+    elif values.dtype.kind in "iu":
+        encoded = values.copy()
+        encoded[1:] -= values[:-1]  # wraps in the column's own width, undone exactly by cumsum
+        codec = "delta"
+    else:
+        encoded = values
+        codec = "raw"
+    shuffled = encoded.view(np.uint8).reshape(-1, values.dtype.itemsize).T
+    return codec, values.dtype.str, zlib.compress(shuffled.tobytes(), COMPRESSION_LEVEL)
+
+
+def decode_column(codec: str, dtype: str, data: bytes, rows: int) -> np.ndarray:
+    """
+    Inverse of encode_column.
+    """
+    dtype = np.dtype(dtype)
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(dtype.itemsize, rows)
+    if codec == "xor":
+        bits = np.ascontiguousarray(shuffled.T).view(f"<u{dtype.itemsize}").reshape(rows)
+        return np.bitwise_xor.accumulate(bits).view(dtype)
+    encoded = np.ascontiguousarray(shuffled.T).view(dtype).reshape(rows)
+    if codec == "delta":
+        return np.cumsum(encoded, dtype=dtype)
+    if codec == "raw":
+        return encoded
+    raise ValueError(f"Unknown column codec '{codec}'")
+
+
+def _stats(values: np.ndarray) -> tuple:
+    """
+    (min, max) as plain numbers for the catalog; (None, None) if there is no comparable value.
+    """
+    if values.dtype.kind == "f":
+        finite = values[~np.isnan(values)]
+        if not len(finite):
+            return None, None
+        return float(finite.min()), float(finite.max())
+    return values.min().item(), values.max().item()
+
+
+def _write_json(path: str, content: dict):
+    temporary = path + ".tmp"
+    with open(temporary, "w") as file:
+        json.dump(content, file)
+    os.replace(temporary, path)  # readers never see a half-written catalog
+
+
+class ColumnWriter:
+    """
+    Buffers decoded packets per APID and appends them as compressed column chunks.
+    """
+
+    def __init__(self, directory: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, reference: float = None,
+                 flush_interval: float = None, clock=time.monotonic):
+        """
+        Args:
+            directory (str): Store directory; created if missing. Existing data is appended to.
+            chunk_rows (int): Rows per chunk and column.
+            reference (float): UNIX time used to resolve the CUC coarse time rollover.
+                Defaults to the time each chunk is written.
+            flush_interval (float): Also write pending rows once this many seconds have passed
+                since the last flush (checked on append). None only writes full chunks.
+            clock: Monotonic time source in seconds, for flush_interval.
+        """
+        if chunk_rows < 1:
+            raise ValueError(f"Chunks need at least one row, got {chunk_rows}")
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.reference = reference
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._last_flush = clock()
+        self.rows_written = 0
+        os.makedirs(directory, exist_ok=True)
+        self._pending = {}  # APID -> list of byte strings holding whole packets
+        self._pending_rows = {}
+        self._catalogs = {}
+
+    def append(self, packet):
+        """
+        Add one packet.
+
+        Args:
+            packet: bytes-like, one complete packet.
+        """
+        if len(packet) < schema.PRIMARY_HEADER_LEN:
+            raise ValueError(f"Incomplete CCSDS packet. Expected at least {schema.PRIMARY_HEADER_LEN} bytes, got {len(packet)}")
+        apid = ((packet[0] << 8) | packet[1]) & 0x7FF
+        packet_schema = schema.get_schema(apid)
+        if len(packet) != packet_schema.packet_size:
+            raise ValueError(f"[DECODE ERROR] APID {apid:#04x}: Expected {packet_schema.packet_size} bytes, got {len(packet)} bytes")
+        self._add(apid, bytes(packet), 1)
+
+    def append_batch(self, buffer):
+        """
+        Add many packets at once (e.g. a capture), decoded with decoder.decode_batch.
+
+        Args:
+            buffer: bytes-like, packets back to back.
+        """
+        for apid, records in decoder.decode_batch(buffer).items():
+            self._add(apid, records.tobytes(), len(records))
+
+    def _add(self, apid: int, blob: bytes, rows: int):
+        self._pending.setdefault(apid, []).append(blob)
+        pending = self._pending_rows[apid] = self._pending_rows.get(apid, 0) + rows
+        if pending >= self.chunk_rows:
+            self._flush_apid(apid)
+        if self.flush_interval is not None and self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _catalog(self, apid: int) -> dict:
+        catalog = self._catalogs.get(apid)
+        if catalog is None:
+            path = os.path.join(apid_directory(self.directory, apid), CATALOG_NAME)
+            if os.path.exists(path):
+                with open(path) as file:
+                    catalog = json.load(file)
+            else:
+                packet_schema = schema.get_schema(apid)
+                catalog = {"apid": apid, "subsystem": packet_schema.subsystem, "fields": list(packet_schema.fields),
+                           "chunks": []}
+            self._catalogs[apid] = catalog
+        return catalog
+
+    def _flush_apid(self, apid: int):
+        blobs = self._pending.pop(apid, None)
+        self._pending_rows.pop(apid, None)
+        if not blobs:
+            return
+        packet_schema = schema.get_schema(apid)
+        records = np.frombuffer(b"".join(blobs), dtype=packet_schema.packet_dtype)
+        reference = self.reference if self.reference is not None else time.time()
+        columns = {
+            TIME_COLUMN: cuc_to_ticks(records["cuc_time"], reference),
+            SEQ_COLUMN: records["packet_seq_ctrl"] & 0x3FFF,
+        }
+        for name in packet_schema.fields:
+            columns[name] = records[name]
+
+        directory = apid_directory(self.directory, apid)
+        os.makedirs(directory, exist_ok=True)
+        catalog = self._catalog(apid)
+        for first in range(0, len(records), self.chunk_rows):
+            last = min(first + self.chunk_rows, len(records))
+            chunk = {"rows": last - first, "columns": {}}
+            for name, values in columns.items():
+                part = values[first:last]
+                codec, dtype, data = encode_column(part)
+                path = os.path.join(directory, name + COLUMN_SUFFIX)
+                with open(path, "ab") as file:
+                    offset = file.tell()
+                    file.write(data)
+                low, high = _stats(part)
+                chunk["columns"][name] = {"offset": offset, "length": len(data), "codec": codec, "dtype": dtype,
+                                          "min": low, "max": high}
+            chunk["time_min"] = chunk["columns"][TIME_COLUMN]["min"]
+            chunk["time_max"] = chunk["columns"][TIME_COLUMN]["max"]
+            catalog["chunks"].append(chunk)
+        # The catalog is written last, so a crash leaves at most unreferenced bytes in the column files
+        _write_json(os.path.join(directory, CATALOG_NAME), catalog)
+        self.rows_written += len(records)
+
+    def flush(self):
+        """
+        Write every APID's pending rows as (possibly short) chunks.
+        """
+        for apid in list(self._pending):
+            self._flush_apid(apid)
+        self._last_flush = self._clock()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ColumnReader:
+    """
+    Reads single parameters from a ColumnWriter store, skipping chunks by their statistics.
+
+    Attributes:
+        chunks_read (int): Column chunks decompressed so far.
+        chunks_skipped (int): Chunks ruled out by time range or min/max alone.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Store directory written by ColumnWriter.
+        """
+        self.directory = directory
+        self.chunks_read = 0
+        self.chunks_skipped = 0
+
+    def apids(self) -> list:
+        """
+        APIDs with data in the store, sorted.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(name[5:], 16) for name in os.listdir(self.directory) if name.startswith("apid-"))
+
+    def catalog(self, apid: int) -> dict:
+        """
+        The APID's catalog (fields and chunk list).
+        """
+        path = os.path.join(apid_directory(self.directory, apid), CATALOG_NAME)
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise ValueError(f"No data for APID {apid:#05x} in {self.directory}")
+
+    def _read_chunk(self, file, info: dict, rows: int) -> np.ndarray:
+        file.seek(info["offset"])
+        self.chunks_read += 1
+        return decode_column(info["codec"], info["dtype"], file.read(info["length"]), rows)
+
+    def read(self, apid: int, field: str, start: float = None, end: float = None, low=None, high=None) -> tuple:
+        """
+        One parameter over a time range, optionally only where its value is within [low, high].
+
+        Args:
+            apid (int): APID of the packets holding the field.
+            field (str): Payload field name (or "_seq" for sequence counts).
+            start (float): First mission second (inclusive), or None.
+            end (float): Last mission second (inclusive), or None.
+            low: Smallest value to return, or None.
+            high: Largest value to return, or None.
+
+        Returns:
+            tuple: (times, values) as NumPy arrays; times are float seconds since MISSION_START.
+        """
+        catalog = self.catalog(apid)
+        if field not in catalog["fields"] and field != SEQ_COLUMN:
+            raise KeyError(f"{catalog['subsystem']} packets have no field '{field}'")
+        start_ticks = None if start is None else start * FINE_TICKS
+        end_ticks = None if end is None else end * FINE_TICKS
+
+        selected = []
+        for chunk in catalog["chunks"]:
+            stats = chunk["columns"][field]
+            outside_time = ((start_ticks is not None and chunk["time_max"] < start_ticks)
+                            or (end_ticks is not None and chunk["time_min"] > end_ticks))
+            # An all-NaN chunk has no min/max: it can only be skipped when a value predicate is set
+            predicate = low is not None or high is not None
+            outside_values = predicate and (stats["min"] is None
+                                            or (low is not None and stats["max"] < low)
+                                            or (high is not None and stats["min"] > high))
+            if outside_time or outside_values:
+                self.chunks_skipped += 1
+                continue
+            selected.append(chunk)
+
+        directory = apid_directory(self.directory, apid)
+        time_parts, value_parts = [], []
+        with open(os.path.join(directory, field + COLUMN_SUFFIX), "rb") as values_file, \
+                open(os.path.join(directory, TIME_COLUMN + COLUMN_SUFFIX), "rb") as time_file:
+            for chunk in selected:
+                rows = chunk["rows"]
+                values = self._read_chunk(values_file, chunk["columns"][field], rows)
+                inside_time = ((start_ticks is None or chunk["time_min"] >= start_ticks)
+                               and (end_ticks is None or chunk["time_max"] <= end_ticks))
+                ticks = self._read_chunk(time_file, chunk["columns"][TIME_COLUMN], rows)
+                mask = None
+                if not inside_time:
+                    mask = np.ones(rows, dtype=bool)
+                    if start_ticks is not None:
+                        mask &= ticks >= start_ticks
+                    if end_ticks is not None:
+                        mask &= ticks <= end_ticks
+                if low is not None or high is not None:
+                    mask = np.ones(rows, dtype=bool) if mask is None else mask
+                    if low is not None:
+                        mask &= values >= low
+                    if high is not None:
+                        mask &= values <= high
+                if mask is not None:
+                    ticks, values = ticks[mask], values[mask]
+                time_parts.append(ticks)
+                value_parts.append(values)
+
+        if not value_parts:
+            dtype = np.dtype(catalog["chunks"][0]["columns"][field]["dtype"]) if catalog["chunks"] else np.float64
+            return np.empty(0), np.empty(0, dtype=dtype)
+        return np.concatenate(time_parts) / FINE_TICKS, np.concatenate(value_parts)
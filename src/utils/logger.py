@@ -0,0 +1,190 @@
+"""
+Purpose of this file: Logging for the transmitter, receiver and dashboard hot loops.
+
+Printing (and flushing) a line for every packet caps throughput at the speed of
+the terminal. Instead:
+
+- Log calls only put the record on an in-memory queue (QueueHandler); a
+  background QueueListener thread formats and writes it, so the TX/RX loops
+  never wait on stdout.
+- Per-packet lines are logged at DEBUG and are off by default. At INFO, a
+  PacketSummary prints one line per interval with the packet count and rate
+  for every subsystem.
+
+The level comes from the TELEMETRY_LOG_LEVEL environment variable (e.g.
+TELEMETRY_LOG_LEVEL=DEBUG to trace every packet again).
+
+    log = get_logger("RX")
+    summary = PacketSummary(log)
+    ...
+    log.debug("Decoded %s packet #%d", subsystem, seq_count)  # formatted only if DEBUG is on
+    summary.count(subsystem)
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+ROOT_LOGGER = "telemetry"
+LOG_LEVEL_ENV = "TELEMETRY_LOG_LEVEL"
+DEFAULT_LEVEL = "INFO"
+DEFAULT_SUMMARY_INTERVAL = 5.0  # seconds between summary lines
+LOG_FORMAT = "%(asctime)s [%(component)s] %(message)s"
+
+_listener = None
+
+
+class _ComponentFilter(logging.Filter):
+    """
+    Adds record.component: the last part of the logger name (e.g. "RX" for telemetry.RX).
+    """
+
+    def filter(self, record):
+        record.component = record.name.rsplit(".", 1)[-1]
+        return True
+
+
+def setup_logging(level=None, stream=None, handler: logging.Handler = None) -> logging.handlers.QueueListener:
+    """
+    Route the telemetry loggers through a background queue listener.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Level name or number. Defaults to $TELEMETRY_LOG_LEVEL, then INFO.
+        stream: Where the default handler writes. Defaults to sys.stdout.
+        handler (logging.Handler): Handler that does the actual output, instead of a stream handler.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener.
+    """
+    global _listener
+    shutdown_logging()
+
+    if level is None:
+        level = os.getenv(LOG_LEVEL_ENV, DEFAULT_LEVEL)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level {level!r}")
+
+    if handler is None:
+        handler = logging.StreamHandler(sys.stdout if stream is None else stream)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%H:%M:%S"))
+    handler.addFilter(_ComponentFilter())
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # processes everything already queued before returning
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(component: str) -> logging.Logger:
+    """
+    Get the logger for a component, setting up the queue listener on first use.
+
+    Args:
+        component (str): Short name shown in every line, e.g. "TX" or "RX".
+
+    Returns:
+        logging.Logger: The component logger.
+    """
+    if _listener is None:
+        setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+
+class PacketSummary:
+    """
+    Per-subsystem packet counters logged as one summary line per interval.
+
+    count() is cheap (a dict increment and a clock read), so it can be called
+    for every packet; the line is only formatted when the interval has passed.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = DEFAULT_SUMMARY_INTERVAL,
+                 verb: str = "packets", clock=time.monotonic):
+        """
+        Args:
+            logger (logging.Logger): Logger for the summary lines (at INFO).
+            interval (float): Seconds between summary lines.
+            verb (str): What is being counted, e.g. "sent" or "received".
+            clock: Monotonic time source in seconds.
+        """
+        self.logger = logger
+        self.interval = interval
+        self.verb = verb
+        self._clock = clock
+        self._window_start = clock()
+        self._counts = {}
+        self._errors = 0
+        self.total = 0
+        self.total_errors = 0
+
+    def count(self, subsystem: str, packets: int = 1):
+        """
+        Count packets for a subsystem and log a summary if the interval has passed.
+        """
+        self._counts[subsystem] = self._counts.get(subsystem, 0) + packets
+        self.total += packets
+        self.maybe_log()
+
+    def error(self, errors: int = 1):
+        """
+        Count packets that could not be processed.
+        """
+        self._errors += errors
+        self.total_errors += errors
+        self.maybe_log()
+
+    def maybe_log(self, now: float = None) -> bool:
+        """
+        Log and reset the window if the interval has passed.
+
+        Returns:
+            bool: True if a summary line was logged.
+        """
+        now = self._clock() if now is None else now
+        if now - self._window_start < self.interval:
+            return False
+        self.log(now)
+        return True
+
+    def log(self, now: float = None):
+        """
+        Log the current window (even if the interval has not passed) and start a new one.
+        """
+        now = self._clock() if now is None else now
+        elapsed = max(now - self._window_start, 1e-9)
+        counts = self._counts
+        if counts or self._errors:
+            total = sum(counts.values())
+            parts = ", ".join(f"{name.upper()} {count}" for name, count in sorted(counts.items()))
+            self.logger.info("%s %d in %.1fs (%.1f/s): %s; errors %d", self.verb, total, elapsed, total / elapsed,
+                             parts or "-", self._errors,
+                             extra={"summary": {"counts": dict(counts), "errors": self._errors, "elapsed": elapsed}})
+        self._counts = {}
+        self._errors = 0
+        self._window_start = now
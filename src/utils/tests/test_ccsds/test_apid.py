@@ -115,3 +115,20 @@ def test_get_subsystem_count():
     assert isinstance(count, int)
     assert count == 7
 
+
+# test_fleet_apids checks that spacecraft-specific APIDs round-trip through make_apid/split_apid
+# Spacecraft 0 must keep the plain subsystem APIDs, and the CCSDS idle APID must never be produced
+def test_fleet_apids():
+    assert apid.make_apid("cdh", 0) == apid.get_apid("cdh")
+    assert apid.make_apid("power", 3) == 3 * apid.SPACECRAFT_APID_STRIDE + 0x02
+    for spacecraft_id in (0, 1, 100, apid.MAX_SPACECRAFT - 1):
+        for subsystem in apid.get_subsystem_list():
+            value = apid.make_apid(subsystem, spacecraft_id)
+            assert value < apid.IDLE_APID
+            assert apid.split_apid(value) == (spacecraft_id, apid.get_apid(subsystem))
+    with pytest.raises(apid.ApidError):
+        apid.make_apid("cdh", apid.MAX_SPACECRAFT)
+    with pytest.raises(apid.ApidError):
+        apid.split_apid(apid.IDLE_APID)
+    with pytest.raises(apid.ApidError):
+        apid.split_apid(0x10)
@@ -1,5 +1,11 @@
 # Test module for CRC functions using pytest
 # This module contains tests for the CRC-CCSDS implementation to ensure correctness and reliability.
+import os
+import random
+
+import numpy as np
+import pytest
+
 from src.ccsds import crc
 
 # test_crc_known_vector checks the CRC-16 on a known test vector
@@ -35,3 +41,91 @@ def test_crc_empty_data():
     computed_crc = crc.compute_crc16(data)
     # CRC of empty string with 0xFFFF init
     assert computed_crc == 0xFFFF
+
+def test_crc_engines_match_bitwise_reference():
+    """
+    All CRC engines must be bit-identical to the reference bit loop.
+    """
+    rng = random.Random(1234)
+    for length in list(range(0, 20)) + [27, 38, 56, 1000]:
+        data = bytes(rng.getrandbits(8) for _ in range(length))
+        expected = crc.compute_crc16_bitwise(data)
+        assert crc.compute_crc16_table(data) == expected
+        assert crc.compute_crc16_slicing8(data) == expected
+        assert crc.compute_crc16(data) == expected
+
+def test_crc_engines_accept_buffers():
+    """
+    The engines should accept bytearray and memoryview inputs.
+    """
+    data = b"Hello, CCSDS!"
+    assert crc.compute_crc16_slicing8(bytearray(data)) == 0x0AFF
+    assert crc.compute_crc16_table(memoryview(data)) == 0x0AFF
+    assert crc.compute_crc16(memoryview(data)) == 0x0AFF
+
+def test_crc16_accumulator_matches_one_shot():
+    """
+    Feeding data in chunks must give the same CRC as one call over the whole buffer.
+    """
+    data = bytes(range(256)) * 3
+    acc = crc.Crc16()
+    view = memoryview(bytearray(data))
+    for start in range(0, len(data), 37):
+        acc.update(view[start:start + 37])
+    assert acc.digest() == crc.compute_crc16(data)
+    assert acc.digest_bytes() == crc.compute_crc16(data).to_bytes(2, 'big')
+
+def test_crc16_accumulator_copy_is_independent():
+    """
+    A copy resumes from the same state without affecting the original.
+    """
+    acc = crc.Crc16(b"Hello, ")
+    branch = acc.copy()
+    branch.update(b"CCSDS!")
+    assert branch.digest() == 0x0AFF
+    assert acc.digest() == crc.compute_crc16(b"Hello, ")
+
+def test_crc16_accumulator_empty():
+    """
+    A fresh accumulator reports the initial register value.
+    """
+    assert crc.Crc16().digest() == 0xFFFF
+
+def test_verify_crc():
+    """
+    verify_crc accepts a packet with a correct trailing CRC and rejects a corrupted one.
+    """
+    packet = crc.append_crc(b"Hello, CCSDS!")
+    assert crc.verify_crc(packet) is True
+    assert crc.verify_crc(b"\x00" + packet[1:]) is False
+    assert crc.verify_crc(b"") is False
+
+def test_compute_crc16_batch_matches_scalar():
+    """
+    The vectorized engine matches compute_crc16 row by row, for odd and even lengths.
+    """
+    rng = np.random.default_rng(7)
+    for length in (0, 1, 2, 25, 54):
+        rows = rng.integers(0, 256, size=(50, length), dtype=np.uint8)
+        result = crc.compute_crc16_batch(rows)
+        assert [int(value) for value in result] == [crc.compute_crc16(row.tobytes()) for row in rows]
+
+def test_verify_crc_batch_flags_corrupted_packets():
+    """
+    verify_crc_batch returns a mask with False only for corrupted packets.
+    """
+    packets = [crc.append_crc(os.urandom(25)) for _ in range(100)]
+    buffer = bytearray(b"".join(packets))
+    buffer[3 * 27 + 5] ^= 0x01  # corrupt packet 3
+    buffer[99 * 27 + 26] ^= 0x80  # corrupt packet 99's CRC
+    mask = crc.verify_crc_batch(bytes(buffer), 27)
+    assert mask.shape == (100,)
+    assert not mask[3] and not mask[99]
+    assert mask.sum() == 98
+
+def test_verify_crc_batch_rejects_ragged_buffer():
+    """
+    A buffer that is not a whole number of packets is an error.
+    """
+    with pytest.raises(ValueError):
+        crc.verify_crc_batch(b"\x00" * 30, 27)
@@ -1,6 +1,9 @@
+import numpy as np
+import pytest
+
 from src.ccsds.encoder import encode_ccsds_packet
-from src.ccsds.decoder import decode_ccsds_packet
-from src.subsystems import cdh
+from src.ccsds.decoder import decode_batch, decode_ccsds_packet
+from src.subsystems import cdh, payload, power
 
 def test_decode_ccsds_packet_cdh():
     # Generate simulated telemetry
@@ -29,3 +32,38 @@ def test_decode_ccsds_packet_cdh():
     assert payload["uptime"] == original_data["uptime"]
     assert payload["software_version"] == original_data["software_version"]
     assert payload["event_flags"] == original_data["event_flags"]
+
+def test_decode_batch_groups_by_apid():
+    # Arrange: interleaved power and payload packets
+    samples = [(name, get_sample()) for _ in range(5) for name, get_sample in
+               (("power", power.get_power_telemetry), ("payload", payload.get_payload_telemetry))]
+    buffer = b"".join(encode_ccsds_packet(name, data, seq) for seq, (name, data) in enumerate(samples))
+
+    # Act
+    batch = decode_batch(buffer)
+
+    # Assert
+    assert set(batch) == {0x02, 0x07}
+    power_records = batch[0x02]
+    assert len(power_records) == 5
+    assert list(power_records["packet_seq_ctrl"] & 0x3FFF) == [0, 2, 4, 6, 8]
+    assert list(power_records["packet_id"] & 0x07FF) == [0x02] * 5
+    expected = [data["bus_voltage"] for name, data in samples if name == "power"]
+    assert np.allclose(power_records["bus_voltage"], expected, atol=1e-4)
+    assert list(batch[0x07]["payload_mode"]) == [data["payload_mode"] for name, data in samples if name == "payload"]
+
+def test_decode_batch_matches_scalar_decoder():
+    packet = encode_ccsds_packet("cdh", cdh.get_cdh_telemetry(), 9)
+    record = decode_batch(packet * 3)[0x01]
+    scalar = decode_ccsds_packet(packet)
+
+    assert len(record) == 3
+    for field, value in scalar["payload"].items():
+        assert record[field][0] == pytest.approx(value)
+    assert int(record["cuc_time"][0]) == int.from_bytes(packet[6:10], "big")
+    assert int(record["crc"][0]) == int.from_bytes(packet[-2:], "big")
+
+def test_decode_batch_rejects_truncated_buffer():
+    packet = encode_ccsds_packet("cdh", cdh.get_cdh_telemetry(), 1)
+    with pytest.raises(ValueError):
+        decode_batch(packet + packet[:10])
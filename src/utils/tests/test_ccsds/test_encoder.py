@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
-from src.ccsds.encoder import encode_ccsds_packet
-from src.subsystems import cdh
-from src.ccsds import apid
+from src.ccsds.encoder import encode_batch, encode_ccsds_packet, encode_ccsds_packet_into, packet_length
+from src.ccsds.decoder import decode_ccsds_packet
+from src.subsystems import cdh, payload, power
+from src.ccsds import apid, crc, schema, time
 
 def test_encode_cdh_packet_length_and_structure():
     # Arrange
@@ -36,3 +38,78 @@ def test_encode_cdh_packet_length_and_structure():
     seq_bits = int.from_bytes(header[2:4], byteorder="big")
     extracted_seq_count = seq_bits & 0x3FFF
     assert extracted_seq_count == seq_count
+
+def test_encode_packet_into_back_to_back():
+    # Arrange: several packets written into one shared buffer
+
+    samples = [("power", power.get_power_telemetry()), ("payload", payload.get_payload_telemetry())] * 3
+    buf = bytearray(sum(packet_length(name) for name, _ in samples))
+
+    # Act
+    offset = 0
+    for seq_count, (name, data) in enumerate(samples):
+        offset += encode_ccsds_packet_into(buf, offset, name, data, seq_count)
+
+    # Assert: the buffer is filled exactly and every packet decodes with a valid CRC
+    assert offset == len(buf)
+    offset = 0
+    for seq_count, (name, data) in enumerate(samples):
+        size = packet_length(name)
+        packet = bytes(buf[offset:offset + size])
+        assert crc.verify_crc(packet)
+        decoded = decode_ccsds_packet(packet)
+        assert decoded["primary"]["apid"] == apid.get_apid(name)
+        assert decoded["primary"]["seq_count"] == seq_count
+        offset += size
+
+def test_encode_packet_into_matches_encode_packet_layout():
+    data = cdh.get_cdh_telemetry()
+    packet = encode_ccsds_packet("cdh", data, 7)
+    buf = bytearray(len(packet) + 3)
+    written = encode_ccsds_packet_into(memoryview(buf), 3, "cdh", data, 7)
+
+    assert written == len(packet)
+    # Everything but the CUC time (bytes 6-9) and the CRC must be identical
+    assert buf[3:9] == packet[:6]
+    assert buf[13:3 + written - 2] == packet[10:-2]
+
+def test_encode_packet_into_rejects_small_buffer():
+    with pytest.raises(ValueError):
+        encode_ccsds_packet_into(bytearray(20), 0, "cdh", cdh.get_cdh_telemetry(), 0)
+
+def test_encode_batch_matches_single_packet_encoder():
+    # Arrange: 20 power samples as columns
+    samples = [power.get_power_telemetry() for _ in range(20)]
+    fields = schema.get_schema_for_subsystem("power").fields
+    columns = {name: np.array([sample[name] for sample in samples]) for name in fields}
+    timestamps = [1_800_000_000.5 + i for i in range(20)]
+
+    # Act
+    batch = encode_batch("power", columns, seq_start=16380, timestamps=timestamps)
+
+    # Assert: every packet matches encode_ccsds_packet apart from the CUC time and CRC
+    size = packet_length("power")
+    assert len(batch) == 20 * size
+    assert crc.verify_crc_batch(batch, size).all()
+    for i, sample in enumerate(samples):
+        packet = batch[i * size:(i + 1) * size]
+        reference = encode_ccsds_packet("power", sample, 16380 + i)
+        assert packet[:6] == reference[:6]
+        assert packet[10:-2] == reference[10:-2]
+        assert packet[6:10] == int(time.encode_cuc_array(timestamps[i])).to_bytes(4, "big")
+
+def test_encode_batch_accepts_lists_and_wraps_sequence():
+    fields = schema.get_schema_for_subsystem("payload").fields
+    columns = {name: [1, 2, 3] for name in fields}
+    batch = encode_batch("payload", columns, seq_start=16383)
+
+    decoded = [decode_ccsds_packet(batch[i * 27:(i + 1) * 27]) for i in range(3)]
+    assert [packet["primary"]["seq_count"] for packet in decoded] == [16383, 0, 1]
+    assert [packet["payload"]["image_capture_count"] for packet in decoded] == [1, 2, 3]
+
+def test_encode_batch_rejects_bad_columns():
+    fields = schema.get_schema_for_subsystem("payload").fields
+    with pytest.raises(ValueError):
+        encode_batch("payload", {name: [1] for name in fields[1:]})
+    with pytest.raises(ValueError):
+        encode_batch("payload", {name: [1] * (2 if name == fields[0] else 1) for name in fields})
@@ -0,0 +1,119 @@
+# Test module for TM Transfer Frames
+# These tests check the frame header layout and that packets survive multiplexing, including packets
+# that span frames, idle fill and lost or corrupted frames.
+import pytest
+
+from src.ccsds import frame
+from src.ccsds.crc import verify_crc
+from src.ccsds.encoder import encode_ccsds_packet
+from src.ccsds.packet_view import PacketView
+from src.subsystems import adcs, payload, power
+
+def make_packets(count):
+    sources = [("adcs", adcs.get_adcs_telemetry), ("power", power.get_power_telemetry), ("payload", payload.get_payload_telemetry)]
+    return [encode_ccsds_packet(name, source(), index) for index in range(count) for name, source in sources]
+
+def test_frame_header_round_trip():
+    header = frame.encode_frame_header(0x2A5, 5, 300, 7, 0x123)
+    assert len(header) == frame.FRAME_HEADER_LEN
+    assert frame.decode_frame_header(header) == {
+        "version": 0, "spacecraft_id": 0x2A5, "vcid": 5, "ocf_flag": 0,
+        "master_count": 300 & 0xFF, "vc_count": 7, "sync_flag": 0, "fhp": 0x123,
+    }
+
+def test_idle_packet_layout():
+    idle = frame.encode_idle_packet(20, 3)
+    view = PacketView(idle)
+    assert len(idle) == 20 == view.packet_size
+    assert view.apid == 0x7FF and view.seq_count == 3
+    assert verify_crc(idle)
+    with pytest.raises(ValueError):
+        frame.encode_idle_packet(frame.MIN_IDLE_PACKET - 1)
+
+def test_round_trip_across_frame_boundaries():
+    packets = make_packets(100)
+    mux = frame.FrameMultiplexer(spacecraft_id=42)
+    frames = []
+    for packet in packets:
+        frames.extend(mux.add_packet(packet))
+    frames.extend(mux.flush())
+
+    assert all(len(f) == frame.DEFAULT_FRAME_LENGTH and verify_crc(f) for f in frames)
+    assert len(frames) * 10 < len(packets)  # many packets per datagram
+    assert [frame.decode_frame_header(f)["master_count"] for f in frames] == list(range(len(frames)))
+    assert mux.pending() == 0
+
+    demux = frame.FrameDemultiplexer(spacecraft_id=42)
+    received = [packet for f in frames for packet in demux.feed(f)]
+    assert received == packets
+    assert demux.idle_packets == 1 and demux.dropped_bytes == 0
+
+def test_first_header_pointer():
+    mux = frame.FrameMultiplexer(frame_length=100)  # 92-byte data field
+    adcs_packet = make_packets(1)[0]  # 56 bytes
+    assert mux.add_packet(adcs_packet) == []
+    first, = mux.add_packet(adcs_packet)  # second packet starts at 56 and spills over
+    assert frame.decode_frame_header(first)["fhp"] == 0
+    assert mux.add_packet(adcs_packet) == []
+    second, = mux.add_packet(adcs_packet)
+    # Frame 2 starts with the 20-byte tail of packet 2; packet 3 starts right after it
+    assert frame.decode_frame_header(second)["fhp"] == 20
+
+def test_frame_without_packet_start():
+    mux = frame.FrameMultiplexer(frame_length=30)  # 22-byte data field, smaller than any packet
+    frames = mux.add_packet(make_packets(1)[0])  # 56 bytes -> 2 full frames, 12 bytes pending
+    assert [frame.decode_frame_header(f)["fhp"] for f in frames] == [0, frame.FHP_NO_PACKET_START]
+
+def test_small_gap_idle_packet_spans_frames():
+    mux = frame.FrameMultiplexer(frame_length=68)  # 60-byte data field
+    adcs_packet = make_packets(1)[0]
+    assert mux.add_packet(adcs_packet) == []  # 56 bytes pending
+    frames = mux.flush()  # a 4-byte gap cannot hold an idle packet, so it runs into another frame
+    assert len(frames) == 2
+    assert frame.decode_frame_header(frames[1])["fhp"] == frame.FHP_NO_PACKET_START
+    demux = frame.FrameDemultiplexer()
+    assert [packet for f in frames for packet in demux.feed(f)] == [adcs_packet]
+    assert demux.idle_packets == 1
+
+def test_virtual_channels_are_independent():
+    packets = make_packets(40)
+    mux = frame.FrameMultiplexer()
+    frames = []
+    for index, packet in enumerate(packets):
+        frames.extend(mux.add_packet(packet, vcid=index % 2))
+    frames.extend(mux.flush())
+    assert {frame.decode_frame_header(f)["vcid"] for f in frames} == {0, 1}
+
+    demux = frame.FrameDemultiplexer()
+    received = [packet for f in frames for packet in demux.feed(f)]
+    assert sorted(received) == sorted(packets)
+    assert [p for p in received if p in packets[0::2]] == packets[0::2]
+
+def test_resync_after_lost_and_corrupted_frames():
+    packets = make_packets(200)
+    mux = frame.FrameMultiplexer()
+    frames = [f for packet in packets for f in mux.add_packet(packet)] + mux.flush()
+
+    corrupted = bytearray(frames[5])
+    corrupted[100] ^= 0xFF
+    damaged = frames[:2] + frames[3:5] + [bytes(corrupted)] + frames[6:]
+
+    demux = frame.FrameDemultiplexer()
+    received = [packet for f in damaged for packet in demux.feed(f)]
+    assert demux.bad_frames == 1
+    assert demux.lost_frames == 2  # frame 2 missing, and frame 5 discarded
+    assert demux.dropped_bytes > 0
+    # Every packet that did come through is intact and in order
+    assert all(verify_crc(packet) for packet in received)
+    indices = [packets.index(packet) for packet in received]
+    assert indices == sorted(indices)
+    assert received[-1] == packets[-1]
+    assert len(received) > len(packets) - 6 * 35
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        frame.FrameMultiplexer(frame_length=2100)
+    with pytest.raises(ValueError):
+        frame.FrameMultiplexer(spacecraft_id=1024)
+    with pytest.raises(ValueError):
+        frame.FrameMultiplexer().add_packet(b"\x00" * 10, vcid=8)
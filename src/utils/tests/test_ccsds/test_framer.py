@@ -0,0 +1,80 @@
+# Test module for the byte-stream PacketFramer
+# These tests feed concatenated packets in arbitrary chunks and check delimiting, zero-copy views and resync.
+import random
+
+import pytest
+
+from src.ccsds import framer
+from src.ccsds.encoder import encode_ccsds_packet
+from src.ccsds.frame import encode_idle_packet
+from src.ccsds.framer import PacketFramer
+from src.subsystems import adcs, payload, power
+
+def make_packets(count):
+    sources = [("adcs", adcs.get_adcs_telemetry), ("power", power.get_power_telemetry), ("payload", payload.get_payload_telemetry)]
+    return [encode_ccsds_packet(name, source(), index, spacecraft_id=index % 3) for index in range(count) for name, source in sources]
+
+def feed_all(packet_framer, stream, chunk_sizes):
+    out = []
+    offset = 0
+    for size in chunk_sizes:
+        out.extend(bytes(packet) for packet in packet_framer.feed(stream[offset:offset + size]))
+        offset += size
+    out.extend(bytes(packet) for packet in packet_framer.feed(stream[offset:]))
+    return out
+
+@pytest.mark.parametrize("max_chunk", [1, 7, 100, 5000, 50_000])
+def test_arbitrary_chunking(max_chunk):
+    packets = make_packets(400)
+    stream = b"".join(packets)
+    rng = random.Random(max_chunk)
+    chunk_sizes = [rng.randint(1, max_chunk) for _ in range(len(stream) // max(1, max_chunk // 2))]
+    packet_framer = PacketFramer()
+    assert feed_all(packet_framer, stream, chunk_sizes) == packets
+    assert packet_framer.dropped_bytes == 0 and packet_framer.pending == 0
+    assert packet_framer.packets == len(packets)
+
+def test_packets_inside_a_chunk_are_not_copied():
+    packets = make_packets(10)
+    chunk = bytearray(b"".join(packets))
+    views = PacketFramer().feed(chunk)
+    assert [bytes(view) for view in views] == packets
+    chunk[0] ^= 0xFF  # the views share memory with the chunk
+    assert views[0][0] == chunk[0]
+
+def test_idle_packets_are_skipped():
+    packets = make_packets(5)
+    stream = packets[0] + encode_idle_packet(30) + b"".join(packets[1:])
+    packet_framer = PacketFramer()
+    assert [bytes(packet) for packet in packet_framer.feed(stream)] == packets
+    assert packet_framer.idle_packets == 1
+
+@pytest.mark.parametrize("fast_walk_min", [framer.FAST_WALK_MIN, 10**9])
+def test_resync_after_corruption(monkeypatch, fast_walk_min):
+    # Both the vectorized and the byte-by-byte walk must recover the same way
+    monkeypatch.setattr(framer, "FAST_WALK_MIN", fast_walk_min)
+    packets = make_packets(300)
+    stream = bytearray(b"".join(packets))
+    offsets = [0]
+    for packet in packets:
+        offsets.append(offsets[-1] + len(packet))
+
+    stream[offsets[10] + 20] ^= 0x01  # payload bit flip: CRC failure
+    stream[offsets[500]:offsets[500] + 3] = b"\xff\xff\xff"  # header damage
+    garbage = b"\x08\x01\x00\x00\x00\x30" + bytes(range(40))  # looks like a header, wrong length
+    damaged = bytes(stream[:offsets[700]]) + garbage + bytes(stream[offsets[700]:])
+
+    packet_framer = PacketFramer()
+    received = feed_all(packet_framer, damaged, [4096] * (len(damaged) // 4096))
+    expected = [packet for index, packet in enumerate(packets) if index not in (10, 500)]
+    assert received == expected
+    assert packet_framer.crc_errors >= 1
+    assert packet_framer.dropped_bytes == len(packets[10]) + len(packets[500]) + len(garbage)
+
+def test_truncated_tail_stays_pending():
+    packets = make_packets(3)
+    stream = b"".join(packets)
+    packet_framer = PacketFramer()
+    assert [bytes(packet) for packet in packet_framer.feed(stream[:-10])] == packets[:-1]
+    assert packet_framer.pending == len(packets[-1]) - 10
+    assert [bytes(packet) for packet in packet_framer.feed(stream[-10:])] == packets[-1:]
@@ -0,0 +1,46 @@
+# Test module for the lazy PacketView
+# These tests check that the view agrees with the eager decoder and only decodes on demand.
+import pytest
+
+from src.ccsds.decoder import decode_ccsds_packet
+from src.ccsds.encoder import encode_ccsds_packet
+from src.ccsds.packet_view import PacketView
+from src.subsystems import adcs, power
+
+def test_view_matches_eager_decoder():
+    packet = encode_ccsds_packet("adcs", adcs.get_adcs_telemetry(), 321)
+    view = PacketView(packet)
+    assert view.to_dict() == decode_ccsds_packet(packet)
+    assert view.subsystem == "adcs"
+    assert view.packet_size == len(packet)
+    assert view.verify_crc() is True
+
+def test_header_access_does_not_touch_payload():
+    packet = bytearray(encode_ccsds_packet("power", power.get_power_telemetry(), 17))
+    view = PacketView(packet)
+    assert view.apid == 0x02
+    assert view.seq_count == 17
+    # Nothing beyond the primary header has been decoded yet
+    assert view._cuc is None and view._payload is None and view._fields is None
+
+def test_single_field_access_is_cached():
+    data = power.get_power_telemetry()
+    view = PacketView(memoryview(encode_ccsds_packet("power", data, 1)))
+    assert view["battery_voltage"] == pytest.approx(data["battery_voltage"], abs=1e-4)
+    assert view["eps_mode"] == data["eps_mode"]
+    assert set(view._fields) == {"battery_voltage", "eps_mode"}
+    assert view._payload is None
+
+def test_view_does_not_copy():
+    buffer = bytearray(encode_ccsds_packet("power", power.get_power_telemetry(), 1))
+    view = PacketView(buffer)
+    buffer[3] = 99  # sequence count low byte, changed before the header is read
+    assert view.seq_count == 99
+
+def test_invalid_packets_raise():
+    with pytest.raises(ValueError):
+        PacketView(b"\x08").apid
+    with pytest.raises(ValueError):
+        PacketView(encode_ccsds_packet("power", power.get_power_telemetry(), 1)[:-3]).payload
+    with pytest.raises(KeyError):
+        PacketView(encode_ccsds_packet("power", power.get_power_telemetry(), 1))["quat_w"]
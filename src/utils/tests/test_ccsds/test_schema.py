@@ -0,0 +1,73 @@
+# Test module for the payload schema registry
+# These tests check that the registry is consistent with apid.py and that pack/unpack round-trip.
+import pytest
+
+from src.ccsds import apid, schema
+
+def test_registry_covers_every_apid():
+    """
+    Every APID in apid.py has exactly one schema, reachable by APID and by name.
+    """
+    assert set(schema.SCHEMAS) == set(apid.get_apid_list())
+    for subsystem, apid_value in apid.get_all_apids().items():
+        assert schema.get_schema(apid_value) is schema.get_schema_for_subsystem(subsystem)
+        assert schema.get_schema(apid_value).subsystem == subsystem
+
+def test_payload_lengths_derived_from_formats():
+    """
+    PAYLOAD_LENGTHS matches the documented payload sizes.
+    """
+    assert schema.PAYLOAD_LENGTHS == {
+        0x01: 26,  # CDH
+        0x02: 34,  # Power
+        0x03: 28,  # Comms
+        0x04: 17,  # Thermal
+        0x05: 44,  # ADCS
+        0x06: 30,  # Propulsion
+        0x07: 15,  # Payload
+    }
+    assert schema.PACKET_LENGTHS[0x07] == 27
+    assert schema.PACKET_LENGTHS[0x05] == 56
+
+def test_field_count_matches_format():
+    """
+    Each schema has one type code per field name.
+    """
+    for packet_schema in schema.SCHEMAS.values():
+        assert len(packet_schema.fields) == len(packet_schema.codes)
+        assert len(set(packet_schema.fields)) == len(packet_schema.fields)
+
+def test_pack_normalizes_and_round_trips():
+    """
+    Values are normalized to the field type before packing and unpack restores them.
+    """
+    payload_schema = schema.get_schema_for_subsystem("payload")
+    data = {
+        "camera_status": 1,
+        "spectrometer_status": 0,
+        "image_capture_count": 512.0,  # float for an int field is normalized
+        "last_image_quality": 87,
+        "spectrometer_last_wavelength": 550,  # int for a float field is normalized
+        "spectrometer_last_intensity": 0.25,
+        "payload_mode": 2,
+        "payload_fault_flags": 0,
+    }
+    packed = payload_schema.pack(data)
+    assert len(packed) == payload_schema.size
+    assert payload_schema.unpack(packed) == {**data, "image_capture_count": 512, "spectrometer_last_wavelength": 550.0}
+
+def test_unknown_lookups_raise():
+    with pytest.raises(ValueError):
+        schema.get_schema(0x08)  # subsystem APID 0 does not exist on any spacecraft
+    with pytest.raises(ValueError):
+        schema.get_schema(0x7FF)  # idle packets have no payload schema
+    assert schema.find_schema(0x7FF) is None
+    with pytest.raises(ValueError):
+        schema.get_schema_for_subsystem("unknown")
+
+def test_fleet_apids_resolve_to_subsystem_schema():
+    """
+    APIDs of other spacecraft in a fleet use their subsystem's schema.
+    """
+    assert schema.get_schema(apid.make_apid("power", 12)) is schema.get_schema(0x02)
+    assert schema.get_schema(apid.make_apid("payload", 254)).subsystem == "payload"
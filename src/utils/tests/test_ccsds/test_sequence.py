@@ -0,0 +1,83 @@
+# Test module for the per-APID sequence tracker
+# Covers wraparound at 16384, gaps, duplicates, late (reordered) packets and the loss statistics.
+import pytest
+
+from src.ccsds import sequence
+from src.ccsds.sequence import SequenceTracker
+
+def test_in_order_across_wraparound():
+    tracker = SequenceTracker()
+    results = [tracker.update(0x02, seq % 16384) for seq in range(16380, 16390)]
+    assert results[0] == sequence.FIRST
+    assert set(results[1:]) == {sequence.IN_ORDER}
+    assert tracker.stats(0x02)["lost"] == 0
+    assert tracker.loss_rate() == 0.0
+
+def test_gap_across_wraparound_and_histogram():
+    tracker = SequenceTracker()
+    tracker.update(0x05, 16382)
+    assert tracker.update(0x05, 1) == sequence.GAP  # 16383 and 0 missing
+    assert tracker.update(0x05, 7) == sequence.GAP  # 2..6 missing
+    stats = tracker.stats(0x05)
+    assert stats["lost"] == 7 and stats["gaps"] == 2 and stats["received"] == 3
+    assert tracker.loss_rate(0x05) == pytest.approx(7 / 10)
+    assert tracker.gap_histogram() == {"2-3": 1, "4-7": 1}
+
+def test_duplicate_reordered_and_stale():
+    tracker = SequenceTracker(window=16)
+    for seq in (0, 1, 3, 4):
+        tracker.update(0x01, seq)
+    assert tracker.update(0x01, 4) == sequence.DUPLICATE
+    assert tracker.update(0x01, 2) == sequence.REORDERED  # late, no longer lost
+    assert tracker.update(0x01, 2) == sequence.DUPLICATE
+    stats = tracker.stats(0x01)
+    assert stats["lost"] == 0 and stats["reordered"] == 1 and stats["duplicates"] == 2
+
+    for seq in range(5, 40):
+        tracker.update(0x01, seq)
+    assert tracker.update(0x01, 10) == sequence.STALE  # 29 behind, outside the 16-count window
+    assert tracker.stats(0x01)["stale"] == 1
+
+def test_apids_are_independent():
+    tracker = SequenceTracker()
+    tracker.update(0x01, 0)
+    tracker.update(0x09, 100)
+    assert tracker.update(0x01, 1) == sequence.IN_ORDER
+    assert tracker.update(0x09, 104) == sequence.GAP
+    assert tracker.apids() == [0x01, 0x09]
+    assert tracker.stats()["lost"] == 3
+    tracker.reset(0x09)
+    assert tracker.apids() == [0x01]
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        SequenceTracker(window=0)
+
+def test_count_before_first_is_stale():
+    tracker = SequenceTracker()
+    tracker.update(0x02, 10)
+    assert tracker.update(0x02, 5) == sequence.STALE  # before the first count seen: unknown, not a late packet
+    assert tracker.update(0x02, 4) == sequence.STALE
+    assert tracker.update(0x02, 12) == sequence.GAP
+    assert tracker.update(0x02, 11) == sequence.REORDERED
+    stats = tracker.stats(0x02)
+    assert stats["lost"] == 0 and stats["stale"] == 2
+    assert tracker.loss_rate() == 0.0
+
+def test_transmitter_restart():
+    tracker = SequenceTracker()
+    for seq in range(500):
+        tracker.update(0x03, seq)
+    assert tracker.update(0x03, 0) == sequence.RESTART
+    results = [tracker.update(0x03, seq) for seq in range(1, 100)]
+    assert set(results) == {sequence.IN_ORDER}
+    stats = tracker.stats(0x03)
+    assert stats["received"] == 600 and stats["duplicates"] == 0 and stats["restarts"] == 1
+    assert stats["lost"] == 0
+
+    # A late duplicate of 0 right after the counter wrapped is still a duplicate
+    for seq in range(16380, 16384):
+        tracker.update(0x04, seq)
+    for seq in range(4):
+        tracker.update(0x04, seq)
+    assert tracker.update(0x04, 0) == sequence.DUPLICATE
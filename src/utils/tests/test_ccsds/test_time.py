@@ -1,3 +1,6 @@
+from datetime import datetime
+
+import numpy as np
 import pytest
 from src.ccsds import time as cuc_time
 
@@ -37,3 +40,45 @@ def test_pretty_print(capfd):
     assert "Coarse Time" in out
     assert "Fine Time" in out
     assert "Total Time" in out
+
+def test_cuc_round_trip_to_current_time():
+    """
+    Decoding a freshly encoded CUC gives the current time, even after coarse rollover.
+    """
+    before = datetime.now()
+    coarse, fine = cuc_time.decode_cuc_time(cuc_time.encode_cuc_time())
+    decoded = cuc_time.cuc_to_datetime(coarse, fine)
+    assert abs((decoded - before).total_seconds()) < 1.0
+
+def test_resolve_coarse_picks_nearest_rollover():
+    """
+    The same coarse value maps to different absolute times depending on the reference.
+    """
+    start = cuc_time.MISSION_START_TIMESTAMP
+    assert cuc_time.resolve_coarse(100, reference=start + 100) == 100
+    later = start + 3 * cuc_time.COARSE_ROLLOVER + 90
+    assert cuc_time.resolve_coarse(100, reference=later) == 3 * cuc_time.COARSE_ROLLOVER + 100
+    # Packets from just before a rollover, received just after it
+    assert cuc_time.resolve_coarse(cuc_time.COARSE_ROLLOVER - 1, reference=start + cuc_time.COARSE_ROLLOVER + 1) == cuc_time.COARSE_ROLLOVER - 1
+
+def test_cuc_to_iso_matches_datetime_isoformat():
+    """
+    The cached ISO formatting is identical to datetime.isoformat().
+    """
+    reference = cuc_time.MISSION_START_TIMESTAMP + 5000
+    for coarse, fine in [(4000, 0), (4000, 1), (4000, 128), (4001, 255)]:
+        expected = cuc_time.cuc_to_datetime(coarse, fine, reference).isoformat()
+        assert cuc_time.cuc_to_iso(coarse, fine, reference) == expected
+    assert cuc_time.cuc_to_iso(4000, 0, reference) == "2024-10-19T12:17:51"
+
+def test_cuc_to_datetime64_matches_scalar():
+    """
+    The vectorized conversion agrees with the scalar one element by element.
+    """
+    reference = cuc_time.MISSION_START_TIMESTAMP + 2 * cuc_time.COARSE_ROLLOVER + 10
+    words = np.array([(coarse << 8) | fine for coarse, fine in [(0, 0), (5, 64), (cuc_time.COARSE_ROLLOVER - 1, 255)]])
+    result = cuc_time.cuc_to_datetime64(words, reference)
+    assert result.dtype == np.dtype("datetime64[us]")
+    for word, value in zip(words, result):
+        coarse, fine = cuc_time.split_cuc_word(int(word))
+        assert value.astype(datetime) == cuc_time.cuc_to_datetime(coarse, fine, reference)
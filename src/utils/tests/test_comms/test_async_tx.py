@@ -0,0 +1,43 @@
+# Test module for the asyncio transmitter
+# Packets are sent to a local UDP socket; a deliberately slow provider must not delay the others.
+import asyncio
+import socket
+import time
+
+from src.ccsds.packet_view import PacketView
+from src.comms.async_tx import transmit_packets_async
+from src.subsystems import payload, power
+
+def slow_power_telemetry():
+    time.sleep(0.4)  # blocking provider, e.g. psutil on a loaded system
+    return power.get_power_telemetry()
+
+def test_slow_blocking_provider_does_not_delay_others():
+    ground = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    ground.bind(("127.0.0.1", 0))
+    ground.setblocking(False)
+    port = ground.getsockname()[1]
+
+    try:
+        stats = asyncio.run(transmit_packets_async(
+            "127.0.0.1", port,
+            schedule={"payload": 20, "power": 5},
+            providers={"payload": payload.get_payload_telemetry, "power": slow_power_telemetry},
+            blocking={"power"},
+            duration=1.0,
+        ))
+
+        received = []
+        while True:
+            try:
+                received.append(PacketView(ground.recv(2048)).subsystem)
+            except BlockingIOError:
+                break
+    finally:
+        ground.close()
+
+    # payload kept its 20 Hz schedule (deadlines at 0, 0.05, ... 1.0) despite power blocking for 0.4 s
+    assert received.count("payload") >= 18
+    assert stats["payload"]["skipped"] == 0
+    # power is limited by its own provider only
+    assert 1 <= received.count("power") <= 3
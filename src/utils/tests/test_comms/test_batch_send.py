@@ -0,0 +1,58 @@
+# Test module for the batched UDP sender
+# Batches must arrive as separate datagrams, in order, with fewer syscalls than packets when sendmmsg is available.
+import socket
+
+import pytest
+
+from src.comms.batch_send import HAVE_SENDMMSG, MIN_SENDMMSG_BATCH, BatchSender
+
+@pytest.fixture
+def ground():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+def make_packets(count):
+    # Mixed buffer types and lengths, as produced by the encoders
+    packets = []
+    for index in range(count):
+        data = bytes([index]) * (10 + index % 7)
+        packets.append((data, bytearray(data), memoryview(data))[index % 3])
+    return packets
+
+@pytest.mark.parametrize("use_sendmmsg", [False, pytest.param(True, marks=pytest.mark.skipif(not HAVE_SENDMMSG, reason="sendmmsg not available"))])
+def test_every_packet_is_its_own_datagram(ground, use_sendmmsg):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender = BatchSender(sock, ground.getsockname(), max_batch=MIN_SENDMMSG_BATCH * 2, use_sendmmsg=use_sendmmsg)
+    packets = make_packets(MIN_SENDMMSG_BATCH * 5 + 3)
+    try:
+        assert sender.send(packets) == len(packets)
+    finally:
+        sock.close()
+
+    assert [ground.recv(2048) for _ in packets] == [bytes(packet) for packet in packets]
+    assert sender.packets_sent == len(packets)
+    if use_sendmmsg:
+        # One sendmmsg per chunk of max_batch packets
+        assert sender.syscalls == 3
+    else:
+        assert sender.syscalls == len(packets)
+
+@pytest.mark.skipif(not HAVE_SENDMMSG, reason="sendmmsg not available")
+def test_connected_socket(ground):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(ground.getsockname())
+    sender = BatchSender(sock)
+    packets = make_packets(MIN_SENDMMSG_BATCH)
+    try:
+        sender.send(packets)
+    finally:
+        sock.close()
+    assert sender.syscalls == 1
+    assert [ground.recv(2048) for _ in packets] == [bytes(packet) for packet in packets]
+
+def test_invalid_batch_size():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock, pytest.raises(ValueError):
+        BatchSender(sock, ("127.0.0.1", 9), max_batch=0)
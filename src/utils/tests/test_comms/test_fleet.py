@@ -0,0 +1,71 @@
+# Test module for the multi-spacecraft fleet simulator
+# A small fleet sends to a local UDP socket; packets must carry distinct spacecraft APIDs and per-stream counters.
+import socket
+from collections import defaultdict
+
+import pytest
+
+from src.ccsds.packet_view import PacketView
+from src.comms.fleet import fleet_rate, run_fleet, run_spacecraft_shard, shard_spacecraft
+
+def drain(ground):
+    packets = []
+    while True:
+        try:
+            packets.append(PacketView(ground.recv(2048)))
+        except BlockingIOError:
+            return packets
+
+def make_ground():
+    ground = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    ground.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    ground.bind(("127.0.0.1", 0))
+    ground.setblocking(False)
+    return ground
+
+def test_shard_spacecraft_round_robin():
+    assert shard_spacecraft(5, 2) == [[0, 2, 4], [1, 3]]
+    assert shard_spacecraft(2, 4) == [[0], [1]]
+    assert sum(len(shard) for shard in shard_spacecraft(300, 7)) == 300
+
+def test_shard_has_independent_sequence_counters():
+    ground = make_ground()
+    try:
+        result = run_spacecraft_shard([3, 9], "127.0.0.1", ground.getsockname()[1],
+                                      duration=0.6, schedule={"payload": 10, "power": 5})
+        packets = drain(ground)
+    finally:
+        ground.close()
+
+    assert result["sent"] == len(packets) > 0
+    counts = defaultdict(list)
+    for packet in packets:
+        counts[packet.apid].append(packet.seq_count)
+    # One APID per (spacecraft, subsystem), each counting from zero on its own
+    assert set(counts) == {3 * 8 + 0x07, 3 * 8 + 0x02, 9 * 8 + 0x07, 9 * 8 + 0x02}
+    for seq_counts in counts.values():
+        assert seq_counts == list(range(len(seq_counts)))
+    assert {packet.spacecraft_id for packet in packets} == {3, 9}
+
+def test_run_fleet_across_processes():
+    ground = make_ground()
+    try:
+        results = run_fleet(4, workers=2, rate=fleet_rate(4) * 4, duration=0.5,
+                            ip="127.0.0.1", port=ground.getsockname()[1], report=False)
+        packets = drain(ground)
+    finally:
+        ground.close()
+
+    assert len(results) == 2
+    assert len({result["pid"] for result in results}) == 2
+    assert sum(result["sent"] for result in results) == len(packets)
+    assert {packet.spacecraft_id for packet in packets} == {0, 1, 2, 3}
+    assert all(packet.verify_crc() for packet in packets)
+
+def test_run_fleet_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        run_fleet(0)
+    with pytest.raises(ValueError):
+        run_fleet(1000)
+    with pytest.raises(ValueError):
+        run_fleet(2, rate=0)
@@ -0,0 +1,75 @@
+# Test module for latency instrumentation
+# Trailers round-trip without changing the packet; histogram percentiles stay within one bucket.
+import socket
+
+import pytest
+
+from src.ccsds import encoder
+from src.ccsds.packet_view import PacketView
+from src.comms import latency
+from src.comms.latency import LatencyHistogram, LatencyRecorder, append_trailer, split_trailer
+from src.comms.ring import PacketRing
+from src.subsystems import thermal
+
+def test_trailer_round_trip():
+    packet = encoder.encode_ccsds_packet("thermal", thermal.get_thermal_telemetry(), 3)
+    datagram = append_trailer(packet, 123456789)
+    assert len(datagram) == len(packet) + latency.TRAILER_LEN
+
+    stripped, tx_ns = split_trailer(datagram)
+    assert tx_ns == 123456789
+    assert bytes(stripped) == packet
+    assert PacketView(stripped).payload == PacketView(packet).payload
+
+def test_datagram_without_trailer_is_unchanged():
+    packet = encoder.encode_ccsds_packet("thermal", thermal.get_thermal_telemetry(), 3)
+    stripped, tx_ns = split_trailer(packet)
+    assert tx_ns is None and bytes(stripped) == packet
+    assert split_trailer(b"\x01\x02")[1] is None
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value * 1000)  # 1 us .. 10 ms
+    assert histogram.count == 10000 and histogram.max == 10_000_000
+    for fraction in (0.5, 0.99, 0.999):
+        exact = fraction * 10_000_000
+        # Upper bucket edge: never below the exact value, at most one sub-bucket (1/16) above
+        assert exact <= histogram.percentile(fraction) <= exact * (1 + 1 / latency.SUB_BUCKETS)
+    assert histogram.percentile(1.0) == 10_000_000
+    assert LatencyHistogram().percentile(0.5) == 0
+
+def test_small_and_huge_values():
+    histogram = LatencyHistogram()
+    histogram.record(0)
+    histogram.record(7)
+    histogram.record(latency.MAX_TRACKED_NS * 4)
+    assert histogram.percentile(0.3) == 0
+    assert histogram.percentile(0.6) == 7
+    assert histogram.percentile(1.0) == latency.MAX_TRACKED_NS * 4
+
+def test_recorder_report():
+    recorder = LatencyRecorder(stages=("receive", "decode"))
+    for tx_ns in range(100):
+        recorder.record("receive", tx_ns, tx_ns + 2_000)
+        recorder.record("decode", tx_ns, tx_ns + 50_000)
+    report = recorder.report()
+    assert report["receive"]["count"] == 100
+    assert report["receive"]["p50_us"] == pytest.approx(2.0, rel=1 / 16)
+    assert report["decode"]["p999_us"] == pytest.approx(50.0, rel=1 / 16)
+    with pytest.raises(KeyError):
+        recorder.record("emit", 0)
+
+def test_ring_records_receive_time():
+    receiver, sender = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    ring = PacketRing(slots=4, slot_size=64, timestamps=True)
+    before = latency.clock_ns()
+    sender.send(b"abc")
+    ring.recv_into_slot(receiver)
+    data, _ = ring.get(timeout=1)
+    assert bytes(data) == b"abc"
+    assert before <= ring.received_ns() <= latency.clock_ns()
+    ring.release()
+    assert PacketRing(slots=1).received_ns() is None
+    receiver.close()
+    sender.close()
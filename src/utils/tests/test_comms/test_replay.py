@@ -0,0 +1,88 @@
+# Test module for the replay engine
+# Pacing follows the packets' CUC time scaled by the speed factor; max speed flushes full batches.
+import numpy as np
+import pytest
+
+from src.ccsds import schema
+from src.ccsds.encoder import encode_batch
+from src.ccsds.time import MISSION_START_TIMESTAMP
+from src.comms.replay import iter_archive, iter_capture, replay
+from src.storage.archive import ArchiveWriter
+
+def power_packets(count, spacing):
+    columns = {name: np.zeros(count) for name in schema.POWER_FIELDS}
+    timestamps = MISSION_START_TIMESTAMP + 1000 + np.arange(count) * spacing
+    buffer = encode_batch("power", columns, timestamps=timestamps)
+    size = schema.get_schema(0x02).packet_size
+    return [buffer[index:index + size] for index in range(0, len(buffer), size)]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def test_paced_replay_scales_timing():
+    packets = power_packets(5, 1.0)  # one packet per second
+    clock = FakeClock()
+    batches = []
+    stats = replay(packets, speed=4, handler=batches.append, clock=clock, sleep=clock.sleep)
+    assert clock.sleeps == pytest.approx([0.25] * 4)
+    assert [len(batch) for batch in batches] == [1] * 5
+    assert stats["packets"] == 5 and stats["late"] == 0
+
+def test_same_time_packets_share_a_batch():
+    packets = power_packets(6, 0.5)  # pairs share a whole second, but fine time differs by 128 ticks
+    clock = FakeClock()
+    batches = []
+    replay(packets, speed=1, handler=batches.append, clock=clock, sleep=clock.sleep)
+    assert sum(len(batch) for batch in batches) == 6
+    assert sum(clock.sleeps) == pytest.approx(2.5)
+
+def test_max_speed_batches_and_local_decode():
+    packets = power_packets(1000, 0.01)
+    batches = []
+    replay(packets, speed=None, handler=batches.append, batch_size=256)
+    assert [len(batch) for batch in batches] == [256, 256, 256, 232]
+
+    stats = replay(packets, speed=None)
+    assert stats["decoded"] == 1000 and stats["failed"] == 0
+    assert stats["sequence"]["lost"] == 0
+
+def test_sources(tmp_path):
+    packets = power_packets(50, 1.0)
+    capture = tmp_path / "pass.dat"
+    capture.write_bytes(b"\x00garbage" + b"".join(packets))
+    assert [bytes(packet) for packet in iter_capture(str(capture), chunk_size=100)] == packets
+
+    with ArchiveWriter(str(tmp_path / "archive")) as writer:
+        for second, packet in enumerate(packets):
+            writer.append(packet, mission_time=1000 + second)
+    assert list(iter_archive(str(tmp_path / "archive"), 1010, 1019)) == packets[10:20]
+
+def test_invalid_speed():
+    with pytest.raises(ValueError):
+        replay([], speed=0)
+
+def test_archive_keeps_interleaving(tmp_path):
+    # Power and thermal packets alternate within each second, four per second
+    power = power_packets(20, 0.25)
+    columns = {name: np.zeros(20) for name in schema.THERMAL_FIELDS}
+    timestamps = MISSION_START_TIMESTAMP + 1000 + np.arange(20) * 0.25 + 0.125
+    buffer = encode_batch("thermal", columns, timestamps=timestamps)
+    size = schema.get_schema(0x04).packet_size
+    thermal = [buffer[index:index + size] for index in range(0, len(buffer), size)]
+    packets = [packet for pair in zip(power, thermal) for packet in pair]
+
+    with ArchiveWriter(str(tmp_path), segment_size=1000) as writer:  # several segments
+        for packet in packets:
+            writer.append(packet)
+    batches = []
+    replay(iter_archive(str(tmp_path)), speed=None, handler=batches.append)
+    assert [packet for batch in batches for packet in batch] == packets
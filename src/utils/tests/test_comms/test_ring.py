@@ -0,0 +1,75 @@
+# Test module for the receive ring buffer
+# A burst is received while the consumer is stalled; nothing may be lost up to the ring size.
+import socket
+import threading
+import time
+
+import pytest
+
+from src.comms.ring import PacketRing, start_socket_reader
+
+def datagram_pair():
+    receiver, sender = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    return receiver, sender
+
+def test_burst_up_to_ring_size_is_not_lost():
+    receiver, sender = datagram_pair()
+    ring = PacketRing(slots=300, slot_size=64)
+    stop = threading.Event()
+    reader = start_socket_reader(receiver, ring, stop)
+    try:
+        for index in range(300):
+            sender.send(index.to_bytes(2, "big") * 10)
+        deadline = time.monotonic() + 5
+        while ring.received < 300 and time.monotonic() < deadline:
+            time.sleep(0.01)  # the consumer is stalled while the burst arrives
+
+        assert len(ring) == 300
+        assert ring.overflows == 0
+        received = []
+        for _ in range(300):
+            data, _ = ring.get(timeout=1)
+            received.append(int.from_bytes(data[:2], "big"))
+            assert len(data) == 20
+            ring.release()
+        assert received == list(range(300))
+        assert ring.stats()["high_watermark"] == 300
+    finally:
+        stop.set()
+        reader.join()
+        receiver.close()
+        sender.close()
+
+def test_overflow_is_counted_and_socket_still_drained():
+    receiver, sender = datagram_pair()
+    ring = PacketRing(slots=10, slot_size=16)
+    try:
+        for index in range(25):
+            sender.send(bytes([index]))
+        for _ in range(25):
+            ring.recv_into_slot(receiver)
+        assert ring.stats()["received"] == 10 and ring.overflows == 15
+        # The oldest ten are kept; overflow drops the newest
+        first, _ = ring.get(timeout=0)
+        assert bytes(first) == b"\x00"
+    finally:
+        receiver.close()
+        sender.close()
+
+def test_iteration_ends_after_close():
+    receiver, sender = datagram_pair()
+    ring = PacketRing(slots=8, slot_size=16)
+    reader = start_socket_reader(receiver, ring)
+    for index in range(5):
+        sender.send(bytes([index]))
+    time.sleep(0.1)
+    receiver.close()  # the reader thread notices, closes the ring and the loop below terminates
+    reader.join()
+    assert [bytes(data) for data, _ in ring] == [bytes([index]) for index in range(5)]
+    assert ring.stats()["consumed"] == 5
+    sender.close()
+
+def test_invalid_ring():
+    with pytest.raises(ValueError):
+        PacketRing(slots=0)
@@ -0,0 +1,77 @@
+# Test module for the SO_REUSEPORT multi-worker receiver
+# Packets are sent from several source sockets while the workers run; every datagram must be counted once.
+import socket
+import threading
+import time
+
+import pytest
+
+from src.ccsds.encoder import encode_ccsds_packet
+from src.comms import rx_workers
+from src.subsystems import adcs, power
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT not available")
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def send_later(port, delay, packets_per_socket, sockets=4):
+    time.sleep(delay)
+    for index in range(sockets):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for seq in range(packets_per_socket):
+                subsystem, source = (("adcs", adcs.get_adcs_telemetry), ("power", power.get_power_telemetry))[seq % 2]
+                sock.sendto(encode_ccsds_packet(subsystem, source(), seq), ("127.0.0.1", port))
+            sock.sendto(b"\x08\x01garbage", ("127.0.0.1", port))
+
+def test_workers_share_the_port_and_count_every_datagram():
+    port = free_port()
+    sender = threading.Thread(target=send_later, args=(port, 0.5, 50))
+    sender.start()
+    counts = rx_workers.run_receiver_workers(workers=2, ip="127.0.0.1", port=port, rcvbuf=1 << 20,
+                                             report_interval=None, duration=2.0)
+    sender.join()
+
+    assert len(counts) == 2
+    assert sum(count["received"] for count in counts) == 4 * 51
+    assert sum(count["decoded"] for count in counts) == 4 * 50
+    assert sum(count["failed"] for count in counts) == 4
+    assert sum(count["dropped"] for count in counts) == 0
+    assert all(count["rcvbuf"] > 0 for count in counts)
+
+def test_reuseport_sockets_bind_the_same_port():
+    port = free_port()
+    first, _ = rx_workers.open_reuseport_socket("127.0.0.1", port, 1 << 16)
+    second, _ = rx_workers.open_reuseport_socket("127.0.0.1", port, 1 << 16)
+    try:
+        assert first.getsockname() == second.getsockname()
+    finally:
+        first.close()
+        second.close()
+
+def slow_handler(view):
+    time.sleep(0.01)
+
+def send_burst_then_marker(port):
+    time.sleep(0.5)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        packet = encode_ccsds_packet("power", power.get_power_telemetry(), 0)
+        for _ in range(200):
+            sock.sendto(packet, ("127.0.0.1", port))
+        time.sleep(1.0)  # let the worker drain; the marker carries the socket's drop count
+        sock.sendto(packet, ("127.0.0.1", port))
+
+@pytest.mark.skipif(rx_workers.SO_RXQ_OVFL is None, reason="SO_RXQ_OVFL not available")
+def test_kernel_drops_are_reported():
+    port = free_port()
+    sender = threading.Thread(target=send_burst_then_marker, args=(port,))
+    sender.start()
+    counts = rx_workers.run_receiver_workers(workers=1, ip="127.0.0.1", port=port, rcvbuf=4096,
+                                             report_interval=None, duration=2.5, handler=slow_handler)
+    sender.join()
+
+    count, = counts
+    assert count["dropped"] > 0
+    assert count["received"] + count["dropped"] == 201
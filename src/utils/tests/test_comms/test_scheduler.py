@@ -0,0 +1,105 @@
+# Test module for the heap-based deadline scheduler
+# A fake clock is used so the tests are deterministic and never actually sleep.
+import pytest
+
+from src.comms.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler():
+    clock = FakeClock()
+    return Scheduler(clock=clock, sleep=clock.sleep), clock
+
+def test_streams_fire_at_their_rates():
+    scheduler, clock = make_scheduler()
+    scheduler.add("adcs", 2)
+    scheduler.add("cdh", 1)
+    scheduler.add("propulsion", 0.1)
+
+    counts = {"adcs": 0, "cdh": 0, "propulsion": 0}
+    while clock.now < 100:
+        for name in scheduler.wait():
+            counts[name] += 1
+
+    # Deadlines at 0, 0.5, ... up to and including t=100
+    assert counts == {"adcs": 201, "cdh": 101, "propulsion": 11}
+
+def test_wait_sleeps_exactly_until_next_deadline():
+    scheduler, clock = make_scheduler()
+    scheduler.add("thermal", 0.2)
+    assert scheduler.wait() == ["thermal"]
+    assert clock.now == 0.0
+    assert scheduler.wait() == ["thermal"]
+    assert clock.now == pytest.approx(5.0)
+
+def test_schedule_does_not_drift_with_late_service():
+    scheduler, clock = make_scheduler()
+    scheduler.add("cdh", 1)
+    for _ in range(10):
+        scheduler.wait()
+        clock.now += 0.3  # slow telemetry provider after every emission
+    # The next deadline is still on the original 1 s grid
+    assert scheduler.next_deadline() == pytest.approx(10.0)
+
+def test_stalls_skip_missed_periods():
+    scheduler, clock = make_scheduler()
+    scheduler.add("adcs", 2)
+    scheduler.wait()
+    clock.now = 10.2  # stalled for 10 s
+    assert scheduler.wait() == ["adcs"]
+    assert scheduler.next_deadline() == pytest.approx(10.5)
+    assert scheduler.stats()["adcs"]["skipped"] == 19
+
+def test_stats_report_achieved_rate():
+    scheduler, clock = make_scheduler()
+    scheduler.add("power", 0.5)
+    scheduler.add("comms", 1)
+    while clock.now < 60:
+        scheduler.wait()
+    stats = scheduler.stats()
+    assert stats["power"]["configured_hz"] == 0.5
+    assert stats["power"]["achieved_hz"] == pytest.approx(0.5)
+    assert stats["comms"]["achieved_hz"] == pytest.approx(1.0)
+
+def test_add_and_remove_streams():
+    scheduler, _ = make_scheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("cdh", 0)
+    scheduler.add("cdh", 1)
+    with pytest.raises(ValueError):
+        scheduler.add("cdh", 2)
+    scheduler.remove("cdh")
+    assert len(scheduler) == 0
+    assert scheduler.next_deadline() is None
+    assert scheduler.wait() == []
+
+def test_remove_then_add_again():
+    scheduler, clock = make_scheduler()
+    scheduler.add("a", 1)
+    scheduler.remove("a")
+    scheduler.add("a", 1)  # the removed stream's heap entry is still there
+    assert scheduler.pop_due(0.0) == ["a"]
+    assert scheduler.next_deadline() == 1.0
+    assert scheduler.pop_due(1.0) == ["a"]
+    stats = scheduler.stats()["a"]
+    assert stats["emitted"] == 2 and stats["achieved_hz"] == 1.0
+
+def test_many_streams():
+    scheduler, clock = make_scheduler()
+    for stream in range(5000):
+        scheduler.add(stream, 1 + stream % 10)
+    while scheduler.next_deadline() < 10.05:
+        scheduler.wait()
+    # Each stream fires at t=0 and then rate times per second up to t=10
+    stats = scheduler.stats()
+    assert all(stats[stream]["emitted"] == 10 * (1 + stream % 10) + 1 for stream in range(5000))
@@ -0,0 +1,77 @@
+# Test module for the dashboard history cache
+# Ring buffers keep the newest samples per APID and field; memory must not grow with uptime.
+import numpy as np
+import pytest
+
+from dashboard.history import TelemetryHistory
+from src.ccsds import schema
+from src.ccsds.encoder import encode_batch, encode_ccsds_packet
+from src.ccsds.packet_view import PacketView
+from src.ccsds.time import MISSION_START_TIMESTAMP
+from src.subsystems import thermal
+
+def power_views(count, spacecraft_id=0):
+    columns = {name: np.zeros(count) for name in schema.POWER_FIELDS}
+    columns["battery_voltage"] = np.arange(count, dtype=np.float32)
+    timestamps = MISSION_START_TIMESTAMP + 1000 + np.arange(count) * 0.5
+    buffer = encode_batch("power", columns, timestamps=timestamps, spacecraft_id=spacecraft_id)
+    size = schema.get_schema(0x02).packet_size
+    return [PacketView(buffer[index:index + size]) for index in range(0, len(buffer), size)]
+
+def make_history(**kwargs):
+    return TelemetryHistory(clock=lambda: MISSION_START_TIMESTAMP + 2000, **kwargs)
+
+def test_last_and_window():
+    history = make_history(capacity=100)
+    for view in power_views(250):
+        history.update(view)
+
+    times, values = history.last(0x02, "battery_voltage", 10)
+    assert list(values) == list(range(240, 250))
+    assert np.allclose(times, 1000 + np.arange(240, 250) * 0.5)
+
+    # Only the newest 100 samples are kept
+    _, values = history.last(0x02, "battery_voltage", 1000)
+    assert list(values) == list(range(150, 250))
+    times, values = history.window(0x02, "battery_voltage", start=1000, end=1080)
+    assert list(values) == list(range(150, 161))
+    assert history.window(0x02, "battery_voltage", start=2000)[0].size == 0
+
+    with pytest.raises(KeyError):
+        history.last(0x02, "quat_w", 1)
+    with pytest.raises(ValueError):
+        history.last(0x04, "battery_voltage", 1)
+
+def test_partial_ring():
+    history = make_history(capacity=100)
+    for view in power_views(5):
+        history.update(view)
+    _, values = history.last(0x02, "battery_voltage", 50)
+    assert list(values) == [0, 1, 2, 3, 4]
+    _, values = history.window(0x02, "battery_voltage")
+    assert list(values) == [0, 1, 2, 3, 4]
+
+def test_latest_snapshot():
+    history = make_history()
+    assert history.latest() == []
+    for seq in range(3):
+        view = PacketView(encode_ccsds_packet("thermal", thermal.get_thermal_telemetry(), seq))
+        history.update(view, {"subsystem": "THERMAL", "sequence_count": seq})
+    history.update(power_views(1)[0], {"subsystem": "POWER", "sequence_count": 0})
+
+    assert [packet["sequence_count"] for packet in history.latest(["Thermal"])] == [2]
+    assert len(history.latest()) == 2
+    assert history.apids() == [0x02, 0x04]
+    assert history.fields(0x04) == schema.get_schema(0x04).fields
+
+def test_memory_is_bounded():
+    history = make_history(capacity=64, max_apids=2)
+    for spacecraft_id in range(3):
+        for view in power_views(200, spacecraft_id):
+            history.update(view)
+    ring_bytes = 64 * 8 * (1 + len(schema.POWER_FIELDS))
+    assert history.nbytes == 2 * ring_bytes
+    assert history.dropped == 200  # the third spacecraft's APID is over the limit
+
+    with pytest.raises(ValueError):
+        TelemetryHistory(capacity=0)
@@ -0,0 +1,84 @@
+# Test module for the dashboard publisher
+# Updates are coalesced to the latest packet per subsystem and each room gets one message per frame.
+import threading
+
+import pytest
+
+from dashboard.publisher import ALL_SUBSYSTEMS, TelemetryPublisher, room_name
+from src.comms.latency import LatencyRecorder
+
+def json_packet(subsystem, seq):
+    return {"subsystem": subsystem.upper(), "timestamp": 0.0, "status": "nominal",
+            "sequence_count": seq, "data": {}}
+
+def make_publisher(**kwargs):
+    emitted = []
+    publisher = TelemetryPublisher(lambda event, message, room: emitted.append((event, message, room)), **kwargs)
+    return publisher, emitted
+
+def test_room_names():
+    assert room_name(["Power", "adcs", "power"]) == "adcs,power"
+    assert room_name(ALL_SUBSYSTEMS) == "*"
+    with pytest.raises(ValueError):
+        room_name([])
+
+def test_latest_value_per_subsystem():
+    publisher, emitted = make_publisher()
+    publisher.subscribe("overview", ALL_SUBSYSTEMS)
+    for seq in range(20):
+        publisher.update(json_packet("adcs", seq))
+    publisher.update(json_packet("power", 0))
+
+    assert publisher.flush() == 1
+    event, message, room = emitted[0]
+    assert event == "telemetry" and room == "*"
+    assert [(p["subsystem"], p["sequence_count"]) for p in message["packets"]] == [("ADCS", 19), ("POWER", 0)]
+    assert message["coalesced"] == 19
+
+    assert publisher.flush() == 0  # nothing changed since the last frame
+    assert len(emitted) == 1
+
+def test_clients_only_get_their_subsystems():
+    publisher, emitted = make_publisher()
+    assert publisher.subscribe("a", ["power"]) == "power"
+    publisher.subscribe("b", ["POWER"])  # same room as a
+    publisher.subscribe("c", ["thermal", "adcs"])
+
+    publisher.update(json_packet("power", 1))
+    publisher.update(json_packet("comms", 1))
+    assert publisher.flush() == 1  # no room wants comms, and c's subsystems did not change
+    assert [(room, [p["subsystem"] for p in message["packets"]]) for _, message, room in emitted] == [("power", ["POWER"])]
+
+    publisher.unsubscribe("a")
+    publisher.unsubscribe("b")
+    publisher.update(json_packet("power", 2))
+    assert publisher.flush() == 0
+
+    # Re-subscribing moves a client to the room of its new set
+    assert publisher.subscribe("c", ["power"]) == "power"
+    assert publisher.unsubscribe("c") == "power"
+    assert publisher.unsubscribe("c") is None
+
+def test_emit_latency_and_run_loop():
+    recorder = LatencyRecorder()
+    now = [0.0]
+    stop = threading.Event()
+    publisher, emitted = make_publisher(rate=10, recorder=recorder, clock=lambda: now[0])
+    publisher.subscribe("overview", ALL_SUBSYSTEMS)
+    publisher.update(json_packet("power", 1), tx_ns=0)
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+        publisher.update(json_packet("power", len(sleeps)))
+        if len(sleeps) == 3:
+            stop.set()
+
+    publisher.run(sleep=sleep, stop=stop)
+    assert sleeps == pytest.approx([0.1] * 3)
+    assert publisher.frames == len(emitted) == 3  # the update made during the last sleep stays pending
+    assert recorder.report()["emit"]["count"] == 1
+
+    with pytest.raises(ValueError):
+        TelemetryPublisher(print, rate=0)
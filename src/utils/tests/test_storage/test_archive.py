@@ -0,0 +1,118 @@
+# Test module for the segmented packet archive
+# Packets are written across several segments and queried back by time range and APID.
+import os
+
+import pytest
+
+from src.ccsds import apid
+from src.ccsds.encoder import encode_ccsds_packet
+from src.ccsds.packet_view import PacketView
+from src.storage import archive
+from src.storage.archive import ArchiveReader, ArchiveWriter
+from src.subsystems import adcs, power
+
+def write_packets(directory, count, segment_size=4096):
+    # Two spacecraft, two subsystems; mission time advances one second per round
+    written = []
+    with ArchiveWriter(directory, segment_size=segment_size) as writer:
+        for second in range(count):
+            for spacecraft in (0, 1):
+                for name, source in (("power", power.get_power_telemetry), ("adcs", adcs.get_adcs_telemetry)):
+                    packet = encode_ccsds_packet(name, source(), second % 16384, spacecraft_id=spacecraft)
+                    writer.append(packet, mission_time=1000 + second)
+                    written.append((1000 + second, apid.make_apid(name, spacecraft), packet))
+    return written
+
+def test_query_by_time_and_apid(tmp_path):
+    written = write_packets(str(tmp_path), 200)
+    assert len(archive.list_segments(str(tmp_path))) > 5  # small segments force rollover
+
+    power_1 = apid.make_apid("power", 1)
+    with ArchiveReader(str(tmp_path)) as reader:
+        assert reader.packet_count == len(written)
+        packets = [bytes(packet) for packet in reader.query(1050, 1059, apids=[power_1])]
+        expected = [packet for when, packet_apid, packet in written if packet_apid == power_1 and 1050 <= when <= 1059]
+        assert packets == expected
+        assert reader.count(1050, 1059, apids=[power_1]) == 10
+        assert [PacketView(packet).seq_count for packet in packets] == list(range(50, 60))
+
+        # All APIDs, time ordered across segments
+        everything = reader.query(1100, 1101)
+        assert len(everything) == 8
+        entries = reader.query_index(1100, 1101)
+        assert list(entries["time"]) == [1100] * 4 + [1101] * 4
+
+        assert reader.query(5000, 6000) == []
+        assert reader.count(apids=[0x7FE]) == 0
+        assert reader.count() == len(written)
+        del packets, everything
+
+def test_sync_makes_active_segment_visible(tmp_path):
+    writer = ArchiveWriter(str(tmp_path))
+    packet = encode_ccsds_packet("power", power.get_power_telemetry(), 1)
+    writer.append(packet, mission_time=10)
+    writer.sync()
+    with ArchiveReader(str(tmp_path)) as reader:
+        assert [bytes(view) for view in reader.query()] == [packet]
+    writer.close()
+
+def test_sync_interval(tmp_path):
+    now = [0.0]
+    writer = ArchiveWriter(str(tmp_path), sync_interval=30.0, clock=lambda: now[0])
+    packets = [encode_ccsds_packet("power", power.get_power_telemetry(), seq) for seq in range(3)]
+    writer.append(packets[0], mission_time=10)
+    with ArchiveReader(str(tmp_path)) as reader:
+        assert reader.packet_count == 0  # no index for the open segment yet
+    now[0] = 30.0
+    writer.append(packets[1], mission_time=11)  # interval passed: the index is written
+    writer.append(packets[2], mission_time=12)
+    with ArchiveReader(str(tmp_path)) as reader:
+        assert [bytes(view) for view in reader.query()] == packets[:2]
+    writer.close()
+
+def test_crash_recovery_rebuilds_index_and_truncates(tmp_path):
+    directory = str(tmp_path)
+    write_packets(directory, 3, segment_size=1 << 20)
+    data_path, index_path = archive.segment_paths(directory, 0)
+    os.remove(index_path)
+    with open(data_path, "ab") as file:
+        file.write(b"\x08\x02\xc0")  # torn start of a packet
+    size = os.path.getsize(data_path)
+
+    ArchiveWriter(directory).close()  # re-indexes segment 0; the new, empty segment is removed
+    assert os.path.getsize(data_path) == size - 3
+    assert archive.list_segments(directory) == [0]
+    with ArchiveReader(directory) as reader:
+        assert reader.packet_count == 12
+
+def test_new_writer_appends_new_segment(tmp_path):
+    write_packets(str(tmp_path), 2, segment_size=1 << 20)
+    write_packets(str(tmp_path), 2, segment_size=1 << 20)
+    assert archive.list_segments(str(tmp_path)) == [0, 1]
+    with ArchiveReader(str(tmp_path)) as reader:
+        assert reader.count(1000, 1000) == 8
+
+def test_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        ArchiveWriter(str(tmp_path), segment_size=0)
+    with ArchiveWriter(str(tmp_path)) as writer:
+        with pytest.raises(ValueError):
+            writer.append(b"\x00\x01")
+
+def test_crash_recovery_after_sync(tmp_path):
+    directory = str(tmp_path)
+    packets = [encode_ccsds_packet("power", power.get_power_telemetry(), seq) for seq in range(10)]
+    writer = ArchiveWriter(directory)
+    for packet in packets[:5]:
+        writer.append(packet)
+    writer.sync()
+    for packet in packets[5:]:
+        writer.append(packet)
+    writer._file.flush()  # the data reached the disk, then the process died before the next sync
+    data_path, index_path = archive.segment_paths(directory, 0)
+    assert not archive.index_is_complete(data_path, index_path)
+
+    ArchiveWriter(directory).close()
+    assert archive.index_is_complete(data_path, index_path)
+    with ArchiveReader(directory) as reader:
+        assert [bytes(packet) for packet in reader.query()] == packets
@@ -0,0 +1,122 @@
+# Test module for the columnar per-APID store
+# Columns must round-trip exactly through delta/XOR compression, and reads must skip chunks by their stats.
+import numpy as np
+import pytest
+
+from src.ccsds import apid, schema
+from src.ccsds.encoder import encode_batch, encode_ccsds_packet
+from src.ccsds.time import MISSION_START_TIMESTAMP
+from src.storage import columnar
+from src.storage.columnar import ColumnReader, ColumnWriter
+from src.subsystems import thermal
+
+@pytest.mark.parametrize("values", [
+    np.array([3.7, 3.7, 3.71, np.nan, -0.0, 1e30], dtype=">f4"),
+    np.linspace(0, 1, 1000, dtype=np.float64),
+    np.array([0, 255, 1, 254, 7], dtype=np.uint8),
+    np.array([65535, 0, 1, 40000], dtype=">u2"),
+    np.array([-5, 3, 2**40, -2**40], dtype=np.int64),
+])
+def test_column_codec_round_trip(values):
+    codec, dtype, data = columnar.encode_column(values)
+    decoded = columnar.decode_column(codec, dtype, data, len(values))
+    assert decoded.dtype == np.dtype(dtype)
+    assert decoded.tobytes() == values.astype(dtype).tobytes()  # bit-exact, including NaN and -0.0
+
+def test_slowly_changing_columns_compress():
+    ticks = np.arange(100_000, dtype=np.int64) * 512  # one sample every 2 s
+    voltage = (28.0 + 0.001 * np.sin(np.arange(100_000) / 500)).astype(np.float32)
+    assert len(columnar.encode_column(ticks)[2]) < ticks.nbytes / 100
+    assert len(columnar.encode_column(voltage)[2]) < voltage.nbytes * 0.7
+
+def power_columns(count):
+    voltage = np.linspace(20.0, 30.0, count, dtype=np.float32)
+    columns = {name: np.zeros(count) for name in schema.POWER_FIELDS}
+    columns["battery_voltage"] = voltage
+    columns["eps_mode"] = np.arange(count) % 6
+    return columns
+
+def test_write_and_read_with_skipping(tmp_path):
+    count = 1000
+    start_unix = MISSION_START_TIMESTAMP + 10_000
+    timestamps = start_unix + np.arange(count) * 2.0  # 0.5 Hz
+    buffer = encode_batch("power", power_columns(count), timestamps=timestamps, spacecraft_id=3)
+    power_3 = apid.make_apid("power", 3)
+
+    with ColumnWriter(str(tmp_path), chunk_rows=100, reference=start_unix) as writer:
+        writer.append_batch(buffer)
+        assert writer.rows_written == count
+
+    reader = ColumnReader(str(tmp_path))
+    assert reader.apids() == [power_3]
+    assert len(reader.catalog(power_3)["chunks"]) == 10
+
+    times, values = reader.read(power_3, "battery_voltage")
+    assert np.array_equal(values, np.linspace(20.0, 30.0, count, dtype=np.float32))
+    assert np.allclose(times, 10_000 + np.arange(count) * 2.0)
+
+    # One time window inside the 4th chunk: the other chunks are skipped by their time range
+    reader.chunks_read = reader.chunks_skipped = 0
+    times, values = reader.read(power_3, "battery_voltage", start=10_650, end=10_700)
+    assert np.allclose(times, np.arange(10_650, 10_701, 2.0))
+    assert reader.chunks_skipped == 9 and reader.chunks_read == 2  # value and time column of one chunk
+
+    # Value predicate: only the last chunk can hold voltages above 29.95
+    reader.chunks_read = reader.chunks_skipped = 0
+    _, values = reader.read(power_3, "battery_voltage", low=29.95)
+    assert len(values) and values.min() >= 29.95
+    assert reader.chunks_skipped == 9
+
+    _, seq = reader.read(power_3, "_seq")
+    assert np.array_equal(seq, np.arange(count) % 16384)
+    _, modes = reader.read(power_3, "eps_mode", high=0)
+    assert len(modes) == len(range(0, count, 6))
+
+    with pytest.raises(KeyError):
+        reader.read(power_3, "quat_w")
+    with pytest.raises(ValueError):
+        reader.read(0x7FE, "battery_voltage")
+
+def test_append_packets_across_writers(tmp_path):
+    packets = [encode_ccsds_packet("thermal", thermal.get_thermal_telemetry(), seq) for seq in range(5)]
+    for _ in range(2):
+        with ColumnWriter(str(tmp_path)) as writer:
+            for packet in packets:
+                writer.append(packet)
+    _, seq = ColumnReader(str(tmp_path)).read(0x04, "_seq")
+    assert list(seq) == list(range(5)) * 2
+
+    with pytest.raises(ValueError):
+        ColumnWriter(str(tmp_path)).append(packets[0][:-1])
+
+def test_interval_flush_visible_before_close(tmp_path):
+    now = [0.0]
+    writer = ColumnWriter(str(tmp_path), flush_interval=30.0, clock=lambda: now[0])
+    packets = [encode_ccsds_packet("thermal", thermal.get_thermal_telemetry(), seq) for seq in range(10)]
+    for packet in packets[:5]:
+        writer.append(packet)
+    assert ColumnReader(str(tmp_path)).apids() == []  # less than a chunk, interval not reached
+
+    now[0] = 30.0
+    writer.append(packets[5])  # the interval has passed: everything pending is written
+    _, seq = ColumnReader(str(tmp_path)).read(0x04, "_seq")
+    assert list(seq) == list(range(6))
+
+    for packet in packets[6:]:
+        writer.append(packet)
+    writer.close()
+    _, seq = ColumnReader(str(tmp_path)).read(0x04, "_seq")
+    assert list(seq) == list(range(10))
+
+def test_all_nan_chunk_is_read(tmp_path):
+    columns = power_columns(4)
+    columns["battery_voltage"] = np.full(4, np.nan, dtype=np.float32)
+    buffer = encode_batch("power", columns, timestamps=MISSION_START_TIMESTAMP + 10 + np.arange(4.0))
+    with ColumnWriter(str(tmp_path)) as writer:
+        writer.append_batch(buffer)
+
+    reader = ColumnReader(str(tmp_path))
+    _, values = reader.read(0x02, "battery_voltage")
+    assert len(values) == 4 and np.isnan(values).all()
+    assert len(reader.read(0x02, "bus_current")[1]) == 4
+    assert len(reader.read(0x02, "battery_voltage", low=0.0)[1]) == 0  # NaN never matches a predicate
@@ -30,8 +30,8 @@ def test_adcs_payload_encoding_decoding():
     Validate the ADCS payload round-trip through the encoder and decoder.
     """
     data = adcs.get_adcs_telemetry()
-    payload = encoder.encode_ccsds_adcs_payload(data)
-    decoded = decoder.decode_ccsds_adcs_payload(payload)
+    payload = encoder.pack_payload("adcs", data)
+    decoded = decoder.unpack_payload(0x05, payload)
 
     # approximate float checks
     for field in [
@@ -62,5 +62,5 @@ def test_adcs_payload_length():
     = 10*4 + 4 = 44 bytes
     """
     data = adcs.get_adcs_telemetry()
-    payload = encoder.encode_ccsds_adcs_payload(data)
+    payload = encoder.pack_payload("adcs", data)
     assert len(payload) == 44
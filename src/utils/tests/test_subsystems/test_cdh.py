@@ -29,8 +29,8 @@ def test_cdh_payload_encoding_decoding():
     Validate the CDH payload round-trip through the encoder and decoder.
     """
     data = cdh.get_cdh_telemetry()
-    payload = encoder.encode_ccsds_cdh_payload(data)
-    decoded = decoder.decode_ccsds_cdh_payload(payload)
+    payload = encoder.pack_payload("cdh", data)
+    decoded = decoder.unpack_payload(0x01, payload)
 
     # approximate check, float rounding
     assert abs(decoded['processor_temp'] - data['processor_temp']) < 0.5
@@ -56,5 +56,5 @@ def test_cdh_payload_length():
     = 12 + 2 + 4 + 4 + 2 + 2 = 26 bytes
     """
     data = cdh.get_cdh_telemetry()
-    payload = encoder.encode_ccsds_cdh_payload(data)
+    payload = encoder.pack_payload("cdh", data)
     assert len(payload) == 26
@@ -28,8 +28,8 @@ def test_comms_payload_encoding_decoding():
     Validate the comms payload round-trip through the encoder and decoder.
     """
     data = comms.get_comms_telemetry()
-    payload = encoder.encode_ccsds_comms_payload(data)
-    decoded = decoder.decode_ccsds_comms_payload(payload)
+    payload = encoder.pack_payload("comms", data)
+    decoded = decoder.unpack_payload(0x03, payload)
 
     # approximate float checks
     for field in [
@@ -57,5 +57,5 @@ def test_comms_payload_length():
     = 20 + 4 + 4 = 28 bytes
     """
     data = comms.get_comms_telemetry()
-    payload = encoder.encode_ccsds_comms_payload(data)
+    payload = encoder.pack_payload("comms", data)
     assert len(payload) == 28
@@ -24,8 +24,8 @@ def test_payload_payload_encoding_decoding():
     Validate the payload subsystem round-trip through the encoder and decoder.
     """
     data = payload.get_payload_telemetry()
-    encoded = encoder.encode_ccsds_payload_payload(data)
-    decoded = decoder.decode_ccsds_payload_payload(encoded)
+    encoded = encoder.pack_payload("payload", data)
+    decoded = decoder.unpack_payload(0x07, encoded)
 
     # approximate float checks
     for field in [
@@ -54,5 +54,5 @@ def test_payload_payload_length():
     = 15 bytes total
     """
     data = payload.get_payload_telemetry()
-    encoded = encoder.encode_ccsds_payload_payload(data)
+    encoded = encoder.pack_payload("payload", data)
     assert len(encoded) == 15
@@ -26,8 +26,8 @@ def test_power_payload_encoding_decoding():
     Validate the power payload round-trip through the encoder and decoder.
     """
     data = power.get_power_telemetry()
-    payload = encoder.encode_ccsds_power_payload(data)
-    decoded = decoder.decode_ccsds_power_payload(payload)
+    payload = encoder.pack_payload("power", data)
+    decoded = decoder.unpack_payload(0x02, payload)
 
     # approximate float checks
     for field in [
@@ -53,5 +53,5 @@ def test_power_payload_length():
     = 8*4 + 2*1 = 34 bytes
     """
     data = power.get_power_telemetry()
-    payload = encoder.encode_ccsds_power_payload(data)
+    payload = encoder.pack_payload("power", data)
     assert len(payload) == 34
\ No newline at end of file
@@ -28,8 +28,8 @@ def test_propulsion_payload_encoding_decoding():
     Validate the propulsion payload round-trip through the encoder and decoder.
     """
     data = propulsion.get_propulsion_telemetry()
-    payload = encoder.encode_ccsds_propulsion_payload(data)
-    decoded = decoder.decode_ccsds_propulsion_payload(payload)
+    payload = encoder.pack_payload("propulsion", data)
+    decoded = decoder.unpack_payload(0x06, payload)
 
     # floats, allow small differences
     for field in [
@@ -63,5 +63,5 @@ def test_propulsion_payload_length():
     = 6*4 + 6*1 = 24 + 6 = 30 bytes
     """
     data = propulsion.get_propulsion_telemetry()
-    payload = encoder.encode_ccsds_propulsion_payload(data)
+    payload = encoder.pack_payload("propulsion", data)
     assert len(payload) == 30
@@ -24,8 +24,8 @@ def test_thermal_payload_encoding_decoding():
     Validate the thermal payload round-trip through the encoder and decoder.
     """
     data = thermal.get_thermal_telemetry()
-    payload = encoder.encode_ccsds_thermal_payload(data)
-    decoded = decoder.decode_ccsds_thermal_payload(payload)
+    payload = encoder.pack_payload("thermal", data)
+    decoded = decoder.unpack_payload(0x04, payload)
 
     # approximate float checks
     for field in [
@@ -50,5 +50,5 @@ def test_thermal_payload_length():
     = 3*4 + 5*1 = 12 + 5 = 17 bytes
     """
     data = thermal.get_thermal_telemetry()
-    payload = encoder.encode_ccsds_thermal_payload(data)
+    payload = encoder.pack_payload("thermal", data)
     assert len(payload) == 17
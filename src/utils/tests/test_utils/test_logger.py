@@ -0,0 +1,63 @@
+# Test module for the queued telemetry logger
+# Records go through the background listener; per-packet lines only appear at DEBUG.
+import io
+import logging
+
+import pytest
+
+from src.comms import rx
+from src.ccsds import encoder
+from src.subsystems import power
+from src.utils.logger import PacketSummary, get_logger, setup_logging, shutdown_logging
+
+@pytest.fixture
+def log_output():
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+
+def test_records_are_written_by_listener_with_component(log_output):
+    setup_logging("INFO", stream=log_output)
+    get_logger("TX").info("hello %d", 42)
+    get_logger("TX").debug("hidden")
+    shutdown_logging()  # drains the queue
+    lines = log_output.getvalue().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("[TX] hello 42")
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        setup_logging("LOUD")
+
+def test_summary_logs_once_per_interval(log_output):
+    setup_logging("INFO", stream=log_output)
+    now = [0.0]
+    summary = PacketSummary(get_logger("RX"), interval=5.0, verb="received", clock=lambda: now[0])
+    for second in range(12):
+        now[0] = float(second)
+        summary.count("power")
+        summary.count("adcs", 2)
+    summary.error()
+    shutdown_logging()
+    lines = log_output.getvalue().splitlines()
+    # Windows end at the first count at t=5 and t=10; the rest is still pending
+    assert len(lines) == 2
+    assert "received 16 in 5.0s (3.2/s): ADCS 10, POWER 6; errors 0" in lines[0]
+    assert summary.total == 36 and summary.total_errors == 1
+
+def test_handle_packet_traces_only_at_debug(log_output):
+    packet = encoder.encode_ccsds_packet("power", power.get_power_telemetry(), 7)
+
+    setup_logging("INFO", stream=log_output)
+    summary = PacketSummary(rx.log, interval=3600)
+    assert rx.handle_packet(packet, summary).seq_count == 7
+    assert rx.handle_packet(b"\x00" * 4, summary) is None
+    shutdown_logging()
+    lines = log_output.getvalue().splitlines()
+    assert len(lines) == 1 and "Error decoding packet" in lines[0]
+    assert summary.total == 1 and summary.total_errors == 1
+
+    setup_logging(logging.DEBUG, stream=log_output)
+    rx.handle_packet(packet)
+    shutdown_logging()
+    assert "Decoded POWER packet #7" in log_output.getvalue().splitlines()[-1]